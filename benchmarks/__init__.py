@@ -0,0 +1,8 @@
+"""Performance benchmarks for the physics kernels, figure builders and export.
+
+Run the suite (offline, no extra dependencies) and save the results as JSON:
+
+    uv run python -m benchmarks run
+
+See benchmarks.harness for how benchmarks are written and timed.
+"""
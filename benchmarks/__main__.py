@@ -0,0 +1,110 @@
+"""Command-line entry point for `python -m benchmarks`."""
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.compare import DEFAULT_THRESHOLD, compare_runs, print_changes, regressions
+from benchmarks.harness import (
+    RESULTS_DIR,
+    BenchmarkResult,
+    BenchmarkRun,
+    format_seconds,
+    run_benchmarks,
+)
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    metrics = "  ".join(f"{key}={value:,}" for key, value in result.metrics.items())
+    print(
+        f"  {result.name:<52} {format_seconds(result.min):>10} "
+        f"{format_seconds(result.median):>10}  {metrics}"
+    )
+
+
+def _run(args: argparse.Namespace) -> BenchmarkRun:
+    print(f"  {'benchmark':<52} {'min':>10} {'median':>10}")
+    results = run_benchmarks(args.filter, args.repeat, progress=_print_result)
+    if args.output or args.command == "run":
+        output = args.output or RESULTS_DIR / f"{results.commit or 'results'}.json"
+        results.save(output)
+        print(f"Saved {len(results.results)} results to {output}")
+    return results
+
+
+def _compare(args: argparse.Namespace) -> int:
+    baseline = BenchmarkRun.load(args.baseline)
+    current = BenchmarkRun.load(args.current) if args.current else _run(args)
+    if current.machine != baseline.machine:
+        print(
+            f"Warning: the baseline was recorded on a different machine "
+            f"({baseline.machine.get('platform')}, Python {baseline.machine.get('python')}); "
+            "timings may not be comparable."
+        )
+
+    if current.pages_exported is None:
+        print("Warning: no export report found; page sizes were not checked.")
+    else:
+        print(f"Page sizes from the export of {current.pages_exported}")
+
+    changes = compare_runs(current, baseline, args.filter)
+    print(f"\nCompared with {args.baseline} ({baseline.commit or 'unknown commit'}):")
+    print_changes(changes, args.threshold)
+    regressed = regressions(changes, args.threshold)
+    if regressed:
+        missing = sum(c.missing for c in regressed)
+        print(
+            f"\n{len(regressed) - missing} regression(s) past {args.threshold:.0%}, "
+            f"{missing} missing measurement(s)"
+        )
+        return 1
+    print(f"\nNo regressions past {args.threshold:.0%}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run the performance benchmarks."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument(
+        "-k", "--filter", default=None,
+        help="Only run benchmarks whose name contains this",
+    )
+    run_options.add_argument(
+        "--repeat", type=int, default=3,
+        help="Timed batches per benchmark (default: 3)",
+    )
+    run_options.add_argument(
+        "-o", "--output", type=Path, default=None,
+        help="Results file (default for run: benchmarks/results/<git describe>.json)",
+    )
+
+    commands.add_parser(
+        "run", parents=[run_options], help="Run the benchmarks and save the results as JSON"
+    )
+    compare = commands.add_parser(
+        "compare", parents=[run_options],
+        help="Rerun the benchmarks and fail if any regressed since a baseline",
+    )
+    compare.add_argument("baseline", type=Path, help="Results file to compare against")
+    compare.add_argument(
+        "--current", type=Path, default=None,
+        help="Compare this results file instead of rerunning the benchmarks",
+    )
+    compare.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Relative growth that counts as a regression (default: {DEFAULT_THRESHOLD})",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return _compare(args)
+    _run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Animation figure builders from physics_explorations.visualization."""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from benchmarks.harness import parametrize
+from physics_explorations.visualization import (
+    build_frames,
+    create_animation_figure,
+    create_slider_bundle_html,
+)
+
+FRAME_COUNTS = [10, 100, 500]
+
+_X = np.linspace(0, 2 * np.pi, 200)
+
+
+def _wave_frame(i):
+    return [
+        go.Scatter(x=_X, y=np.sin(_X + 0.1 * i), mode="lines"),
+        go.Scatter(x=[np.cos(0.1 * i)], y=[np.sin(0.1 * i)], mode="markers"),
+    ]
+
+
+@parametrize("n_frames", FRAME_COUNTS)
+def bench_build_frames(n_frames):
+    return lambda: build_frames(n_frames, _wave_frame)
+
+
+@parametrize("n_frames", FRAME_COUNTS)
+def bench_create_animation_figure(n_frames):
+    frames = build_frames(n_frames, _wave_frame)
+    return lambda: create_animation_figure(_wave_frame(0), frames, title="Benchmark")
+
+
+@parametrize("n_frames", FRAME_COUNTS)
+def bench_figure_to_json(n_frames):
+    fig = create_animation_figure(_wave_frame(0), build_frames(n_frames, _wave_frame))
+
+    def run():
+        return {"json_bytes": len(fig.to_json())}
+    return run
+
+
+@parametrize("n_frames", [20, 100])
+def bench_slider_bundle(n_frames):
+    # One figure per slider step, as a slider_cache explorer exports them
+    values = [i / n_frames for i in range(n_frames)]
+    figures = [go.Figure(_wave_frame(i), layout={"title": "Benchmark"}) for i in range(n_frames)]
+
+    def run():
+        return {
+            "html_bytes": len(create_slider_bundle_html(figures, values)),
+            "separate_json_bytes": sum(len(fig.to_json()) for fig in figures),
+        }
+    return run
@@ -0,0 +1,58 @@
+"""Exporting a small synthetic notebook with both export engines."""
+
+import tempfile
+from pathlib import Path
+
+from physics_explorations.export import export_notebook
+from physics_explorations.export_inprocess import export_notebook_in_process
+
+SYNTHETIC_NOTEBOOK = '''import marimo
+
+app = marimo.App()
+
+
+@app.cell
+def _():
+    import numpy as np
+    import plotly.graph_objects as go
+    return go, np
+
+
+@app.cell
+def _(go, np):
+    x = np.linspace(0, 10, 500)
+    fig = go.Figure([go.Scatter(x=x, y=np.sin(x + phase)) for phase in range(5)])
+    fig
+    return
+
+
+if __name__ == "__main__":
+    app.run()
+'''
+
+# Removed when the interpreter exits
+_WORKDIR = tempfile.TemporaryDirectory(prefix="bench-export-")
+
+
+def _notebook() -> Path:
+    notebook = Path(_WORKDIR.name) / "synthetic.py"
+    notebook.write_text(SYNTHETIC_NOTEBOOK)
+    return notebook
+
+
+def bench_export_notebook():
+    notebook = _notebook()
+
+    def run():
+        page = export_notebook(notebook, Path(_WORKDIR.name) / "subprocess")
+        return {"output_bytes": page.stat().st_size}
+    return run
+
+
+def bench_export_notebook_in_process():
+    notebook = _notebook()
+
+    def run():
+        page = export_notebook_in_process(notebook, Path(_WORKDIR.name) / "inprocess")
+        return {"output_bytes": page.stat().st_size}
+    return run
@@ -0,0 +1,31 @@
+"""Import time of the packages, each in a fresh interpreter.
+
+Timings include interpreter startup, which is the same for every package.
+The number of modules loaded is recorded too, so that a package starting
+to pull in plotly or scipy shows up in `compare` even on a noisy machine.
+"""
+
+import os
+import subprocess
+import sys
+
+from benchmarks.harness import PROJECT_ROOT, parametrize
+
+MODULES = [
+    "physics",
+    "physics.orbital_mechanics",
+    "physics_explorations",
+    "physics_explorations.visualization",
+    "physics_explorations.export",
+]
+
+
+@parametrize("module", MODULES)
+def bench_import(module):
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT / "src")}
+    command = [sys.executable, "-c", f"import sys, {module}; print(len(sys.modules))"]
+
+    def run():
+        result = subprocess.run(command, capture_output=True, text=True, env=env, check=True)
+        return {"modules": int(result.stdout)}
+    return run
@@ -0,0 +1,38 @@
+"""Orbital mechanics kernels from physics.orbital_mechanics."""
+
+import numpy as np
+
+from benchmarks.harness import parametrize
+from physics.orbital_mechanics import (
+    escape_orbit,
+    kepler_orbit,
+    projectile_trajectory,
+    solve_kepler_equation,
+)
+
+
+@parametrize("e", [0.1, 0.9])
+def bench_solve_kepler_equation(e):
+    return lambda: solve_kepler_equation(1.0, e)
+
+
+@parametrize("e", [0.5, 0.999, 2.0])
+def bench_solve_kepler_equation_array(e):
+    M = np.linspace(-10, 10, 10_000)
+    return lambda: solve_kepler_equation(M, e)
+
+
+@parametrize("n_frames", [100, 1000])
+def bench_kepler_orbit(n_frames):
+    return lambda: kepler_orbit(0.6, n_frames=n_frames)
+
+
+@parametrize("e", [1.0, 1.5])
+def bench_escape_orbit(e):
+    return lambda: escape_orbit(e, n_frames=1000)
+
+
+# Suborbital, bound orbit and escape trajectory (v_circ is about 7.9 km/s)
+@parametrize("v0", [3000.0, 9000.0, 12000.0])
+def bench_projectile_trajectory(v0):
+    return lambda: projectile_trajectory(v0)
@@ -0,0 +1,51 @@
+"""Three-body simulators defined in the three_body notebook.
+
+The step counts are the ones the notebook uses. The simulators are timed
+without their on-disk cache; bench_cached_simulation times loading a
+stored result instead.
+"""
+
+import atexit
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+
+from benchmarks.harness import PROJECT_ROOT, load_notebook_function
+from physics.cache import persistent_cache
+from physics_explorations.visualization import COLORS
+
+NOTEBOOK = PROJECT_ROOT / "notebooks" / "three_body.py"
+
+
+def _load(name):
+    return load_notebook_function(NOTEBOOK, name, np=np, go=go, COLORS=COLORS)
+
+
+def bench_simulate_three_body():
+    simulate_three_body = _load("simulate_three_body")
+    # The figure-8 orbit
+    p1, p2 = 0.347111, 0.532728
+    positions = [(-1.0, 0.0), (1.0, 0.0), (0.0, 0.0)]
+    velocities = [(p1, p2), (p1, p2), (-2 * p1, -2 * p2)]
+    masses = [1.0, 1.0, 1.0]
+    return lambda: simulate_three_body(positions, velocities, masses, dt=0.001, n_steps=12000)
+
+
+def bench_simulate_trisolaris():
+    return _load("simulate_trisolaris")
+
+
+def bench_simulate_stable_trisolaris():
+    return _load("simulate_stable_trisolaris")
+
+
+def bench_cached_simulation():
+    cache_dir = tempfile.mkdtemp(prefix="bench-cache-")
+    atexit.register(shutil.rmtree, cache_dir, ignore_errors=True)
+    # A store of its own, so the user's cache and other benchmarks are untouched
+    simulate = persistent_cache(_load("simulate_stable_trisolaris"), directory=Path(cache_dir))
+    simulate()  # Store the result; the benchmark times loading it
+    return simulate
@@ -0,0 +1,100 @@
+"""Compare a benchmark run with a stored baseline.
+
+Every benchmark's fastest batch, every metric it reports (such as a
+figure's JSON size) and the size of every exported page are compared with
+the baseline. Anything that grew by more than the threshold is a
+regression, and so is anything in the baseline that the current run
+should have measured but did not. The fastest batch is used for timings because noise on a
+busy machine only ever makes a batch slower.
+"""
+
+from dataclasses import dataclass
+
+from benchmarks.harness import BenchmarkRun, format_seconds
+
+# Relative growth that counts as a regression (0.2 = 20%)
+DEFAULT_THRESHOLD = 0.2
+
+
+@dataclass
+class Change:
+    """One baseline measurement and its value in the current run."""
+
+    name: str  # Benchmark or page name
+    metric: str  # "time", a benchmark metric, or "page_bytes"
+    baseline: float
+    current: float | None  # None if the current run did not measure it
+
+    @property
+    def missing(self) -> bool:
+        return self.current is None
+
+    @property
+    def change(self) -> float:
+        """Relative change, e.g. 0.25 for 25% worse."""
+        return self.current / self.baseline - 1
+
+
+def compare_runs(
+    current: BenchmarkRun, baseline: BenchmarkRun, pattern: str | None = None
+) -> list[Change]:
+    """Pair up every baseline measurement with the current run.
+
+    Measurements the current run has but the baseline does not are left
+    out. Baseline benchmarks the current run skipped or that no longer
+    report a metric come back as missing, as do baseline pages when the
+    current run recorded pages at all.
+
+    Args:
+        current: Run to check
+        baseline: Run to compare it against
+        pattern: Filter the current run was made with; baseline
+            benchmarks outside it are not expected
+
+    Returns:
+        Changes in baseline order, benchmarks followed by the pages
+    """
+    changes = []
+    for name, base in baseline.results.items():
+        if pattern is not None and pattern not in name:
+            continue
+        result = current.results.get(name)
+        changes.append(Change(name, "time", base.min, result.min if result else None))
+        for metric, value in base.metrics.items():
+            if isinstance(value, (int, float)):
+                now = result.metrics.get(metric) if result else None
+                changes.append(Change(name, metric, value, now))
+    if current.pages_exported is not None:
+        for page, size in baseline.pages.items():
+            changes.append(Change(page, "page_bytes", size, current.pages.get(page)))
+    return changes
+
+
+def regressions(changes: list[Change], threshold: float = DEFAULT_THRESHOLD) -> list[Change]:
+    """Return the changes that grew past the threshold or went missing."""
+    return [c for c in changes if c.missing or (c.baseline > 0 and c.change > threshold)]
+
+
+def _format(metric: str, value: float | None) -> str:
+    if value is None:
+        return "missing"
+    if metric == "time":
+        return format_seconds(value)
+    return f"{value:,.0f}"
+
+
+def print_changes(changes: list[Change], threshold: float = DEFAULT_THRESHOLD) -> None:
+    """Print a diff table, flagging regressions past the threshold."""
+    print(f"  {'benchmark':<52} {'metric':<12} {'baseline':>12} {'current':>12} {'change':>8}")
+    for c in changes:
+        if c.missing:
+            change, flag = "-", "  MISSING"
+        elif c.baseline <= 0:
+            change, flag = "-", ""
+        else:
+            change = f"{c.change:+.0%}"
+            flag = "  REGRESSION" if c.change > threshold else ""
+        print(
+            f"  {c.name:<52} {c.metric:<12} {_format(c.metric, c.baseline):>12} "
+            f"{_format(c.metric, c.current):>12} {change:>8}{flag}"
+        )
@@ -0,0 +1,267 @@
+"""Minimal offline benchmark harness (asv style).
+
+A benchmark is a module-level function named `bench_*` in a
+`benchmarks/bench_*.py` module. It receives its parameters (see
+`parametrize`), does any setup, and returns the zero-argument callable to
+time. If that callable returns a dict, the dict is recorded as the
+benchmark's metrics (such as the size of an exported page).
+
+The callable is run in batches sized so that one batch takes at least
+MIN_SAMPLE_SECONDS, which keeps microsecond kernels out of timer noise.
+Sizing the batch doubles as a warm-up; the per-call time of `repeat`
+further batches is recorded.
+"""
+
+import ast
+import importlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+# Exported site whose page sizes are recorded with every run
+PAGES_DIR = PROJECT_ROOT / "docs"
+RESULTS_VERSION = 1
+
+# Shortest batch worth timing, in seconds
+MIN_SAMPLE_SECONDS = 0.05
+
+# Packages whose versions are recorded with every run
+PACKAGES = ("numpy", "scipy", "plotly", "marimo")
+
+# Make the project importable without installing it
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+
+def parametrize(name: str, values: list) -> Callable:
+    """Run a benchmark once for every value of a parameter.
+
+    Stacking several parametrize decorators runs every combination.
+    """
+    def decorate(func: Callable) -> Callable:
+        func.params = {name: list(values), **getattr(func, "params", {})}
+        return func
+    return decorate
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark."""
+
+    name: str
+    times: list[float]  # Seconds per call, one entry per batch
+    number: int  # Calls per batch
+    metrics: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+
+@dataclass
+class BenchmarkRun:
+    """Results of one run of the suite, with the environment it ran in."""
+
+    results: dict[str, BenchmarkResult]
+    machine: dict[str, str | int]
+    packages: dict[str, str]
+    pages: dict[str, int] = field(default_factory=dict)  # Exported page sizes in bytes
+    pages_exported: str | None = None  # When the export that wrote the pages ran
+    commit: str | None = None
+    created: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds")
+    )
+
+    def save(self, path: Path) -> Path:
+        """Write the run as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": RESULTS_VERSION, **asdict(self)}
+        path.write_text(json.dumps(data, indent=2) + "\n")
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "BenchmarkRun":
+        """Read a run written by save().
+
+        Raises:
+            ValueError: If the file was written by an incompatible version
+        """
+        data = json.loads(path.read_text())
+        if data.pop("version", None) != RESULTS_VERSION:
+            raise ValueError(f"{path} is not a version {RESULTS_VERSION} benchmark result")
+        data["results"] = {
+            name: BenchmarkResult(**result) for name, result in data["results"].items()
+        }
+        return cls(**data)
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with a unit suited to its size."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def discover(pattern: str | None = None) -> Iterator[tuple[str, Callable, dict]]:
+    """Yield (name, function, parameters) for every benchmark.
+
+    Names look like `orbital.kepler_orbit[n_frames=100]`.
+
+    Args:
+        pattern: Only yield benchmarks whose name contains this
+    """
+    for module_path in sorted(BENCHMARKS_DIR.glob("bench_*.py")):
+        module = importlib.import_module(f"benchmarks.{module_path.stem}")
+        group = module_path.stem.removeprefix("bench_")
+        for attr, func in vars(module).items():
+            if not attr.startswith("bench_") or not callable(func):
+                continue
+            params = getattr(func, "params", {})
+            for values in itertools.product(*params.values()):
+                kwargs = dict(zip(params, values))
+                name = f"{group}.{attr.removeprefix('bench_')}"
+                if kwargs:
+                    name += "[" + ",".join(f"{k}={v}" for k, v in kwargs.items()) + "]"
+                if pattern is None or pattern in name:
+                    yield name, func, kwargs
+
+
+def measure(run: Callable[[], object], repeat: int = 3) -> tuple[list[float], int, dict]:
+    """Time a callable.
+
+    Returns:
+        Seconds per call for each batch, calls per batch, and the metrics
+        the callable returned (empty unless it returned a dict)
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            value = run()
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS or number >= 10**6:
+            break
+        number *= 10
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            value = run()
+        times.append((time.perf_counter() - start) / number)
+    return times, number, dict(value) if isinstance(value, dict) else {}
+
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, cwd=PROJECT_ROOT, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def page_sizes(pages_dir: Path = PAGES_DIR) -> tuple[dict[str, int], str | None]:
+    """Return the size in bytes of every page the last export wrote.
+
+    Only pages listed in the export report as exported without errors are
+    measured, so stray or stale HTML files in the directory are ignored.
+
+    Returns:
+        Page sizes by file name, and when that export ran (both empty if
+        the directory has no export report)
+    """
+    from physics_explorations.export_report import REPORT_NAME, ExportReport
+
+    report = ExportReport.load(pages_dir / REPORT_NAME)
+    if report is None:
+        return {}, None
+    pages = (pages_dir / f"{nb.stem}.html" for nb in report.notebooks if nb.error is None)
+    sizes = {page.name: page.stat().st_size for page in sorted(pages) if page.exists()}
+    return sizes, report.created
+
+
+def run_benchmarks(
+    pattern: str | None = None,
+    repeat: int = 3,
+    progress: Callable[[BenchmarkResult], None] | None = None,
+    pages_dir: Path | None = PAGES_DIR,
+) -> BenchmarkRun:
+    """Run the benchmark suite.
+
+    Args:
+        pattern: Only run benchmarks whose name contains this
+        repeat: Timed batches per benchmark
+        progress: Called with each result as soon as it is measured
+        pages_dir: Exported site to record page sizes from (None to skip)
+
+    Returns:
+        The results, with the machine and package versions they ran on
+    """
+    pages, pages_exported = page_sizes(pages_dir) if pages_dir is not None else ({}, None)
+    results = {}
+    for name, func, kwargs in discover(pattern):
+        times, number, metrics = measure(func(**kwargs), repeat)
+        results[name] = BenchmarkResult(name, times, number, metrics)
+        if progress is not None:
+            progress(results[name])
+    return BenchmarkRun(
+        results=results,
+        machine={
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count() or 1,
+        },
+        packages={name: _package_version(name) for name in PACKAGES},
+        pages=pages,
+        pages_exported=pages_exported,
+        commit=_commit(),
+    )
+
+
+def load_notebook_function(notebook_path: Path, name: str, **namespace) -> Callable:
+    """Compile a function defined inside a marimo notebook cell.
+
+    Helpers defined in a cell (`def _(np): def simulate(...): ...`) cannot
+    be imported. This finds the definition by name and compiles it on its
+    own, with the names it uses from other cells passed as keywords.
+    Decorators are dropped, so the function is timed as written (without
+    the on-disk cache of the three-body simulators, for example).
+
+    Raises:
+        LookupError: If the notebook defines no function of that name
+    """
+    tree = ast.parse(notebook_path.read_text(), filename=str(notebook_path))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            node.decorator_list = []
+            module = ast.Module(body=[node], type_ignores=[])
+            exec(compile(module, str(notebook_path), "exec"), namespace)
+            return namespace[name]
+    raise LookupError(f"{notebook_path.name} defines no function {name!r}")
@@ -11,10 +11,11 @@ def _():
     import plotly.graph_objects as go
     from physics_explorations.visualization import (
         COLORS,
+        circle,
         create_play_pause_buttons,
     )
 
-    return COLORS, create_play_pause_buttons, go, mo, np
+    return COLORS, circle, create_play_pause_buttons, go, mo, np
 
 
 @app.cell
@@ -85,7 +86,7 @@ def _(mo):
 
 
 @app.cell
-def _(go, np):
+def _(circle, go, np):
     # Animation: Schwarzschild radius and escape velocity
     def create_schwarzschild_animation():
         n_frames = 100
@@ -108,19 +109,20 @@ def _(go, np):
                 r_current = r_schwarzschild * 1.5 - (r_schwarzschild * 1.5 - r_schwarzschild * 0.3) * remaining
 
             # Schwarzschild radius (constant, shown as dashed circle)
-            theta = np.linspace(0, 2 * np.pi, 100)
+            horizon_x, horizon_y = circle(r_schwarzschild)
             frame_data.append(go.Scatter(
-                x=r_schwarzschild * np.cos(theta),
-                y=r_schwarzschild * np.sin(theta),
+                x=horizon_x,
+                y=horizon_y,
                 mode="lines",
                 line=dict(color="red", width=2, dash="dash"),
                 name=f"Event horizon (r_s = {r_schwarzschild})",
             ))
 
             # Collapsing star
+            star_x, star_y = circle(r_current)
             frame_data.append(go.Scatter(
-                x=r_current * np.cos(theta),
-                y=r_current * np.sin(theta),
+                x=star_x,
+                y=star_y,
                 mode="lines",
                 fill="toself",
                 fillcolor="rgba(255, 200, 100, 0.5)" if r_current > r_schwarzschild else "rgba(50, 50, 50, 0.9)",
@@ -532,7 +534,7 @@ def _(mo):
 
 
 @app.cell
-def _(go, np):
+def _(circle, go, np):
     # Animation: Gravitational time dilation near black hole
     def create_time_dilation_animation():
         n_frames = 120
@@ -545,10 +547,10 @@ def _(go, np):
             frame_data = []
 
             # Black hole
-            theta_bh = np.linspace(0, 2 * np.pi, 100)
+            bh_x, bh_y = circle(r_s)
             frame_data.append(go.Scatter(
-                x=r_s * np.cos(theta_bh),
-                y=r_s * np.sin(theta_bh),
+                x=bh_x,
+                y=bh_y,
                 mode="lines",
                 fill="toself",
                 fillcolor="black",
@@ -573,10 +575,10 @@ def _(go, np):
 
                 # Draw clock face
                 clock_r = 0.2
-                clock_theta = np.linspace(0, 2 * np.pi, 30)
+                face_x, face_y = circle(clock_r, center=(x_clock, y_clock), n_points=30)
                 frame_data.append(go.Scatter(
-                    x=x_clock + clock_r * np.cos(clock_theta),
-                    y=y_clock + clock_r * np.sin(clock_theta),
+                    x=face_x,
+                    y=face_y,
                     mode="lines",
                     line=dict(color=color, width=2),
                     showlegend=False,
@@ -607,9 +609,10 @@ def _(go, np):
             # Reference clock at infinity (top)
             ref_x, ref_y = 0, 3
             clock_r = 0.3
+            face_x, face_y = circle(clock_r, center=(ref_x, ref_y), n_points=30)
             frame_data.append(go.Scatter(
-                x=ref_x + clock_r * np.cos(clock_theta),
-                y=ref_y + clock_r * np.sin(clock_theta),
+                x=face_x,
+                y=face_y,
                 mode="lines",
                 line=dict(color="white", width=2),
                 name="Reference clock (r=∞)",
@@ -753,7 +756,7 @@ def _(mo):
 
 
 @app.cell
-def _(go, np):
+def _(circle, go, np):
     # Animation: Gravitational redshift
     def create_redshift_animation():
         n_frames = 100
@@ -766,10 +769,10 @@ def _(go, np):
             frame_data = []
 
             # Black hole
-            theta = np.linspace(0, 2 * np.pi, 100)
+            bh_x, bh_y = circle(r_s)
             frame_data.append(go.Scatter(
-                x=r_s * np.cos(theta),
-                y=r_s * np.sin(theta),
+                x=bh_x,
+                y=bh_y,
                 mode="lines",
                 fill="toself",
                 fillcolor="black",
@@ -1606,7 +1609,7 @@ def _(mo):
 
 
 @app.cell
-def _(go, np):
+def _(circle, go, np):
     # Animation: Hawking radiation concept
     def create_hawking_animation():
         n_frames = 120
@@ -1622,10 +1625,10 @@ def _(go, np):
             shrink_factor = 1 - 0.1 * (frame / n_frames)
             r_current = r_s * shrink_factor
 
-            theta = np.linspace(0, 2 * np.pi, 100)
+            bh_x, bh_y = circle(r_current)
             frame_data.append(go.Scatter(
-                x=r_current * np.cos(theta),
-                y=r_current * np.sin(theta),
+                x=bh_x,
+                y=bh_y,
                 mode="lines",
                 fill="toself",
                 fillcolor="black",
@@ -1696,9 +1699,10 @@ def _(go, np):
             for gr in glow_r:
                 alpha_raw = 0.3 * (1 - (gr - r_current) / 0.3) * (0.5 + 0.5 * np.sin(t * 3))
                 alpha = max(0.0, min(1.0, alpha_raw))
+                glow_x, glow_y = circle(gr)
                 frame_data.append(go.Scatter(
-                    x=gr * np.cos(theta),
-                    y=gr * np.sin(theta),
+                    x=glow_x,
+                    y=glow_y,
                     mode="lines",
                     line=dict(color=f"rgba(255, 200, 100, {alpha:.2f})", width=2),
                     showlegend=False,
@@ -13,9 +13,10 @@ def _():
     from physics_explorations.visualization import (
         COLORS,
         create_play_pause_buttons,
+        unit_circle,
     )
 
-    return COLORS, create_play_pause_buttons, go, make_subplots, mo, np
+    return COLORS, create_play_pause_buttons, go, make_subplots, mo, np, unit_circle
 
 
 @app.cell
@@ -1387,7 +1388,7 @@ def _(mo):
 
 
 @app.cell
-def _(COLORS, create_play_pause_buttons, go, np):
+def _(COLORS, create_play_pause_buttons, go, np, unit_circle):
     def create_dimensional_light_animation():
         """Show how light propagation differs by dimension."""
         n_frames = 60
@@ -1397,14 +1398,14 @@ def _(COLORS, create_play_pause_buttons, go, np):
             t = i / n_frames * 4
 
             # Light expanding in different dimensions
-            theta = np.linspace(0, 2 * np.pi, 100)
+            cos_theta, sin_theta = unit_circle(100)
 
             # 1D: just two points
             x_1d = [-t, t]
 
             # 2D: circle
-            x_2d = t * np.cos(theta)
-            y_2d = t * np.sin(theta)
+            x_2d = t * cos_theta
+            y_2d = t * sin_theta
 
             # 3D: sphere (show cross-section)
             # Multiple circles at different z levels
@@ -1447,8 +1448,8 @@ def _(COLORS, create_play_pause_buttons, go, np):
                 # ===== 3D LIGHT =====
                 # Multiple circles representing sphere cross-sections
                 *[go.Scatter(
-                    x=t * np.sin(phi) * np.cos(theta) + 6,
-                    y=t * np.sin(phi) * np.sin(theta),
+                    x=t * np.sin(phi) * cos_theta + 6,
+                    y=t * np.sin(phi) * sin_theta,
                     mode="lines",
                     line=dict(color=COLORS["quantum"], width=1),
                     name="3D light (sphere)" if j == 0 and i == 0 else None,
@@ -14,9 +14,21 @@ def _():
         COLORS,
         ANIMATION_SETTINGS,
         create_play_pause_buttons,
+        slider_bundles_enabled,
+        slider_cache,
     )
 
-    return ANIMATION_SETTINGS, COLORS, create_play_pause_buttons, go, mo, np, pl
+    return (
+        ANIMATION_SETTINGS,
+        COLORS,
+        create_play_pause_buttons,
+        go,
+        mo,
+        np,
+        pl,
+        slider_bundles_enabled,
+        slider_cache,
+    )
 
 
 @app.cell
@@ -1188,7 +1200,7 @@ def _(mo):
 
 
 @app.cell
-def _(mo):
+def _(mo, slider_bundles_enabled):
     eccentricity_slider = mo.ui.slider(
         start=0,
         stop=0.95,
@@ -1197,12 +1209,17 @@ def _(mo):
         label="Eccentricity (e)",
         show_value=True,
     )
-    mo.hstack([mo.md("**Adjust eccentricity:**"), eccentricity_slider], justify="start", gap=1)
+    # Static pages switch between precomputed orbits with their own slider
+    None if slider_bundles_enabled() else mo.hstack(
+        [mo.md("**Adjust eccentricity:**"), eccentricity_slider], justify="start", gap=1
+    )
     return (eccentricity_slider,)
 
 
 @app.cell
-def _(eccentricity_slider, go, np):
+def _(go, np, slider_cache):
+    # Same grid as eccentricity_slider; figures already shown are reused
+    @slider_cache(start=0, stop=0.95, step=0.05, prewarm=True)
     def plot_orbit_with_eccentricity(e):
         """Plot an orbit with given eccentricity."""
         a = 1.0
@@ -1295,9 +1312,27 @@ def _(eccentricity_slider, go, np):
 
         return fig
 
-    orbit_explorer_fig = plot_orbit_with_eccentricity(eccentricity_slider.value)
+    return (plot_orbit_with_eccentricity,)
+
+
+@app.cell
+def _(
+    eccentricity_slider,
+    mo,
+    plot_orbit_with_eccentricity,
+    slider_bundles_enabled,
+):
+    if slider_bundles_enabled():
+        orbit_explorer_fig = mo.iframe(
+            plot_orbit_with_eccentricity.bundle_html(
+                eccentricity_slider.value, slider_prefix="e = "
+            ),
+            height="520px",
+        )
+    else:
+        orbit_explorer_fig = plot_orbit_with_eccentricity(eccentricity_slider.value)
     orbit_explorer_fig
-    return (orbit_explorer_fig, plot_orbit_with_eccentricity)
+    return (orbit_explorer_fig,)
 
 
 @app.cell
@@ -12,9 +12,19 @@ def _():
     from physics_explorations.visualization import (
         COLORS,
         create_play_pause_buttons,
+        slider_bundles_enabled,
+        slider_cache,
     )
 
-    return COLORS, create_play_pause_buttons, go, mo, np
+    return (
+        COLORS,
+        create_play_pause_buttons,
+        go,
+        mo,
+        np,
+        slider_bundles_enabled,
+        slider_cache,
+    )
 
 
 @app.cell
@@ -249,7 +259,7 @@ def _(mo):
 
 
 @app.cell
-def _(mo):
+def _(mo, slider_bundles_enabled):
     velocity_slider = mo.ui.slider(
         start=0,
         stop=0.99,
@@ -258,54 +268,76 @@ def _(mo):
         label="Velocity (v/c)",
         show_value=True,
     )
-    mo.hstack([mo.md("**Set velocity as fraction of light speed:**"), velocity_slider], justify="start", gap=1)
+    # Static pages switch between precomputed plots with their own slider
+    None if slider_bundles_enabled() else mo.hstack(
+        [mo.md("**Set velocity as fraction of light speed:**"), velocity_slider],
+        justify="start",
+        gap=1,
+    )
     return (velocity_slider,)
 
 
 @app.cell
-def _(go, np, velocity_slider):
-    v = velocity_slider.value
-    if v >= 1:
-        v = 0.999
-    gamma_val = 1 / np.sqrt(1 - v**2)
-
-    # Plot gamma vs velocity
-    velocities = np.linspace(0, 0.99, 100)
-    gammas = 1 / np.sqrt(1 - velocities**2)
-
-    gamma_fig = go.Figure()
-
-    # Gamma curve
-    gamma_fig.add_trace(go.Scatter(
-        x=velocities,
-        y=gammas,
-        mode="lines",
-        line=dict(color="steelblue", width=3),
-        name="γ(v)"
-    ))
+def _(go, np, slider_cache):
+    # Same grid as velocity_slider; figures already shown are reused
+    @slider_cache(start=0, stop=0.99, step=0.01, prewarm=True)
+    def plot_gamma(v):
+        """Plot the gamma factor curve with the current velocity marked."""
+        if v >= 1:
+            v = 0.999
+        gamma_val = 1 / np.sqrt(1 - v**2)
+
+        # Plot gamma vs velocity
+        velocities = np.linspace(0, 0.99, 100)
+        gammas = 1 / np.sqrt(1 - velocities**2)
+
+        gamma_fig = go.Figure()
+
+        # Gamma curve
+        gamma_fig.add_trace(go.Scatter(
+            x=velocities,
+            y=gammas,
+            mode="lines",
+            line=dict(color="steelblue", width=3),
+            name="γ(v)"
+        ))
 
-    # Current point
-    gamma_fig.add_trace(go.Scatter(
-        x=[v],
-        y=[gamma_val],
-        mode="markers",
-        marker=dict(size=15, color="red"),
-        name=f"Current: γ = {gamma_val:.3f}"
-    ))
+        # Current point
+        gamma_fig.add_trace(go.Scatter(
+            x=[v],
+            y=[gamma_val],
+            mode="markers",
+            marker=dict(size=15, color="red"),
+            name=f"Current: γ = {gamma_val:.3f}"
+        ))
 
-    gamma_fig.update_layout(
-        title=dict(
-            text=f"<b>The Gamma Factor</b><br><sub>At v = {v}c: γ = {gamma_val:.3f} → clocks run {gamma_val:.2f}× slower, lengths contract to {1/gamma_val:.2%}</sub>",
-            font=dict(size=16),
-        ),
-        xaxis_title="Velocity (v/c)",
-        yaxis_title="Gamma (γ)",
-        yaxis=dict(range=[0, 10]),
-        showlegend=True,
-    )
+        gamma_fig.update_layout(
+            title=dict(
+                text=f"<b>The Gamma Factor</b><br><sub>At v = {v}c: γ = {gamma_val:.3f} → clocks run {gamma_val:.2f}× slower, lengths contract to {1/gamma_val:.2%}</sub>",
+                font=dict(size=16),
+            ),
+            xaxis_title="Velocity (v/c)",
+            yaxis_title="Gamma (γ)",
+            yaxis=dict(range=[0, 10]),
+            showlegend=True,
+        )
+
+        return gamma_fig
+
+    return (plot_gamma,)
 
+
+@app.cell
+def _(mo, plot_gamma, slider_bundles_enabled, velocity_slider):
+    if slider_bundles_enabled():
+        gamma_fig = mo.iframe(
+            plot_gamma.bundle_html(velocity_slider.value, slider_prefix="v/c = "),
+            height="520px",
+        )
+    else:
+        gamma_fig = plot_gamma(velocity_slider.value)
     gamma_fig
-    return gamma_fig, gamma_val, gammas, v, velocities
+    return (gamma_fig,)
 
 
 @app.cell
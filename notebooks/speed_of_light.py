@@ -11,10 +11,20 @@ def _():
     import plotly.graph_objects as go
     from physics_explorations.visualization import (
         COLORS,
+        angles,
+        create_parametric_html,
         create_play_pause_buttons,
     )
 
-    return COLORS, create_play_pause_buttons, go, mo, np
+    return (
+        COLORS,
+        angles,
+        create_parametric_html,
+        create_play_pause_buttons,
+        go,
+        mo,
+        np,
+    )
 
 
 @app.cell
@@ -222,7 +232,7 @@ def _(mo):
 
 
 @app.cell
-def _(go, np):
+def _(angles, go, np):
     def create_fizeau_animation():
         """Animate Fizeau's rotating wheel experiment."""
         n_frames = 60
@@ -234,7 +244,7 @@ def _(go, np):
 
             # Toothed wheel (8 teeth for visibility)
             n_teeth = 8
-            wheel_theta = np.linspace(0, 2 * np.pi, 200)
+            wheel_theta = angles(200)
             wheel_r = 0.5 + 0.15 * np.sin(n_teeth * (wheel_theta + rotation))
             wheel_x = wheel_r * np.cos(wheel_theta) - 2
             wheel_y = wheel_r * np.sin(wheel_theta)
@@ -405,36 +415,33 @@ def _(mo):
 
 
 @app.cell
-def _(go, np):
+def _(create_parametric_html, go, mo, np):
     # Show the relationship c = 1/sqrt(ε₀μ₀)
     def create_em_wave_animation():
-        """Animate an electromagnetic wave showing E and B fields."""
-        n_frames = 60
-        frames = []
-
-        for i in range(n_frames):
-            phase = 2 * np.pi * i / n_frames
-
-            # Wave propagation
-            x = np.linspace(0, 4 * np.pi, 200)
+        """Animate an electromagnetic wave showing E and B fields.
 
-            # E field (vertical)
-            E = np.sin(x - phase)
+        The fields are an analytic function of the phase, so the browser
+        computes each frame from the base arrays instead of receiving
+        60 materialized frames.
+        """
+        n_frames = 60
+        phases = 2 * np.pi * np.arange(n_frames) / n_frames
 
-            # B field (horizontal, perpendicular to E)
-            B = np.sin(x - phase)
+        # Wave propagation
+        x = np.linspace(0, 4 * np.pi, 200)
 
-            frame_data = [
-                # E field
+        fig = go.Figure(
+            data=[
+                # E field (vertical)
                 go.Scatter3d(
-                    x=x, y=np.zeros_like(x), z=E,
+                    x=x, y=np.zeros_like(x), z=np.sin(x),
                     mode="lines",
                     line=dict(color="red", width=4),
                     name="Electric field (E)"
                 ),
-                # B field
+                # B field (horizontal, perpendicular to E)
                 go.Scatter3d(
-                    x=x, y=B, z=np.zeros_like(x),
+                    x=x, y=np.sin(x), z=np.zeros_like(x),
                     mode="lines",
                     line=dict(color="blue", width=4),
                     name="Magnetic field (B)"
@@ -446,12 +453,7 @@ def _(go, np):
                     line=dict(color="white", width=2, dash="dash"),
                     name="Direction of propagation"
                 ),
-            ]
-
-            frames.append(go.Frame(data=frame_data, name=str(i)))
-
-        fig = go.Figure(
-            data=frames[0].data,
+            ],
             layout=go.Layout(
                 title=dict(
                     text="<b>Electromagnetic Wave:</b> E and B Fields Perpendicular<br><sub>Light is oscillating electric and magnetic fields traveling at speed c</sub>",
@@ -464,32 +466,20 @@ def _(go, np):
                     camera=dict(eye=dict(x=1.5, y=1.5, z=0.8)),
                 ),
                 showlegend=True,
-                updatemenus=[
-                    dict(
-                        type="buttons",
-                        showactive=False,
-                        y=0,
-                        x=0.5,
-                        xanchor="center",
-                        buttons=[
-                            dict(label="▶ Play",
-                                 method="animate",
-                                 args=[None, {"frame": {"duration": 50, "redraw": True},
-                                            "fromcurrent": True, "transition": {"duration": 0}}]),
-                            dict(label="⏸ Pause",
-                                 method="animate",
-                                 args=[[None], {"frame": {"duration": 0, "redraw": False},
-                                              "mode": "immediate"}]),
-                        ],
-                    )
-                ],
+                height=550,
             ),
-            frames=frames,
         )
 
-        return fig
+        return create_parametric_html(
+            fig,
+            params={"phase": phases},
+            expressions={
+                0: {"z": "Math.sin(x - phase)"},
+                1: {"y": "Math.sin(x - phase)"},
+            },
+        )
 
-    em_wave_fig = create_em_wave_animation()
+    em_wave_fig = mo.iframe(create_em_wave_animation(), height="620px")
     em_wave_fig
     return (create_em_wave_animation, em_wave_fig)
 
@@ -14,8 +14,17 @@ def _():
         ANIMATION_SETTINGS,
         create_play_pause_buttons,
     )
+    from physics import persistent_cache
 
-    return ANIMATION_SETTINGS, COLORS, create_play_pause_buttons, go, mo, np
+    return (
+        ANIMATION_SETTINGS,
+        COLORS,
+        create_play_pause_buttons,
+        go,
+        mo,
+        np,
+        persistent_cache,
+    )
 
 
 @app.cell
@@ -134,7 +143,8 @@ def _(mo):
 
 
 @app.cell
-def _(COLORS, go, np):
+def _(COLORS, go, np, persistent_cache):
+    @persistent_cache
     def simulate_three_body(
         positions, velocities, masses, dt=0.001, n_steps=10000, G=1.0
     ):
@@ -753,7 +763,8 @@ def _(mo):
 
 
 @app.cell
-def _(COLORS, go, np):
+def _(COLORS, go, np, persistent_cache):
+    @persistent_cache
     def simulate_trisolaris(dt=0.0005, n_steps=30000):
         """Simulate a planet in a triple-star system."""
         # Three suns - hierarchical system (binary pair + distant third)
@@ -1028,7 +1039,8 @@ def _(mo):
 
 
 @app.cell
-def _(COLORS, go, np):
+def _(COLORS, go, np, persistent_cache):
+    @persistent_cache
     def simulate_stable_trisolaris(dt=0.0003, n_steps=50000):
         """Simulate a STABLE planet in a triple-star system.
 
@@ -11,10 +11,11 @@ def _():
     import plotly.graph_objects as go
     from physics_explorations.visualization import (
         COLORS,
+        create_heatmap_animation_html,
         create_play_pause_buttons,
     )
 
-    return COLORS, create_play_pause_buttons, go, mo, np
+    return COLORS, create_heatmap_animation_html, create_play_pause_buttons, go, mo, np
 
 
 @app.cell
@@ -83,29 +84,33 @@ def _(mo):
 
 
 @app.cell
-def _(go, np):
+def _(create_heatmap_animation_html, go, mo, np):
     def create_wave_interference_animation():
-        """Animate two-source wave interference."""
+        """Animate two-source wave interference.
+
+        The frames are quantized to uint8 and delta-packed into one binary
+        block that the browser unpacks, so a 120x120 grid stays below the
+        payload of a 50x50 float grid and hover still shows the wave height.
+        """
         n_frames = 40
 
         # Grid for wave visualization
-        x = np.linspace(-10, 10, 50)
-        y = np.linspace(-10, 10, 50)
+        x = np.linspace(-10, 10, 120)
+        y = np.linspace(-10, 10, 120)
         X, Y = np.meshgrid(x, y)
 
         # Two sources
         source1 = (-2, 0)
         source2 = (2, 0)
 
-        frames = []
+        # Distance from each source (use maximum to avoid sqrt of negative due to float precision)
+        r1 = np.sqrt(np.maximum(0, (X - source1[0])**2 + (Y - source1[1])**2))
+        r2 = np.sqrt(np.maximum(0, (X - source2[0])**2 + (Y - source2[1])**2))
 
+        z_frames = []
         for i in range(n_frames):
             t = 2 * np.pi * i / n_frames
 
-            # Distance from each source (use maximum to avoid sqrt of negative due to float precision)
-            r1 = np.sqrt(np.maximum(0, (X - source1[0])**2 + (Y - source1[1])**2))
-            r2 = np.sqrt(np.maximum(0, (X - source2[0])**2 + (Y - source2[1])**2))
-
             # Wave from each source (circular waves)
             # Add small epsilon to avoid sqrt(0) warnings
             k = 1.5  # wave number
@@ -113,14 +118,15 @@ def _(go, np):
             wave2 = np.sin(k * r2 - t) / (np.sqrt(r2 + 1e-10) + 0.5)
 
             # Superposition
-            total_wave = wave1 + wave2
+            z_frames.append(wave1 + wave2)
 
-            frame_data = [
+        fig = go.Figure(
+            data=[
                 go.Heatmap(
-                    x=x, y=y, z=total_wave,
+                    x=x, y=y,
                     colorscale="RdBu",
-                    zmin=-1.5, zmax=1.5,
                     showscale=False,
+                    hovertemplate="x: %{x:.1f}<br>y: %{y:.1f}<br>wave: %{z:.2f}<extra></extra>",
                 ),
                 # Source markers
                 go.Scatter(
@@ -130,12 +136,7 @@ def _(go, np):
                     marker=dict(size=12, color="yellow", line=dict(color="black", width=2)),
                     name="Sources (slits)",
                 ),
-            ]
-
-            frames.append(go.Frame(data=frame_data, name=str(i)))
-
-        fig = go.Figure(
-            data=frames[0].data,
+            ],
             layout=go.Layout(
                 title=dict(
                     text="<b>Wave Interference:</b> Two Sources Creating Patterns<br><sub>Bright and dark bands form where waves add or cancel</sub>",
@@ -145,33 +146,15 @@ def _(go, np):
                 yaxis=dict(title="", showgrid=False, zeroline=False, showticklabels=False, scaleanchor="x"),
                 showlegend=True,
                 legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-                updatemenus=[
-                    dict(
-                        type="buttons",
-                        showactive=False,
-                        y=-0.08,
-                        x=0.5,
-                        xanchor="center",
-                        buttons=[
-                            dict(label="▶ Play",
-                                 method="animate",
-                                 args=[None, {"frame": {"duration": 60, "redraw": True},
-                                            "fromcurrent": True, "transition": {"duration": 0}}]),
-                            dict(label="⏸ Pause",
-                                 method="animate",
-                                 args=[[None], {"frame": {"duration": 0, "redraw": False},
-                                              "mode": "immediate"}]),
-                        ],
-                    )
-                ],
-                margin=dict(b=60),
+                height=550,
             ),
-            frames=frames,
         )
 
-        return fig
+        return create_heatmap_animation_html(
+            fig, z_frames, zmin=-1.5, zmax=1.5, frame_duration=60
+        )
 
-    wave_interference_fig = create_wave_interference_animation()
+    wave_interference_fig = mo.iframe(create_wave_interference_animation(), height="620px")
     wave_interference_fig
     return create_wave_interference_animation, wave_interference_fig
 
@@ -1,19 +1,54 @@
-"""Physics helpers for Feynman Gravitation visualizations."""
+"""Physics helpers for Feynman Gravitation visualizations.
+
+The constants are imported with the package; the orbital mechanics
+kernels (numpy), the result cache and the call statistics are imported
+the first time one of their names is looked up (PEP 562).
+"""
+
+from typing import TYPE_CHECKING
 
 from physics.constants import G, PLANETS, PlanetData
-from physics.orbital_mechanics import (
-    ellipse_from_eccentricity,
-    kepler_orbit,
-    solve_kepler_equation,
-    swept_area_points,
-)
+from physics_explorations._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from physics.cache import clear_cache, persistent_cache
+    from physics.instrumentation import CallStats, reset_stats, stats
+    from physics.orbital_mechanics import (
+        ellipse_from_eccentricity,
+        escape_orbit,
+        kepler_orbit,
+        solve_kepler_equation,
+        swept_area_points,
+    )
+
+# Module that defines each lazily imported name
+_LAZY_NAMES = {
+    "CallStats": "instrumentation",
+    "clear_cache": "cache",
+    "ellipse_from_eccentricity": "orbital_mechanics",
+    "escape_orbit": "orbital_mechanics",
+    "kepler_orbit": "orbital_mechanics",
+    "persistent_cache": "cache",
+    "reset_stats": "instrumentation",
+    "solve_kepler_equation": "orbital_mechanics",
+    "stats": "instrumentation",
+    "swept_area_points": "orbital_mechanics",
+}
 
 __all__ = [
+    "CallStats",
     "G",
     "PLANETS",
     "PlanetData",
+    "clear_cache",
     "ellipse_from_eccentricity",
+    "escape_orbit",
     "kepler_orbit",
+    "persistent_cache",
+    "reset_stats",
     "solve_kepler_equation",
+    "stats",
     "swept_area_points",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_NAMES)
@@ -0,0 +1,240 @@
+"""Persistent on-disk memoization for expensive simulations.
+
+Functions decorated with `persistent_cache` store their results as .npz
+files and load them on later calls with the same arguments, in this
+process or any other (notebook runs, exports, tests):
+
+    @persistent_cache
+    def simulate(dt=0.001, n_steps=10000): ...
+
+The key hashes the function's name and code, its arguments (after
+applying defaults, so `simulate()` and `simulate(dt=0.001)` share an
+entry) and the library version. Editing the function body therefore
+misses the cache, but editing a helper it calls does not; call
+clear_cache() after such a change.
+
+Results may be arrays, numbers, strings, None, and lists, tuples or
+dicts (with string keys) of those. The store is shared by all functions
+and bounded to MAX_BYTES; the least recently used entries are evicted
+first.
+
+Entries live in PHYSICS_CACHE_DIR, or `physics-explorations` in the user
+cache directory, unless the decorator is given a directory of its own
+(`@persistent_cache(directory=...)`). Set PHYSICS_CACHE=0 to bypass the
+cache.
+"""
+
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import zipfile
+from collections.abc import Callable
+from importlib import metadata
+from pathlib import Path
+from types import CodeType
+from typing import Any, TypeVar
+
+import numpy as np
+
+CACHE_ENV = "PHYSICS_CACHE"
+CACHE_DIR_ENV = "PHYSICS_CACHE_DIR"
+CACHE_VERSION = 1
+
+# Total size of the store before least recently used entries are evicted
+MAX_BYTES = 512 * 2**20
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def cache_dir() -> Path:
+    """Return the directory that holds the cache entries."""
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured:
+        return Path(configured)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "physics-explorations"
+
+
+def cache_enabled() -> bool:
+    """Whether PHYSICS_CACHE allows cached results to be used."""
+    return os.environ.get(CACHE_ENV, "") != "0"
+
+
+def _library_version() -> str:
+    try:
+        return metadata.version("physics-explorations")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _hash_code(code: CodeType, digest: "hashlib._Hash") -> None:
+    """Hash a code object, including nested functions and comprehensions."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def _hash_value(value: Any, digest: "hashlib._Hash") -> None:
+    """Hash an argument by content, so equal arguments share a key."""
+    if isinstance(value, np.ndarray):
+        digest.update(f"array:{value.dtype.str}:{value.shape}:".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        _hash_value(value.item(), digest)
+    elif value is None or isinstance(value, (bool, int, float, complex, str)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}[".encode())
+        for item in value:
+            _hash_value(item, digest)
+        digest.update(b"]")
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}{{".encode())
+        for key in sorted(value, key=repr):
+            _hash_value(key, digest)
+            _hash_value(value[key], digest)
+        digest.update(b"}")
+    else:
+        raise TypeError(f"Cannot hash a {type(value).__name__} argument for the cache")
+
+
+def cache_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    """Return the key of a call: function identity, arguments and library version."""
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_VERSION}:{_library_version()}:".encode())
+    digest.update(f"{func.__module__}.{func.__qualname__}:".encode())
+    _hash_code(func.__code__, digest)
+    _hash_value(dict(bound.arguments), digest)
+    return digest.hexdigest()
+
+
+def _pack(value: Any, arrays: list[np.ndarray]) -> Any:
+    """Describe a result as JSON, moving its arrays into `arrays`."""
+    if isinstance(value, (np.ndarray, np.generic)):
+        arrays.append(np.asarray(value))
+        return {"array": len(arrays) - 1}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return {"value": value}
+    if isinstance(value, (list, tuple)):
+        return {type(value).__name__: [_pack(item, arrays) for item in value]}
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {"dict": {key: _pack(item, arrays) for key, item in value.items()}}
+    raise TypeError(f"Cannot store a {type(value).__name__} result in the cache")
+
+
+def _unpack(spec: dict, arrays: Any) -> Any:
+    """Rebuild a result described by _pack."""
+    (kind, content), = spec.items()
+    if kind == "array":
+        array = arrays[f"a{content}"]
+        return array[()] if array.ndim == 0 else array
+    if kind == "value":
+        return content
+    if kind == "list":
+        return [_unpack(item, arrays) for item in content]
+    if kind == "tuple":
+        return tuple(_unpack(item, arrays) for item in content)
+    return {key: _unpack(item, arrays) for key, item in content.items()}
+
+
+def _load(path: Path) -> Any:
+    with np.load(path) as data:
+        return _unpack(json.loads(str(data["spec"])), data)
+
+
+def _store(path: Path, result: Any) -> None:
+    """Write an entry atomically, so concurrent readers never see half of it."""
+    arrays: list[np.ndarray] = []
+    spec = json.dumps(_pack(result, arrays))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, spec=np.array(spec), **{f"a{i}": a for i, a in enumerate(arrays)})
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _evict(directory: Path, max_bytes: int, keep: Path) -> None:
+    """Delete the least recently used entries until the store fits max_bytes."""
+    entries = []
+    for path in directory.glob("*.npz"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # Evicted by another process
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path != keep:
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def persistent_cache(func: F | None = None, *, directory: Path | None = None) -> Any:
+    """Memoize a function's results on disk, across processes.
+
+    Args:
+        func: Function to memoize (omitted when called with options)
+        directory: Store to use instead of cache_dir()
+
+    Returns:
+        The memoized function, or a decorator when func is omitted
+    """
+    if func is None:
+        return functools.partial(persistent_cache, directory=directory)
+    store = directory
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not cache_enabled():
+            return func(*args, **kwargs)
+        directory = store or cache_dir()
+        path = directory / f"{func.__name__}-{cache_key(func, args, kwargs)[:32]}.npz"
+        try:
+            result = _load(path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # Unreadable (truncated or foreign) entry: recompute it
+            path.unlink(missing_ok=True)
+        else:
+            # Loading counts as a use for eviction
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)
+            return result
+
+        result = func(*args, **kwargs)
+        _store(path, result)
+        _evict(directory, MAX_BYTES, keep=path)
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def clear_cache() -> int:
+    """Delete every cache entry.
+
+    Returns:
+        Number of entries deleted
+    """
+    directory = cache_dir()
+    removed = 0
+    for path in directory.glob("*.npz"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
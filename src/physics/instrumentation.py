@@ -0,0 +1,91 @@
+"""Call counts and timings for the physics kernels.
+
+Kernels are decorated with `instrumented`. When the PHYSICS_STATS
+environment variable is set as `physics` is first imported, each call
+is counted and timed, and the elements of the arrays it returns are
+added up. `stats()` returns a snapshot of the totals. Otherwise the
+decorator returns the function unchanged, so the kernels cost exactly
+what they did before.
+
+Times are inclusive: kepler_orbit's time includes the
+solve_kepler_equation calls it makes, which are also counted on their own.
+"""
+
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
+
+import numpy as np
+
+STATS_ENV = "PHYSICS_STATS"
+
+# Decided once, when the kernels are decorated
+ENABLED = os.environ.get(STATS_ENV, "") not in ("", "0")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class CallStats:
+    """Totals for one kernel."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    elements: int = 0  # Elements of all the arrays it returned
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+_stats: dict[str, CallStats] = {}
+_lock = threading.Lock()
+
+
+def _elements(result: Any) -> int:
+    """Count the array elements in a result or a tuple of results."""
+    if isinstance(result, np.ndarray):
+        return result.size
+    if isinstance(result, tuple):
+        return sum(item.size for item in result if isinstance(item, np.ndarray))
+    return 0
+
+
+def instrumented(func: F) -> F:
+    """Count and time calls to a kernel while PHYSICS_STATS is set."""
+    if not ENABLED:
+        return func
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        with _lock:
+            entry = _stats.setdefault(name, CallStats())
+            entry.calls += 1
+            entry.seconds += elapsed
+            entry.elements += _elements(result)
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def stats() -> dict[str, CallStats]:
+    """Return a snapshot of the totals per kernel, by function name.
+
+    Empty unless PHYSICS_STATS was set when `physics` was imported.
+    """
+    with _lock:
+        return {name: replace(entry) for name, entry in _stats.items()}
+
+
+def reset_stats() -> None:
+    """Clear the totals."""
+    with _lock:
+        _stats.clear()
@@ -1,50 +1,189 @@
 """Orbital mechanics calculations for Kepler's laws."""
 
+import math
+
 import numpy as np
-from numpy.typing import NDArray
-from scipy.optimize import brentq
+from numpy.typing import ArrayLike, NDArray
 
+from physics.instrumentation import instrumented
 
-def solve_kepler_equation(M: float, e: float, tol: float = 1e-10) -> float:
-    """
-    Solve Kepler's equation: M = E - e*sin(E) for E.
 
-    Args:
-        M: Mean anomaly (radians)
-        e: Eccentricity (0 <= e < 1)
-        tol: Convergence tolerance
+# Iteration cap of the safeguarded Newton solver. Newton converges in a few
+# steps from the starters below; bisection steps (at most ~60 to shrink a
+# 2*pi bracket to machine precision) take over where it would diverge.
+_MAX_ITERATIONS = 100
 
-    Returns:
-        E: Eccentric anomaly (radians)
+
+def _newton_scalar(f, fprime, x: float, lo: float, hi: float, tol: float) -> float:
+    """Find the root of an increasing function in [lo, hi] starting from x."""
+    for _ in range(_MAX_ITERATIONS):
+        fx = f(x)
+        if fx == 0:
+            return x
+        if fx < 0:
+            lo = x
+        else:
+            hi = x
+        dfx = fprime(x)
+        step = fx / dfx if dfx > 0 else math.inf
+        if abs(step) <= tol * max(1.0, abs(x)):
+            return x - step
+        x = x - step
+        if not lo < x < hi:
+            # Newton left the bracket (flat or wrongly curved region): bisect
+            x = 0.5 * (lo + hi)
+    return x
+
+
+def _newton_array(f, fprime, x: NDArray, lo: NDArray, hi: NDArray, tol: float) -> NDArray:
+    """Vectorized _newton_scalar: every element is solved independently."""
+    x, lo, hi = x.copy(), lo.copy(), hi.copy()
+    active = np.ones(x.shape, dtype=bool)
+    for _ in range(_MAX_ITERATIONS):
+        xa, la, ha = x[active], lo[active], hi[active]
+        fx = f(xa, active)
+        la = np.where(fx < 0, xa, la)
+        ha = np.where(fx > 0, xa, ha)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(fx == 0, 0.0, fx / fprime(xa, active))
+        step = np.where(np.isnan(step), np.inf, step)
+        done = np.abs(step) <= tol * np.maximum(1.0, np.abs(xa))
+        x_new = xa - step
+        outside = ~done & ~((la < x_new) & (x_new < ha))
+        x_new = np.where(outside, 0.5 * (la + ha), x_new)
+        x[active], lo[active], hi[active] = x_new, la, ha
+        active[active] = ~done
+        if not active.any():
+            break
+    return x
+
+
+def _solve_elliptic(M, e, tol):
+    """Eccentric anomaly E from M = E - e*sin(E), for 0 < e < 1."""
+    # E - M = e*sin(E) has the same 2*pi periodicity; solve for M in [-pi, pi)
+    if np.ndim(M) == 0 and np.ndim(e) == 0:
+        M, e = float(M), float(e)
+        offset = 2 * math.pi * math.floor((M + math.pi) / (2 * math.pi))
+        m = M - offset
+        # Danby's starter is within the bracket and close for every e
+        x0 = m + 0.85 * e * math.copysign(1.0, math.sin(m)) if m else 0.0
+        return offset + _newton_scalar(
+            lambda E: E - e * math.sin(E) - m,
+            lambda E: 1 - e * math.cos(E),
+            min(max(x0, -math.pi), math.pi), -math.pi, math.pi, tol,
+        )
+    offset = 2 * np.pi * np.floor((M + np.pi) / (2 * np.pi))
+    m = M - offset
+    x0 = np.clip(m + 0.85 * e * np.sign(np.sin(m)), -np.pi, np.pi)
+    bound = np.full(m.shape, np.pi)
+    return offset + _newton_array(
+        lambda E, i: E - e[i] * np.sin(E) - m[i],
+        lambda E, i: 1 - e[i] * np.cos(E),
+        x0, -bound, bound, tol,
+    )
+
+
+def _solve_hyperbolic(M, e, tol):
+    """Hyperbolic anomaly H from M = e*sinh(H) - H, for e > 1."""
+    # The equation is odd in H; solve for |M| in asinh(|M|/e) <= H <= asinh(|M|/(e-1))
+    if np.ndim(M) == 0 and np.ndim(e) == 0:
+        M, e = float(M), float(e)
+        m = abs(M)
+        hi = math.asinh(m / (e - 1))
+        return math.copysign(_newton_scalar(
+            lambda H: e * math.sinh(H) - H - m,
+            lambda H: e * math.cosh(H) - 1,
+            hi, math.asinh(m / e), hi, tol,
+        ), M)
+    m = np.abs(M)
+    hi = np.arcsinh(m / (e - 1))
+    H = _newton_array(
+        lambda H, i: e[i] * np.sinh(H) - H - m[i],
+        lambda H, i: e[i] * np.cosh(H) - 1,
+        # f is convex for H > 0, so Newton from the upper bound never overshoots
+        hi, np.arcsinh(m / e), hi, tol,
+    )
+    return np.copysign(H, M)
+
+
+def _solve_parabolic(M):
+    """Parabolic anomaly D = tan(nu/2) from Barker's equation M = D + D**3/3."""
+    # Closed-form root of the depressed cubic D**3 + 3*D - 3*M = 0. D is odd
+    # in M; solving for |M| avoids cancellation in B + sqrt(1 + B**2).
+    B = 1.5 * np.abs(np.asarray(M, dtype=float))
+    A = np.cbrt(B + np.sqrt(1 + B * B))
+    D = np.copysign(A - 1 / A, M)
+    return float(D) if np.ndim(D) == 0 else D
+
+
+@instrumented
+def solve_kepler_equation(M: ArrayLike, e: ArrayLike, tol: float = 1e-12) -> float | NDArray:
     """
-    if e == 0:
-        return M
+    Solve Kepler's equation for the anomaly, for any conic orbit.
 
-    # Use Brent's method for robust solution
-    def kepler_eq(E: float) -> float:
-        return E - e * np.sin(E) - M
+    - Elliptic (0 <= e < 1): M = E - e*sin(E), returns the eccentric anomaly E
+    - Parabolic (e == 1): M = D + D**3/3 (Barker), returns D = tan(theta/2)
+    - Hyperbolic (e > 1): M = e*sinh(H) - H, returns the hyperbolic anomaly H
 
-    # E is bounded by M - e <= E <= M + e for e < 1
-    E = brentq(kepler_eq, M - np.pi, M + np.pi)
-    return E
+    Uses Newton's method from a close starting guess, falling back to
+    bisection where Newton would leave the bracket around the root (e
+    close to 1, M close to 0). M and e may be arrays (broadcast together);
+    scalars take a pure-Python path that avoids numpy call overhead.
 
+    Args:
+        M: Mean anomaly (radians)
+        e: Eccentricity (e >= 0)
+        tol: Convergence tolerance on the anomaly
 
-def true_anomaly_from_eccentric(E: float, e: float) -> float:
+    Returns:
+        The anomaly (see above); a float for scalar input
+    """
+    if np.ndim(M) == 0 and np.ndim(e) == 0:
+        if e < 0:
+            raise ValueError("Eccentricity must be non-negative")
+        if e == 0:
+            return float(M)
+        if e < 1:
+            return _solve_elliptic(M, e, tol)
+        if e == 1:
+            return _solve_parabolic(M)
+        return _solve_hyperbolic(M, e, tol)
+
+    M, e = np.broadcast_arrays(np.asarray(M, dtype=float), np.asarray(e, dtype=float))
+    if np.any(e < 0):
+        raise ValueError("Eccentricity must be non-negative")
+    result = M.copy()
+    for mask, solve in (
+        ((e > 0) & (e < 1), lambda m, ecc: _solve_elliptic(m, ecc, tol)),
+        (e == 1, lambda m, ecc: _solve_parabolic(m)),
+        (e > 1, lambda m, ecc: _solve_hyperbolic(m, ecc, tol)),
+    ):
+        if mask.any():
+            result[mask] = solve(M[mask], e[mask])
+    return result
+
+
+def true_anomaly_from_eccentric(E: ArrayLike, e: float) -> float | NDArray:
     """
-    Convert eccentric anomaly to true anomaly.
+    Convert the anomaly returned by solve_kepler_equation to true anomaly.
 
     Args:
-        E: Eccentric anomaly (radians)
+        E: Eccentric (e < 1), parabolic (e == 1) or hyperbolic (e > 1) anomaly
         e: Eccentricity
 
     Returns:
         theta: True anomaly (radians)
     """
-    return 2 * np.arctan2(
-        np.sqrt(1 + e) * np.sin(E / 2), np.sqrt(1 - e) * np.cos(E / 2)
-    )
+    if e < 1:
+        return 2 * np.arctan2(
+            np.sqrt(1 + e) * np.sin(E / 2), np.sqrt(1 - e) * np.cos(E / 2)
+        )
+    if e == 1:
+        return 2 * np.arctan(E)
+    return 2 * np.arctan(np.sqrt((e + 1) / (e - 1)) * np.tanh(E / 2))
 
 
+@instrumented
 def ellipse_from_eccentricity(
     e: float, a: float = 1.0, n_points: int = 200
 ) -> tuple[NDArray[np.floating], NDArray[np.floating]]:
@@ -67,6 +206,7 @@ def ellipse_from_eccentricity(
     return x, y
 
 
+@instrumented
 def kepler_orbit(
     e: float, a: float = 1.0, n_frames: int = 100
 ) -> tuple[NDArray[np.floating], NDArray[np.floating], NDArray[np.floating]]:
@@ -84,20 +224,63 @@ def kepler_orbit(
     # Mean anomaly progresses linearly with time
     M_values = np.linspace(0, 2 * np.pi, n_frames, endpoint=False)
 
-    x = np.zeros(n_frames)
-    y = np.zeros(n_frames)
-
-    for i, M in enumerate(M_values):
-        E = solve_kepler_equation(M, e)
-        theta = true_anomaly_from_eccentric(E, e)
-        r = a * (1 - e**2) / (1 + e * np.cos(theta))
-        x[i] = r * np.cos(theta)
-        y[i] = r * np.sin(theta)
+    E = solve_kepler_equation(M_values, e)
+    theta = true_anomaly_from_eccentric(E, e)
+    r = a * (1 - e**2) / (1 + e * np.cos(theta))
+    x = r * np.cos(theta)
+    y = r * np.sin(theta)
 
     t = M_values / (2 * np.pi)  # Normalized time [0, 1)
     return x, y, t
 
 
+@instrumented
+def escape_orbit(
+    e: float, q: float = 1.0, n_frames: int = 100, r_max: float = 10.0
+) -> tuple[NDArray[np.floating], NDArray[np.floating], NDArray[np.floating]]:
+    """
+    Generate an escape (parabolic or hyperbolic) trajectory with correct timing.
+
+    The body comes in from r_max, passes periapsis on the +x axis and
+    leaves again, with frames equally spaced in time.
+
+    Args:
+        e: Eccentricity (e >= 1)
+        q: Periapsis distance
+        n_frames: Number of time steps
+        r_max: Distance from the focus where the trajectory starts and ends
+
+    Returns:
+        (x, y, t): Position arrays and normalized time (0 to 1)
+    """
+    if e < 1:
+        raise ValueError("Escape orbits need e >= 1; use kepler_orbit for e < 1")
+    if r_max <= q:
+        raise ValueError("r_max must be beyond the periapsis distance q")
+
+    # True anomaly where the orbit reaches r_max
+    p = q * (1 + e)  # Semi-latus rectum
+    theta_max = np.arccos((p / r_max - 1) / e)
+
+    # Mean anomaly at r_max; it progresses linearly with time
+    if e == 1:
+        D = np.tan(theta_max / 2)
+        M_max = D + D**3 / 3
+    else:
+        H = 2 * np.arctanh(np.sqrt((e - 1) / (e + 1)) * np.tan(theta_max / 2))
+        M_max = e * np.sinh(H) - H
+    M_values = np.linspace(-M_max, M_max, n_frames)
+
+    theta = true_anomaly_from_eccentric(solve_kepler_equation(M_values, e), e)
+    r = p / (1 + e * np.cos(theta))
+    x = r * np.cos(theta)
+    y = r * np.sin(theta)
+
+    t = (M_values + M_max) / (2 * M_max)  # Normalized time [0, 1]
+    return x, y, t
+
+
+@instrumented
 def swept_area_points(
     e: float, a: float, theta_start: float, theta_end: float, n_points: int = 50
 ) -> tuple[NDArray[np.floating], NDArray[np.floating]]:
@@ -129,8 +312,13 @@ def swept_area_points(
     return x, y
 
 
+@instrumented
 def projectile_trajectory(
-    v0: float, g: float = 9.8, R: float = 6.371e6, n_points: int = 500
+    v0: float,
+    g: float = 9.8,
+    R: float = 6.371e6,
+    n_points: int = 500,
+    r_max: float = 10.0,
 ) -> tuple[NDArray[np.floating], NDArray[np.floating], bool]:
     """
     Calculate projectile trajectory for Newton's cannon thought experiment.
@@ -142,6 +330,7 @@ def projectile_trajectory(
         g: Surface gravity (m/s²)
         R: Planet radius (m)
         n_points: Number of trajectory points
+        r_max: Distance (in planet radii) where escape trajectories are cut off
 
     Returns:
         (x, y, is_orbit): Trajectory coordinates and whether it achieves orbit
@@ -176,25 +365,18 @@ def projectile_trajectory(
         return x / R, y / R, False
 
     else:
-        # Orbital trajectory
-        # Energy determines orbit type
-        specific_energy = 0.5 * v0**2 - g * R
-
-        if specific_energy >= 0:
-            # Escape trajectory - cap at some distance
-            e = 1.0 + 2 * specific_energy * R / (g * R**2)
-            e = min(e, 0.95)  # Cap for visualization
-        else:
-            # Bound orbit
-            a = -g * R**2 / (2 * specific_energy)  # Semi-major axis
-            # Eccentricity from energy and angular momentum
-            L = v0 * R  # Angular momentum per unit mass
-            e = np.sqrt(1 + 2 * specific_energy * L**2 / (g * R) ** 2)
-            e = min(max(e, 0), 0.95)  # Bound for visualization
-
-        # Generate orbital points
-        theta = np.linspace(0, 2 * np.pi, n_points)
+        # Orbital trajectory: launched horizontally, so the launch point is
+        # the periapsis and the orbit's shape follows from the speed alone
+        e = v_norm**2 - 1
         p = R * v_norm**2  # Semi-latus rectum
+
+        if e < 1:
+            # Bound orbit: the whole ellipse
+            theta = np.linspace(0, 2 * np.pi, n_points)
+        else:
+            # Escape trajectory: up to where it leaves the view
+            theta_max = np.arccos((p / (r_max * R) - 1) / e)
+            theta = np.linspace(0, theta_max, n_points)
         r = p / (1 + e * np.cos(theta))
 
         # Position (starting from top of planet, moving right)
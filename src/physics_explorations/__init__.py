@@ -1,17 +1,50 @@
-"""Physics Explorations - Interactive Feynman-style physics notebooks."""
+"""Physics Explorations - Interactive Feynman-style physics notebooks.
 
-from physics_explorations.export import (
-    export_all,
-    export_notebook,
-    extract_metadata,
-    get_all_notebooks,
-    NotebookMetadata,
-)
+The export functions are imported on first use (PEP 562), so importing a
+subpackage such as `physics_explorations.visualization` does not load the
+export machinery.
+"""
+
+from typing import TYPE_CHECKING
+
+from physics_explorations._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from physics_explorations.export import (
+        ExportError,
+        ExportResult,
+        export_all,
+        export_notebook,
+        extract_metadata,
+        get_all_notebooks,
+        index_notebooks,
+        NotebookMetadata,
+    )
+    from physics_explorations.export_inprocess import export_notebook_in_process
+
+# Module that defines each public name
+_LAZY_NAMES = {
+    "ExportError": "export",
+    "ExportResult": "export",
+    "export_all": "export",
+    "export_notebook": "export",
+    "export_notebook_in_process": "export_inprocess",
+    "extract_metadata": "export",
+    "get_all_notebooks": "export",
+    "index_notebooks": "export",
+    "NotebookMetadata": "export",
+}
 
 __all__ = [
+    "ExportError",
+    "ExportResult",
     "export_all",
     "export_notebook",
+    "export_notebook_in_process",
     "extract_metadata",
     "get_all_notebooks",
+    "index_notebooks",
     "NotebookMetadata",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_NAMES)
@@ -0,0 +1,45 @@
+"""Lazy package exports (PEP 562).
+
+A package that wants its public names imported on first use maps each name
+to the submodule defining it and installs the functions returned by
+`lazy_exports` as its module-level `__getattr__` and `__dir__`:
+
+    __getattr__, __dir__ = lazy_exports(__name__, _LAZY_NAMES)
+
+List the same imports under `if TYPE_CHECKING:` so type checkers (and
+export_cache's dependency tracking) see where each name comes from.
+"""
+
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    package: str, names: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Return a package's PEP 562 `__getattr__` and `__dir__`.
+
+    Args:
+        package: The package's `__name__`; it must be importing when called
+        names: Public name -> submodule of the package that defines it
+
+    Returns:
+        (__getattr__, __dir__) for the package's namespace
+    """
+    namespace = vars(sys.modules[package])
+
+    def __getattr__(name: str) -> Any:
+        submodule = names.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{submodule}"), name)
+        # Cache it so later lookups do not come back here
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(namespace.get("__all__", ())))
+
+    return __getattr__, __dir__
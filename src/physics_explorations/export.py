@@ -3,22 +3,93 @@ Notebook export utilities for Physics Explorations.
 
 This module provides functions to:
 - Discover notebooks in the notebooks directory
-- Extract metadata (title, description, tags) from notebooks
-- Export notebooks to HTML
+- Extract metadata (title, description, tags) from notebooks, cached by mtime
+- Export notebooks to HTML (optionally in parallel, optionally in-process)
+- Share one front-end asset bundle between the exported pages
+- Minify exported pages and precompress them (.gz/.br)
+- Make exported pages reproducible byte for byte (see export_deterministic)
+- Report export timings, memory and page sizes (see export_report)
+- Profile the cells of each notebook (see export_profile)
+- Keep slider-driven figures interactive without a kernel (slider bundles)
+- Re-export notebooks as they are edited (see export_watch)
 - Generate the index.html page dynamically
 """
 
+import argparse
+import contextlib
 import os
 import re
+import signal
 import subprocess
-from dataclasses import dataclass
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
 
+from physics_explorations.export_assets import (
+    AssetBundle,
+    build_asset_bundle,
+    localize_page,
+    prefetch_links,
+)
+from physics_explorations.export_budget import (
+    POLL_INTERVAL,
+    BudgetExceededError,
+    ExportBudget,
+    check_output_size,
+    over_budget,
+    process_tree,
+)
+from physics_explorations.export_cache import (
+    export_cache_key,
+    load_manifest,
+    save_manifest,
+)
+from physics_explorations.export_deterministic import normalize_page
+from physics_explorations.export_profile import (
+    PROFILE_BUDGET_FACTOR,
+    PROFILE_DIR_NAME,
+    PROFILE_ENV,
+    profiling,
+    profiling_enabled,
+)
+from physics_explorations.export_inprocess import (
+    NotebookExecutionError,
+    export_notebook_in_process,
+    kernel_hooks_run,
+    kernel_start_method,
+    preload,
+)
+from physics_explorations.export_minify import (
+    PageSizes,
+    postprocess_page,
+    remove_precompressed,
+)
+from physics_explorations.export_report import (
+    REPORT_NAME,
+    ExportReport,
+    NotebookReport,
+    analyze_page,
+    compare_reports,
+    pop_usage,
+    print_report,
+    record_usage,
+)
+from physics_explorations.export_watch import watch
+from physics_explorations.visualization.slider_cache import slider_bundling
+
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 NOTEBOOKS_DIR = PROJECT_ROOT / "notebooks"
 DOCS_DIR = PROJECT_ROOT / "docs"
 
+# How each notebook is exported: a `uv run marimo export` subprocess per
+# notebook, or marimo's Python API in warm worker processes
+ENGINES = ("subprocess", "inprocess")
+
 
 @dataclass
 class NotebookMetadata:
@@ -33,6 +104,32 @@ class NotebookMetadata:
     category: str  # "feynman" or "exploration"
 
 
+@dataclass
+class ExportResult:
+    """Outcome of exporting a single notebook."""
+
+    stem: str
+    output_path: Path | None
+    duration: float  # Wall time in seconds
+    error: str | None = None
+    cached: bool = False  # Reused unchanged HTML from a previous export
+    peak_rss_mb: float | None = None  # Peak RSS of the export, if measured
+    cell_times: dict[str, float] | None = None  # Seconds per marimo cell id
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ExportError(Exception):
+    """Raised by export_all when one or more notebooks failed to export."""
+
+    def __init__(self, failures: list[ExportResult]):
+        self.failures = failures
+        names = ", ".join(result.stem for result in failures)
+        super().__init__(f"{len(failures)} notebook(s) failed to export: {names}")
+
+
 # Notebooks that are part of the Feynman Lectures series
 FEYNMAN_NOTEBOOKS = {
     "gravitation", "speed_of_light", "spacetime", "wave_particle",
@@ -56,33 +153,70 @@ NOTEBOOK_TAGS = {
     "three_body": ["Orbital Mechanics", "Chaos Theory", "Animations"],
 }
 
+# Export budgets (time, memory, page size) for each notebook, a few times
+# what a normal export needs so only a runaway notebook hits them
+DEFAULT_BUDGET = ExportBudget()
+NOTEBOOK_BUDGETS = {
+    # Feynman Lectures series
+    "gravitation": ExportBudget(seconds=60, output_mb=6),
+    "speed_of_light": ExportBudget(seconds=60, output_mb=2),
+    "spacetime": ExportBudget(seconds=60, output_mb=2),
+    "wave_particle": ExportBudget(seconds=60, output_mb=6),
+    "magnetism": ExportBudget(seconds=100, output_mb=16),
+    "charged_motion": ExportBudget(seconds=120, output_mb=25),
+    "black_holes": ExportBudget(seconds=75, output_mb=16),
+    # Explorations
+    "beyond_light": ExportBudget(seconds=60, output_mb=10),
+    "dimensions": ExportBudget(seconds=100, output_mb=16),
+    "exotic_matter": ExportBudget(seconds=90, output_mb=18),
+    "three_body": ExportBudget(seconds=150, output_mb=30),
+}
+
 
 def get_all_notebooks() -> list[Path]:
     """Get all notebook files in the notebooks directory, sorted by name."""
     return sorted(NOTEBOOKS_DIR.glob("*.py"))
 
 
-def extract_metadata(notebook_path: Path) -> NotebookMetadata:
-    """Extract metadata from a notebook file.
+# Title: the first markdown heading (# Title) of a mo.md cell
+_TITLE = re.compile(r'mo\.md\(\s*r?"""[^"]*?#\s+([^\n]+)')
+# Description: the first substantial paragraph after the title
+_DESCRIPTION = re.compile(r'mo\.md\(\s*r?"""[^"]*?#[^\n]+\n+([^#\n][^\n]+)')
 
-    Parses the notebook to find:
-    - Number: position in sorted list (1-indexed)
-    - Title: from the first markdown heading
-    - Description: from content or first paragraph
-    - Tags: inferred from content
+# Characters read before looking for the title; doubled until it is found
+_HEADING_READ_SIZE = 4096
+
+# Parsed metadata by notebook path, with the (mtime, size) it was parsed at
+_metadata_cache: dict[Path, tuple[tuple[int, int], NotebookMetadata]] = {}
+
+
+def _read_heading(notebook_path: Path) -> tuple[re.Match | None, re.Match | None, str]:
+    """Read a notebook only as far as its title and description.
+
+    The title is in one of the first cells, so the file is read in growing
+    chunks (ending on line boundaries) until both are found.
+
+    Returns:
+        Title match, description match and the text read
     """
-    content = notebook_path.read_text()
+    text = ""
+    size = _HEADING_READ_SIZE
+    with notebook_path.open() as fp:
+        while True:
+            chunk = fp.read(size)
+            text += chunk + fp.readline()
+            title = _TITLE.search(text)
+            description = _DESCRIPTION.search(text)
+            if (title and description) or not chunk:
+                return title, description, text
+            size *= 2
+
+
+def _parse_metadata(notebook_path: Path, number: str) -> NotebookMetadata:
+    """Extract metadata from the leading cells of a notebook."""
     stem = notebook_path.stem
+    title_match, desc_match, content = _read_heading(notebook_path)
 
-    # Get number from position in sorted list
-    all_notebooks = get_all_notebooks()
-    try:
-        number = str(all_notebooks.index(notebook_path) + 1)
-    except ValueError:
-        number = "0"
-
-    # Extract title from first markdown heading (# Title)
-    title_match = re.search(r'mo\.md\(\s*r?"""[^"]*?#\s+([^\n]+)', content)
     if title_match:
         title = title_match.group(1).strip()
         # Clean up any trailing asterisks or formatting
@@ -91,11 +225,6 @@ def extract_metadata(notebook_path: Path) -> NotebookMetadata:
         # Fallback: convert filename to title
         title = stem.replace("_", " ").title()
 
-    # Extract description from first substantial paragraph after title
-    desc_match = re.search(
-        r'mo\.md\(\s*r?"""[^"]*?#[^\n]+\n+([^#\n][^\n]+)',
-        content
-    )
     if desc_match:
         description = desc_match.group(1).strip()
     else:
@@ -122,6 +251,54 @@ def extract_metadata(notebook_path: Path) -> NotebookMetadata:
     )
 
 
+def _cached_metadata(notebook_path: Path, number: str) -> NotebookMetadata:
+    """Return a notebook's metadata, parsing it only if the file changed."""
+    stat = notebook_path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _metadata_cache.get(notebook_path)
+    if cached is None or cached[0] != signature:
+        cached = (signature, _parse_metadata(notebook_path, number))
+        _metadata_cache[notebook_path] = cached
+    return replace(cached[1], number=number, tags=list(cached[1].tags))
+
+
+def extract_metadata(notebook_path: Path) -> NotebookMetadata:
+    """Extract metadata from a notebook file.
+
+    Parses the notebook to find:
+    - Number: position in sorted list (1-indexed)
+    - Title: from the first markdown heading
+    - Description: from content or first paragraph
+    - Tags: inferred from content
+
+    To get the metadata of every notebook, use index_notebooks(), which
+    scans the notebooks directory once instead of once per notebook.
+    """
+    # Get number from position in sorted list
+    all_notebooks = get_all_notebooks()
+    try:
+        number = str(all_notebooks.index(notebook_path) + 1)
+    except ValueError:
+        number = "0"
+    return _cached_metadata(notebook_path, number)
+
+
+def index_notebooks() -> list[NotebookMetadata]:
+    """Extract the metadata of every notebook, in notebook order.
+
+    The notebooks directory is scanned once and each file is read only up
+    to its description. Results are cached by modification time and size,
+    so a repeated call only re-reads notebooks that changed.
+
+    Returns:
+        Metadata of all notebooks, numbered from 1
+    """
+    return [
+        _cached_metadata(path, str(number))
+        for number, path in enumerate(get_all_notebooks(), start=1)
+    ]
+
+
 def _infer_tags(content: str, stem: str) -> list[str]:
     """Get tags for a notebook from the explicit mapping."""
     # Use explicit tags if defined, otherwise fall back to generic
@@ -137,24 +314,47 @@ def _markdown_links_to_html(text: str) -> str:
     return re.sub(pattern, r'<a href="\2" target="_blank">\1</a>', text)
 
 
+def budget_for(stem: str) -> ExportBudget:
+    """Return the export budget of a notebook, relaxed while profiling."""
+    budget = NOTEBOOK_BUDGETS.get(stem, DEFAULT_BUDGET)
+    if not profiling_enabled():
+        return budget
+    # Tracing every allocation makes cells slower and hungrier
+    return replace(
+        budget,
+        seconds=budget.seconds * PROFILE_BUDGET_FACTOR,
+        memory_mb=budget.memory_mb and budget.memory_mb * PROFILE_BUDGET_FACTOR,
+    )
+
+
 def export_notebook(
     notebook_path: Path,
     output_dir: Path,
-    include_code: bool = False
+    include_code: bool = False,
+    budget: ExportBudget | None = None,
 ) -> Path:
     """Export a single notebook to HTML.
 
+    The export runs in its own process group, which is killed as a whole
+    when it goes over its time or memory budget. The largest peak RSS among
+    the export's processes (uv, marimo and the notebook kernel) is recorded
+    with export_report.record_usage where the OS reports it, and so is the
+    export's stderr, where marimo prints the warnings cells emit.
+
     Args:
         notebook_path: Path to the notebook file
         output_dir: Directory to write the HTML file
         include_code: Whether to include source code in output
+        budget: Limits for this export (defaults to DEFAULT_BUDGET)
 
     Returns:
         Path to the generated HTML file
 
     Raises:
         subprocess.CalledProcessError: If export fails
+        BudgetExceededError: If the export went over its budget
     """
+    budget = budget or DEFAULT_BUDGET
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / f"{notebook_path.stem}.html"
 
@@ -166,28 +366,87 @@ def export_notebook(
     if not include_code:
         cmd.append("--no-include-code")
 
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        cwd=PROJECT_ROOT,
-        timeout=180,
-    )
-
-    if result.returncode != 0:
-        raise subprocess.CalledProcessError(
-            result.returncode, cmd, result.stdout, result.stderr
+    with tempfile.TemporaryFile("w+") as stdout, tempfile.TemporaryFile("w+") as stderr:
+        proc = subprocess.Popen(
+            cmd, stdout=stdout, stderr=stderr, text=True, cwd=PROJECT_ROOT,
+            start_new_session=True,
         )
-
+        returncode = _wait_within_budget(proc, budget)
+        stderr.seek(0)
+        errors = stderr.read()
+        record_usage(stderr=errors)
+        if returncode != 0:
+            stdout.seek(0)
+            raise subprocess.CalledProcessError(returncode, cmd, stdout.read(), errors)
+
+    check_output_size(output_path, budget)
     return output_path
 
 
-def generate_index_html(notebooks: list[NotebookMetadata], output_dir: Path) -> Path:
+def _kill_process_tree(proc: subprocess.Popen) -> None:
+    """Kill an export process and all its descendants."""
+    # marimo starts its own session, so the process group alone is not enough
+    descendants = process_tree(proc.pid)[1:]
+    if hasattr(os, "killpg"):
+        for pid in descendants:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGKILL)
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    else:
+        proc.kill()
+    proc.wait()
+
+
+def _wait_within_budget(proc: subprocess.Popen, budget: ExportBudget) -> int:
+    """Wait for an export process, killing it if it goes over budget.
+
+    Popen.wait() discards the resource usage the OS reports for the exited
+    process, so where os.wait4 is available the process is reaped with it
+    and its peak RSS (including its children) is recorded.
+
+    Returns:
+        The exit code of the process
+
+    Raises:
+        BudgetExceededError: If the process went over its budget
+    """
+    start = time.monotonic()
+    try:
+        while True:
+            if hasattr(os, "wait4"):
+                pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+                if pid:
+                    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+                    scale = 1e6 if sys.platform == "darwin" else 1e3
+                    record_usage(peak_rss_mb=usage.ru_maxrss / scale)
+                    proc.returncode = os.waitstatus_to_exitcode(status)
+                    return proc.returncode
+            elif proc.poll() is not None:
+                return proc.returncode
+
+            error = over_budget(budget, time.monotonic() - start, process_tree(proc.pid))
+            if error is not None:
+                raise error
+            time.sleep(POLL_INTERVAL)
+    except BaseException:
+        # Over budget or interrupted: the export runs in its own session,
+        # so it would not be stopped along with us
+        _kill_process_tree(proc)
+        raise
+
+
+def generate_index_html(
+    notebooks: list[NotebookMetadata],
+    output_dir: Path,
+    bundle: AssetBundle | None = None,
+) -> Path:
     """Generate the index.html page from notebook metadata.
 
     Args:
         notebooks: List of notebook metadata
         output_dir: Directory to write the index.html file
+        bundle: Shared asset bundle to prefetch for the notebook pages
 
     Returns:
         Path to the generated index.html file
@@ -206,12 +465,15 @@ def generate_index_html(notebooks: list[NotebookMetadata], output_dir: Path) ->
     github_repo = os.environ.get("GITHUB_REPOSITORY", "")
     github_url = f"https://github.com/{github_repo}" if github_repo else "#"
 
+    # Warm the cache with the notebooks' runtime while the index is open
+    head_links = f"\n{prefetch_links(bundle)}" if bundle else ""
+
     html = f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Feynman Physics Visualizations</title>
+    <title>Feynman Physics Visualizations</title>{head_links}
     <style>
         * {{
             margin: 0;
@@ -475,41 +737,417 @@ def _generate_card(nb: NotebookMetadata) -> str:
             </div>'''
 
 
-def export_all(output_dir: Path | None = None, include_code: bool = False) -> list[Path]:
+def _export_timed(
+    meta: NotebookMetadata,
+    output_dir: Path,
+    include_code: bool,
+    engine: str = "subprocess",
+    deterministic: bool = False,
+) -> ExportResult:
+    """Export one notebook, capturing its wall time, usage and any failure."""
+    if engine == "inprocess":
+        exporter = partial(export_notebook_in_process, deterministic=deterministic)
+    else:
+        exporter = export_notebook
+    pop_usage()
+    start = time.perf_counter()
+    output_path, error = None, None
+    try:
+        output_path = exporter(meta.path, output_dir, include_code, budget_for(meta.stem))
+    except (NotebookExecutionError, BudgetExceededError) as e:
+        error = str(e)
+    except subprocess.CalledProcessError as e:
+        stderr = (e.stderr or "").strip().splitlines()
+        error = stderr[-1] if stderr else f"exit code {e.returncode}"
+    except Exception as e:
+        # Anything else (unwritable output, a notebook that fails to import)
+        # fails this notebook only
+        error = f"{type(e).__name__}: {e}"
+    duration = time.perf_counter() - start
+    usage = pop_usage()
+    return ExportResult(
+        meta.stem,
+        output_path,
+        duration,
+        error,
+        peak_rss_mb=usage.get("peak_rss_mb"),
+        cell_times=usage.get("cell_times"),
+    )
+
+
+def _notebook_report(result: ExportResult, previous: ExportReport | None) -> NotebookReport:
+    """Telemetry for one notebook of this run."""
+    if not result.ok:
+        return NotebookReport(
+            result.stem, result.duration, peak_rss_mb=result.peak_rss_mb, error=result.error
+        )
+    if result.cached:
+        # Nothing was measured; keep what the run that exported it measured
+        earlier = previous.notebook(result.stem) if previous else None
+        if earlier is not None and not earlier.error:
+            earlier.cached = True
+            return earlier
+        report = analyze_page(result.output_path, result.stem, 0.0)
+        report.cached = True
+        return report
+    return analyze_page(
+        result.output_path,
+        result.stem,
+        result.duration,
+        cell_times=result.cell_times,
+        peak_rss_mb=result.peak_rss_mb,
+    )
+
+
+def _format_size(n_bytes: int | None) -> str:
+    """Format a byte count in MB, or "-" when not available."""
+    return "-" if n_bytes is None else f"{n_bytes / 1e6:.2f} MB"
+
+
+def _print_sizes(sizes: list[PageSizes]) -> None:
+    """Print page sizes before and after post-processing."""
+    print("Page sizes (original -> minified, gzip, brotli):")
+    for page in sorted(sizes, key=lambda p: p.original, reverse=True):
+        saved = 1 - page.minified / page.original if page.original else 0.0
+        print(
+            f"  {page.stem:<20} {_format_size(page.original):>10} -> "
+            f"{_format_size(page.minified):>10} ({saved:4.0%} smaller)  "
+            f"{_format_size(page.gzip):>10}  {_format_size(page.brotli):>10}"
+        )
+
+
+def export_all(
+    output_dir: Path | None = None,
+    include_code: bool = False,
+    workers: int | None = None,
+    use_cache: bool = True,
+    engine: str = "subprocess",
+    shared_assets: bool = False,
+    minify: bool = False,
+    precompress: bool = False,
+    deterministic: bool = False,
+    baseline: Path | None = None,
+    regression_threshold: float = 0.2,
+    profile: bool = False,
+    slider_bundles: bool = False,
+) -> list[Path]:
     """Export all notebooks and generate index.html.
 
+    Notebooks are exported concurrently, largest first so the slowest
+    exports start early. With the "subprocess" engine each export is its
+    own `marimo export` subprocess, so worker threads only wait on them.
+    The "inprocess" engine instead runs exports through marimo's Python API
+    in a pool of worker processes that import numpy, plotly and marimo once
+    and reuse them for every notebook they export. A failing notebook does
+    not stop the others; failures are reported once all exports have
+    finished.
+
+    With `shared_assets`, the marimo front end and Plotly.js are copied once
+    into a hashed `assets/` directory that every page (and the index, via
+    prefetch) references instead of the CDNs. `minify` and `precompress`
+    post-process each freshly exported page (see export_minify) and print
+    its size before and after. `deterministic` makes unchanged notebooks
+    export to identical bytes on every run (see export_deterministic).
+
+    Every run writes a telemetry report (export time, peak RSS, per-cell
+    times with the "inprocess" engine, page size, Plotly figures and
+    frames) to `output_dir/.export-report.json` and prints it. With
+    `baseline`, notebooks that got slower, hungrier or bigger than in an
+    earlier report are listed.
+
+    With `profile` (or PHYSICS_EXPORT_PROFILE set), every cell of the
+    notebooks exported in this run is profiled and the profiles are written
+    to `output_dir/.profiles/` (see export_profile). Profiling needs the
+    "inprocess" engine and bypasses the cache, so every notebook is
+    exported and profiled.
+
+    With `slider_bundles`, the notebooks are run with PHYSICS_SLIDER_BUNDLES
+    set: figures memoized with visualization.slider_cache are evaluated over
+    their whole slider grid and embedded as one page that switches between
+    them in the browser, so they stay interactive without a kernel.
+
+    With `use_cache`, a notebook whose cache key (source, imported library
+    modules, marimo/plotly versions, options) matches the manifest in
+    `output_dir` keeps its existing HTML instead of being re-exported.
+
     Args:
         output_dir: Directory to write files (defaults to PROJECT_ROOT/docs)
         include_code: Whether to include source code in notebook exports
+        workers: Concurrent exports (defaults to the CPU count, 1 is serial)
+        use_cache: Whether to skip notebooks unchanged since the last export
+            (ignored when profiling)
+        engine: "subprocess" or "inprocess" (see ENGINES)
+        shared_assets: Whether pages load their runtime from a shared bundle
+        minify: Whether to minify the exported pages
+        precompress: Whether to write .gz/.br siblings of every page
+        deterministic: Whether to normalize per-run ids and seed the global
+            random generators
+        baseline: Earlier export report to compare this run against
+        regression_threshold: Relative growth over the baseline that is
+            reported as a regression (0.2 = 20%)
+        profile: Whether to write a profile of every cell
+        slider_bundles: Whether to precompute the states of slider-driven figures
 
     Returns:
         List of all generated file paths
+
+    Raises:
+        ValueError: If the engine is unknown, profiling was asked of the
+            "subprocess" engine, or the installed marimo does not (or cannot
+            be shown to) fork its kernels, which the "inprocess" engine
+            relies on
+        ExportError: If any notebook failed to export
     """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown export engine {engine!r}, expected one of {ENGINES}")
+    profile = profile or profiling_enabled()
+    if profile and engine != "inprocess":
+        raise ValueError("Cell profiling needs the inprocess engine")
+    # A skipped notebook would get no profile
+    use_cache = use_cache and not profile
+    if engine == "inprocess":
+        method = kernel_start_method()
+        if method == "unknown":
+            raise ValueError(
+                "The inprocess engine needs marimo to fork its kernels, but this "
+                "marimo's kernel start method could not be determined; use the "
+                "subprocess engine"
+            )
+        if method != "fork":
+            raise ValueError(
+                f"The inprocess engine needs marimo to fork its kernels, but the "
+                f"installed marimo starts them with {method!r}; use the subprocess engine"
+            )
+        if not kernel_hooks_run():
+            raise ValueError(
+                "The inprocess engine needs its cell hooks to run in marimo's kernels, "
+                "but a test export recorded no cell timings; use the subprocess engine"
+            )
     if output_dir is None:
         output_dir = DOCS_DIR
+    if workers is None:
+        workers = os.cpu_count() or 1
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    generated_files = []
+    report_path = output_dir / REPORT_NAME
+    # Read before this run overwrites it, the baseline may be the same file
+    previous = ExportReport.load(report_path)
+    baseline_report = ExportReport.load(baseline) if baseline else None
+    if baseline and baseline_report is None:
+        print(f"Warning: no usable export report at {baseline}, not comparing")
 
     # Get all notebooks and extract metadata
-    notebooks = get_all_notebooks()
-    metadata_list = [extract_metadata(nb) for nb in notebooks]
+    metadata_list = index_notebooks()
 
-    # Export each notebook
-    print("Exporting physics notebooks...")
+    # Skip notebooks whose inputs are unchanged since the last export
+    keys = {
+        meta.stem: export_cache_key(
+            meta.path, include_code, shared_assets, minify, precompress, deterministic,
+            slider_bundles,
+        )
+        for meta in metadata_list
+    }
+    manifest = load_manifest(output_dir) if use_cache else {}
+    results: dict[str, ExportResult] = {}
     for meta in metadata_list:
-        print(f"  {meta.number}. {meta.stem}...")
-        output_path = export_notebook(meta.path, output_dir, include_code)
-        generated_files.append(output_path)
+        output_path = output_dir / f"{meta.stem}.html"
+        key = keys[meta.stem]
+        if key is not None and manifest.get(meta.stem) == key and output_path.exists():
+            results[meta.stem] = ExportResult(meta.stem, output_path, 0.0, cached=True)
+    stale = [meta for meta in metadata_list if meta.stem not in results]
+
+    # Largest notebooks first: file size is a good proxy for export time
+    schedule = sorted(stale, key=lambda m: m.path.stat().st_size, reverse=True)
+
+    print(
+        f"Exporting physics notebooks ({workers} {engine} "
+        f"worker{'s' if workers != 1 else ''})..."
+    )
+    for stem in results:
+        print(f"  {stem}... unchanged, skipped")
+    start = time.perf_counter()
+    bundle = build_asset_bundle(output_dir) if shared_assets else None
+    sizes: list[PageSizes] = []
+    if engine == "inprocess":
+        # Never start more warm interpreters than there are notebooks to export
+        pool = ProcessPoolExecutor(
+            max_workers=max(1, min(workers, len(schedule))), initializer=preload
+        )
+    else:
+        pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    # Workers and the kernels they fork inherit the environment variables
+    with (
+        pool,
+        profiling() if profile else contextlib.nullcontext(),
+        slider_bundling() if slider_bundles else contextlib.nullcontext(),
+    ):
+        futures = {
+            pool.submit(
+                _export_timed, meta, output_dir, include_code, engine, deterministic
+            ): meta
+            for meta in schedule
+        }
+        for future in as_completed(futures):
+            meta = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (BrokenProcessPool) or its result was lost
+                result = ExportResult(meta.stem, None, 0.0, f"{type(e).__name__}: {e}")
+            if result.ok:
+                if bundle is not None:
+                    localize_page(result.output_path, bundle)
+                if deterministic:
+                    normalize_page(result.output_path)
+                if minify or precompress:
+                    sizes.append(postprocess_page(result.output_path, minify, precompress))
+                else:
+                    remove_precompressed(result.output_path)
+            results[meta.stem] = result
+            status = f"{result.duration:.1f}s" if result.ok else "FAILED"
+            print(f"  {meta.number}. {meta.stem}... {status}")
+    report = ExportReport(
+        engine=engine,
+        workers=workers,
+        elapsed=time.perf_counter() - start,
+        notebooks=[_notebook_report(results[meta.stem], previous) for meta in metadata_list],
+    )
+    report.save(report_path)
+    regressions = (
+        compare_reports(report, baseline_report, regression_threshold)
+        if baseline_report else []
+    )
+    print_report(report, regressions)
+    if sizes:
+        _print_sizes(sizes)
+    if profile and schedule:
+        print(f"Cell profiles written to {output_dir / PROFILE_DIR_NAME}/")
+
+    # Record successful exports so the next run can skip them
+    for stem, result in results.items():
+        if result.ok and keys[stem] is not None:
+            manifest[stem] = keys[stem]
+        else:
+            manifest.pop(stem, None)
+    save_manifest(output_dir, manifest)
+
+    failures = [results[meta.stem] for meta in metadata_list if not results[meta.stem].ok]
+    if failures:
+        raise ExportError(failures)
+
+    # Keep the output order stable regardless of completion order
+    generated_files = [results[meta.stem].output_path for meta in metadata_list]
 
     # Generate index.html
     print("Generating index.html...")
-    index_path = generate_index_html(metadata_list, output_dir)
+    index_path = generate_index_html(metadata_list, output_dir, bundle)
+    if precompress:
+        postprocess_page(index_path, minify=False)
+    else:
+        remove_precompressed(index_path)
     generated_files.append(index_path)
 
     print(f"Done! Output in {output_dir}/")
     return generated_files
 
 
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point for `python -m physics_explorations.export`."""
+    parser = argparse.ArgumentParser(description="Export the physics notebooks to HTML.")
+    parser.add_argument(
+        "-o", "--output-dir", type=Path, default=None,
+        help="Output directory (default: docs/)",
+    )
+    parser.add_argument(
+        "--include-code", action="store_true",
+        help="Include notebook source code in the exported pages",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None,
+        help="Concurrent exports (default: CPU count; 1 exports serially)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Re-export every notebook, ignoring the export cache",
+    )
+    parser.add_argument(
+        "--engine", choices=ENGINES, default="subprocess",
+        help="Export with one `uv run marimo` subprocess per notebook (default) "
+             "or in-process in warm worker processes",
+    )
+    parser.add_argument(
+        "--shared-assets", action="store_true",
+        help="Serve the marimo front end and Plotly.js from one hashed assets/ "
+             "directory shared by all pages instead of the CDNs",
+    )
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="Minify the exported pages",
+    )
+    parser.add_argument(
+        "--precompress", action="store_true",
+        help="Write .gz and .br copies of every page for static hosting",
+    )
+    parser.add_argument(
+        "--deterministic", action="store_true",
+        help="Make unchanged notebooks export to identical bytes on every run",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Write a wall/CPU time, allocation and figure size profile of every "
+             "cell to .profiles/ (needs --engine inprocess)",
+    )
+    parser.add_argument(
+        "--slider-bundles", action="store_true",
+        help="Precompute every state of the slider-driven figures so they stay "
+             "interactive in the static pages",
+    )
+    parser.add_argument(
+        "--compare", type=Path, default=None, metavar="REPORT",
+        help=f"Compare timings and sizes with an earlier {REPORT_NAME}",
+    )
+    parser.add_argument(
+        "--regression-threshold", type=float, default=0.2,
+        help="Relative growth reported as a regression by --compare (default: 0.2)",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="After exporting, keep re-exporting the notebooks affected by "
+             "changes to notebooks/ or src/ until interrupted",
+    )
+    args = parser.parse_args(argv)
+    if (args.profile or profiling_enabled()) and args.engine != "inprocess":
+        parser.error(f"--profile (or {PROFILE_ENV}) needs --engine inprocess")
+    options = dict(
+        include_code=args.include_code,
+        workers=args.workers,
+        engine=args.engine,
+        shared_assets=args.shared_assets,
+        minify=args.minify,
+        precompress=args.precompress,
+        deterministic=args.deterministic,
+        profile=args.profile,
+        slider_bundles=args.slider_bundles,
+        baseline=args.compare,
+        regression_threshold=args.regression_threshold,
+    )
+    if not args.watch:
+        export_all(args.output_dir, use_cache=not args.force, **options)
+        return
+
+    def rebuild(use_cache: bool = True) -> None:
+        # Unchanged notebooks hit the export cache, so only affected ones re-export
+        try:
+            export_all(args.output_dir, use_cache=use_cache, **options)
+        except ExportError as e:
+            print(f"Error: {e}")
+        except Exception as e:
+            # Keep watching: the next save usually fixes it
+            print(f"Error: {type(e).__name__}: {e}")
+
+    rebuild(use_cache=not args.force)
+    watch(rebuild, NOTEBOOKS_DIR)
+
+
 if __name__ == "__main__":
-    export_all()
+    main()
@@ -0,0 +1,155 @@
+"""Shared front-end asset bundle for exported notebooks.
+
+Every exported page loads the marimo front end (JS, CSS, fonts including
+KaTeX) from jsDelivr, and the client-side animation players load Plotly.js
+from cdn.plot.ly. With a shared bundle those files are copied once into
+`assets/<hash>/` next to the pages and every page references them by a
+relative URL instead: the site is served from one origin, pages keep
+working if a CDN is unreachable, and a browser that has opened one notebook
+already holds the runtime for all the others.
+
+The directory name is a hash of the marimo and Plotly.js builds, so a
+bundle's URLs never change content and can be cached indefinitely; an
+upgrade produces a new directory and the old one is removed.
+"""
+
+import hashlib
+import re
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+ASSETS_DIRNAME = "assets"
+
+# Files in marimo's static build that exported pages never request
+_IGNORED_STATIC_FILES = ("index.html", "*.md", "files")
+
+_MARIMO_CDN = re.compile(
+    r"https://cdn\.jsdelivr\.net/npm/@marimo-team/frontend@(?P<version>[^/]+)/dist/"
+)
+_PLOTLY_CDN = re.compile(r"https://cdn\.plot\.ly/plotly-(?P<version>[\d.]+)\.min\.js")
+
+# Entry points of marimo's front end, as referenced by its index.html
+_ENTRY_POINT = re.compile(
+    r'<(?:script type="module"|link rel="stylesheet")[^>]*(?:src|href)="\./(assets/[^"]+)"'
+)
+
+
+@dataclass
+class AssetBundle:
+    """A copy of the front-end runtime shared by all exported pages."""
+
+    directory: Path  # assets/<hash> inside the output directory
+    marimo_version: str
+    plotly_version: str
+    entry_points: list[str]  # Paths of the JS/CSS every page loads, relative to directory
+
+    @property
+    def url(self) -> str:
+        """URL of the bundle relative to the output directory."""
+        return f"{ASSETS_DIRNAME}/{self.directory.name}"
+
+    @property
+    def plotly_filename(self) -> str:
+        return f"plotly-{self.plotly_version}.min.js"
+
+
+def _marimo_static_dir() -> Path:
+    """Return the directory holding marimo's built front end."""
+    import marimo
+
+    static_dir = Path(marimo.__file__).parent / "_static"
+    if not (static_dir / "index.html").is_file():
+        raise FileNotFoundError(f"marimo front-end build not found in {static_dir}")
+    return static_dir
+
+
+def build_asset_bundle(output_dir: Path) -> AssetBundle:
+    """Copy the marimo front end and Plotly.js into a hashed bundle.
+
+    The copy is skipped when the bundle already exists. Bundles left over
+    from other marimo/Plotly versions are deleted.
+
+    Args:
+        output_dir: Directory the pages are exported to
+
+    Returns:
+        The bundle now present in output_dir/assets
+    """
+    import marimo
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    static_dir = _marimo_static_dir()
+    plotly_version = get_plotlyjs_version()
+
+    # marimo's asset names already embed content hashes
+    digest = hashlib.sha256()
+    digest.update(f"marimo=={marimo.__version__}\nplotly.js=={plotly_version}\n".encode())
+    for path in sorted((static_dir / "assets").iterdir()):
+        digest.update(path.name.encode())
+    bundle_dir = output_dir / ASSETS_DIRNAME / digest.hexdigest()[:12]
+
+    entry_points = _ENTRY_POINT.findall((static_dir / "index.html").read_text())
+    bundle = AssetBundle(bundle_dir, marimo.__version__, plotly_version, entry_points)
+
+    if not bundle_dir.exists():
+        # Copy to a temporary name first so an interrupted copy is not reused
+        partial_dir = bundle_dir.with_name(bundle_dir.name + ".partial")
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        shutil.copytree(
+            static_dir, partial_dir, ignore=shutil.ignore_patterns(*_IGNORED_STATIC_FILES)
+        )
+        (partial_dir / bundle.plotly_filename).write_text(get_plotlyjs(), encoding="utf-8")
+        partial_dir.rename(bundle_dir)
+
+    for stale in bundle_dir.parent.iterdir():
+        if stale != bundle_dir and stale.is_dir():
+            shutil.rmtree(stale)
+    return bundle
+
+
+def localize_assets(html: str, bundle: AssetBundle) -> str:
+    """Point an exported page's CDN references at the shared bundle.
+
+    Only references to the bundled marimo and Plotly.js versions are
+    rewritten; anything else keeps loading from its CDN.
+
+    Args:
+        html: Exported page
+        bundle: Bundle in the same output directory as the page
+
+    Returns:
+        The page with bundled assets referenced by relative URL
+    """
+    def marimo_url(match: re.Match) -> str:
+        if match["version"] != bundle.marimo_version:
+            return match[0]
+        return f"{bundle.url}/"
+
+    def plotly_url(match: re.Match) -> str:
+        if match["version"] != bundle.plotly_version:
+            return match[0]
+        return f"{bundle.url}/{bundle.plotly_filename}"
+
+    return _PLOTLY_CDN.sub(plotly_url, _MARIMO_CDN.sub(marimo_url, html))
+
+
+def localize_page(page_path: Path, bundle: AssetBundle) -> None:
+    """Rewrite an exported HTML file in place with localize_assets."""
+    html = page_path.read_text(encoding="utf-8")
+    localized = localize_assets(html, bundle)
+    if localized != html:
+        page_path.write_text(localized, encoding="utf-8")
+
+
+def prefetch_links(bundle: AssetBundle, indent: str = "    ") -> str:
+    """HTML `<link rel="prefetch">` tags for the bundle's entry points.
+
+    The index page does not use the runtime itself; prefetching it at low
+    priority means the first notebook opened from the index starts from a
+    warm cache.
+    """
+    return "\n".join(
+        f'{indent}<link rel="prefetch" href="{bundle.url}/{path}" crossorigin="anonymous">'
+        for path in bundle.entry_points
+    )
@@ -0,0 +1,195 @@
+"""Per-notebook time, memory and output size budgets for exports.
+
+A budget caps how long a notebook's export may run, how much memory its
+processes may hold and how large the exported page may get, so a single
+runaway notebook fails quickly with a clear reason instead of stalling the
+whole export. Budgets are declared per notebook in export.NOTEBOOK_BUDGETS.
+
+Memory is the combined resident set size of the export's processes (the
+`marimo export` subprocess and its children, or the kernels an in-process
+export forks), sampled from /proc while the export runs. It is therefore
+only enforced on Linux; time and output size are enforced everywhere.
+"""
+
+import contextlib
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+# Seconds between checks of a running export
+POLL_INTERVAL = 0.05
+
+_UNITS = {"time": "s", "memory": " MB", "output": " MB"}
+
+
+@dataclass(frozen=True)
+class ExportBudget:
+    """Limits for exporting one notebook."""
+
+    seconds: float = 180.0
+    memory_mb: float | None = 4096.0  # Combined RSS of the export's processes
+    output_mb: float | None = None  # Size of the exported page
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when an export goes over its budget.
+
+    Args:
+        resource: "time", "memory" or "output"
+        limit: The budget for that resource
+        used: How much was used when the export was stopped
+    """
+
+    def __init__(self, resource: str, limit: float, used: float):
+        self.resource = resource
+        self.limit = limit
+        self.used = used
+        unit = _UNITS[resource]
+        super().__init__(f"over {resource} budget ({used:.3g}{unit} > {limit:g}{unit})")
+
+
+def _children(pid: int) -> list[int]:
+    """Return the direct children of a process, or [] without /proc."""
+    children = []
+    try:
+        threads = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return []
+    for tid in threads:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children") as fp:
+                children.extend(int(child) for child in fp.read().split())
+        except OSError:
+            continue
+    return children
+
+
+def process_tree(pid: int) -> list[int]:
+    """Return a process and all its descendants."""
+    tree = [pid]
+    for parent in tree:
+        tree.extend(_children(parent))
+    return tree
+
+
+def forked_children() -> list[int]:
+    """Return the children of this process that were forked, not exec'd.
+
+    A forked child keeps its parent's command line; helpers that
+    multiprocessing spawns (such as its resource tracker) do not.
+    """
+    try:
+        with open(f"/proc/{os.getpid()}/cmdline", "rb") as fp:
+            cmdline = fp.read()
+    except OSError:
+        return []
+    forked = []
+    for child in _children(os.getpid()):
+        try:
+            with open(f"/proc/{child}/cmdline", "rb") as fp:
+                if fp.read() == cmdline:
+                    forked.append(child)
+        except OSError:
+            continue
+    return forked
+
+
+def rss_mb(pids: list[int]) -> float | None:
+    """Combined resident set size of processes in MB, or None without /proc."""
+    page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    total = 0
+    measured = False
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm") as fp:
+                total += int(fp.read().split()[1]) * page_size
+            measured = True
+        except (OSError, IndexError, ValueError):
+            # Exited since it was listed, or no /proc
+            continue
+    return total / 1e6 if measured else None
+
+
+def over_budget(
+    budget: ExportBudget, elapsed: float, pids: list[int]
+) -> BudgetExceededError | None:
+    """Check a running export against its time and memory budget.
+
+    Args:
+        budget: Budget of the notebook being exported
+        elapsed: Seconds since the export started
+        pids: Processes whose memory counts towards the budget
+
+    Returns:
+        The error to raise, or None while the export is within budget
+    """
+    if elapsed > budget.seconds:
+        return BudgetExceededError("time", budget.seconds, elapsed)
+    if budget.memory_mb is not None:
+        used = rss_mb(pids)
+        if used is not None and used > budget.memory_mb:
+            return BudgetExceededError("memory", budget.memory_mb, used)
+    return None
+
+
+def check_output_size(output_path: Path, budget: ExportBudget) -> None:
+    """Raise BudgetExceededError if an exported page is over its size budget."""
+    if budget.output_mb is None:
+        return
+    size_mb = output_path.stat().st_size / 1e6
+    if size_mb > budget.output_mb:
+        raise BudgetExceededError("output", budget.output_mb, size_mb)
+
+
+class KernelWatchdog:
+    """Enforce a budget on the kernels forked by an in-process export.
+
+    A background thread samples the forked kernels while the export runs.
+    Over budget, it kills them and sends SIGINT to this process: marimo
+    waits for a dead kernel indefinitely, so the resulting KeyboardInterrupt
+    in the main thread is what ends the export. Callers translate it back
+    with `exceeded`. Signals only reach the main thread, so the watchdog
+    does nothing when entered from any other thread, or where processes
+    cannot be killed by signal (Windows).
+
+    Args:
+        budget: Budget of the notebook being exported
+    """
+
+    def __init__(self, budget: ExportBudget):
+        self.budget = budget
+        self.exceeded: BudgetExceededError | None = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def __enter__(self) -> "KernelWatchdog":
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGKILL"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # Once stopped, the watchdog can no longer interrupt the caller
+        with self._lock:
+            self._stopped.set()
+
+    def _watch(self) -> None:
+        start = time.monotonic()
+        while not self._stopped.wait(POLL_INTERVAL):
+            kernels = forked_children()
+            pids = [pid for kernel in kernels for pid in process_tree(kernel)]
+            error = over_budget(self.budget, time.monotonic() - start, pids)
+            if error is None:
+                continue
+            with self._lock:
+                if self._stopped.is_set():
+                    return
+                self.exceeded = error
+                for pid in kernels:
+                    with contextlib.suppress(ProcessLookupError):
+                        os.kill(pid, signal.SIGKILL)
+                os.kill(os.getpid(), signal.SIGINT)
+            return
@@ -0,0 +1,238 @@
+"""Content-hash cache for notebook exports.
+
+An export only needs to be redone when something that feeds it changed:
+the notebook source, the library modules it imports (transitively), the
+marimo/plotly versions that render it, the export code that writes and
+post-processes the page, or the export options. This module
+hashes those inputs into a cache key and keeps the keys of the last
+successful exports in a manifest next to the generated HTML.
+"""
+
+import ast
+import hashlib
+import json
+from importlib import metadata
+from pathlib import Path
+
+# Project paths
+SRC_DIR = Path(__file__).parent.parent
+MANIFEST_NAME = ".export-manifest.json"
+MANIFEST_VERSION = 1
+
+# Top-level packages that live in this repository
+LIBRARY_PACKAGES = ("physics", "physics_explorations")
+
+# Packages whose versions change the exported output
+RENDERING_PACKAGES = ("marimo", "plotly")
+
+# Export modules whose code shapes every page (rendering, asset rewriting,
+# id normalization, minification)
+PIPELINE_MODULES = (
+    "export.py",
+    "export_assets.py",
+    "export_deterministic.py",
+    "export_inprocess.py",
+    "export_minify.py",
+)
+
+
+def _module_files(module: str) -> list[Path]:
+    """Resolve a dotted module name to the source files executed on import.
+
+    Importing `a.b.c` runs `a/__init__.py`, `a/b/__init__.py` and then
+    `a/b/c.py` (or `a/b/c/__init__.py`).
+    """
+    parts = module.split(".")
+    files = []
+    for depth in range(1, len(parts) + 1):
+        base = SRC_DIR.joinpath(*parts[:depth])
+        for candidate in (base / "__init__.py", base.with_suffix(".py")):
+            if candidate.is_file():
+                files.append(candidate)
+                break
+    return files
+
+
+def _is_type_checking(node: ast.AST) -> bool:
+    """Whether a node is an `if TYPE_CHECKING:` (or `typing.TYPE_CHECKING`) block."""
+    if not isinstance(node, ast.If):
+        return False
+    test = node.test
+    return (isinstance(test, ast.Name) and test.id == "TYPE_CHECKING") or (
+        isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING"
+    )
+
+
+def _import_targets(node: ast.AST, package: str) -> list[tuple[str, str | None]]:
+    """Return (module, name looked up in it or None) for an import statement."""
+    if isinstance(node, ast.Import):
+        return [(alias.name, None) for alias in node.names]
+    if not isinstance(node, ast.ImportFrom):
+        return []
+    if node.level:
+        # Relative import inside one of our packages
+        anchor = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+        base = f"{anchor}.{node.module}" if node.module else anchor
+    else:
+        base = node.module or ""
+    return [(base, alias.name) for alias in node.names]
+
+
+def _imports(source: str, package: str = "") -> tuple[set[tuple[str, str | None]], dict[str, str]]:
+    """Return the imports of a piece of Python source, and its lazy names.
+
+    Imports inside `if TYPE_CHECKING:` blocks are never executed. In a
+    package `__init__` they name the module a PEP 562 `__getattr__` loads
+    each name from, so they are returned as the lazy names mapping instead.
+
+    Returns:
+        (module, name) pairs imported from the repository's packages, where
+        name is None for `import module`, and a name -> module mapping
+    """
+    imports: set[tuple[str, str | None]] = set()
+    lazy: dict[str, str] = {}
+    pending = list(ast.iter_child_nodes(ast.parse(source)))
+    while pending:
+        node = pending.pop()
+        if _is_type_checking(node):
+            for child in node.body:
+                for module, name in _import_targets(child, package):
+                    if name is not None:
+                        lazy[name] = module
+            pending.extend(node.orelse)
+            continue
+        imports.update(
+            target for target in _import_targets(node, package)
+            if target[0].split(".")[0] in LIBRARY_PACKAGES
+        )
+        pending.extend(ast.iter_child_nodes(node))
+    return imports, lazy
+
+
+def _module_name(path: Path) -> str:
+    """Return the dotted module name of a file under SRC_DIR."""
+    parts = list(path.relative_to(SRC_DIR).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def notebook_dependencies(notebook_path: Path) -> list[Path]:
+    """Return the library source files a notebook imports, transitively.
+
+    A package that imports its submodules lazily (PEP 562) only adds the
+    submodules of the names that are actually imported from it.
+
+    Args:
+        notebook_path: Path to the notebook file
+
+    Returns:
+        Sorted list of source files under src/
+
+    Raises:
+        SyntaxError: If the notebook or a module it imports does not parse
+        OSError: If one of them cannot be read
+    """
+    seen: set[Path] = set()
+    lazy_names: dict[str, dict[str, str]] = {}  # By package
+    pending, _ = _imports(notebook_path.read_text())
+    pending = list(pending)
+    while pending:
+        module, name = pending.pop()
+        for path in _module_files(module):
+            if path in seen:
+                continue
+            seen.add(path)
+            module_name = _module_name(path)
+            package = module_name if path.name == "__init__.py" else module_name.rpartition(".")[0]
+            imports, lazy_names[module_name] = _imports(path.read_text(), package)
+            pending.extend(imports)
+        lazy = lazy_names.get(module, {})
+        if name is None:
+            # Any of its names may be looked up later
+            pending.extend((submodule, None) for submodule in set(lazy.values()))
+        elif name in lazy:
+            pending.append((lazy[name], None))
+        else:
+            # `from package import name` may import the submodule package.name
+            pending.append((f"{module}.{name}", None))
+    return sorted(seen)
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def export_cache_key(
+    notebook_path: Path,
+    include_code: bool = False,
+    shared_assets: bool = False,
+    minify: bool = False,
+    precompress: bool = False,
+    deterministic: bool = False,
+    slider_bundles: bool = False,
+) -> str | None:
+    """Hash everything that determines a notebook's exported HTML.
+
+    A notebook whose imports cannot be worked out (it does not parse, or a
+    module it imports does not) has no key: it is never served from the
+    cache, and its export reports the actual error.
+
+    Args:
+        notebook_path: Path to the notebook file
+        include_code: Export option that changes the output
+        shared_assets: Export option that changes the output
+        minify: Export option that changes the output
+        precompress: Export option that adds .gz/.br files to the output
+        deterministic: Export option that changes the output
+        slider_bundles: Export option that changes the output
+
+    Returns:
+        Hex digest identifying this export, or None if there is none
+    """
+    try:
+        sources = [notebook_path, *notebook_dependencies(notebook_path)]
+    except (SyntaxError, OSError, ValueError):
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(f"include_code={include_code}\n".encode())
+    digest.update(f"shared_assets={shared_assets}\n".encode())
+    digest.update(f"minify={minify}\n".encode())
+    digest.update(f"precompress={precompress}\n".encode())
+    digest.update(f"deterministic={deterministic}\n".encode())
+    digest.update(f"slider_bundles={slider_bundles}\n".encode())
+    for package in RENDERING_PACKAGES:
+        digest.update(f"{package}=={_package_version(package)}\n".encode())
+    pipeline = [SRC_DIR / "physics_explorations" / name for name in PIPELINE_MODULES]
+    for path in [*pipeline, *sources]:
+        digest.update(path.name.encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> dict[str, str]:
+    """Load the stem -> cache key mapping of the last successful exports."""
+    manifest_path = output_dir / MANIFEST_NAME
+    try:
+        data = json.loads(manifest_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return dict(data.get("notebooks", {}))
+
+
+def save_manifest(output_dir: Path, keys: dict[str, str]) -> Path:
+    """Write the export manifest atomically."""
+    manifest_path = output_dir / MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(
+        {"version": MANIFEST_VERSION, "notebooks": dict(sorted(keys.items()))},
+        indent=2,
+    ))
+    tmp_path.replace(manifest_path)
+    return manifest_path
@@ -0,0 +1,93 @@
+"""Byte-for-byte reproducible export output.
+
+Exporting an unchanged notebook twice should produce identical pages, so
+their ETags stay the same and CDN caches survive a redeploy. Two things
+get in the way:
+
+- marimo tags every UI element with a `random-id` drawn from an unseeded
+  random generator, which differs between processes (and so between runs
+  and export workers). `normalize_random_ids` replaces each one with an id
+  derived from the element's stable `object-id`.
+- Notebooks that draw random numbers without seeding them. The notebooks
+  here all seed explicitly; for the in-process engine `seed_random_state`
+  additionally seeds the global generators before each export, so kernels
+  forked afterwards start from a fixed state.
+
+Everything else in a page (cell ids, JSON key order, Plotly output) is
+already deterministic.
+"""
+
+import hashlib
+import random
+import re
+import sys
+import uuid
+from pathlib import Path
+
+# Seed for the global random generators in deterministic exports
+DETERMINISTIC_SEED = 0
+
+_UI_ELEMENT_IDS = re.compile(
+    r"object-id=(['\"])(?P<object_id>[^'\"]*)\1\s+random-id=(['\"])"
+    r"(?P<random_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})\3"
+)
+
+
+def _stable_id(object_id: str, occurrence: int) -> str:
+    digest = hashlib.sha256(f"{object_id}#{occurrence}".encode()).digest()
+    return str(uuid.UUID(bytes=digest[:16]))
+
+
+def normalize_random_ids(html: str) -> str:
+    """Replace marimo's per-run UI element ids with reproducible ones.
+
+    An element rendered several times keeps one id everywhere it appears;
+    elements sharing an object-id are told apart by their order.
+
+    Args:
+        html: Exported page
+
+    Returns:
+        The page with stable `random-id` attributes
+    """
+    replacements: dict[str, str] = {}
+    occurrences: dict[str, int] = {}
+    for match in _UI_ELEMENT_IDS.finditer(html):
+        random_id = match["random_id"]
+        if random_id in replacements:
+            continue
+        object_id = match["object_id"]
+        occurrences[object_id] = occurrences.get(object_id, 0) + 1
+        replacements[random_id] = _stable_id(object_id, occurrences[object_id])
+    if not replacements:
+        return html
+    pattern = re.compile("|".join(map(re.escape, replacements)))
+    return pattern.sub(lambda m: replacements[m[0]], html)
+
+
+def normalize_page(page_path: Path) -> None:
+    """Rewrite an exported HTML file in place with normalize_random_ids."""
+    html = page_path.read_text(encoding="utf-8")
+    normalized = normalize_random_ids(html)
+    if normalized != html:
+        page_path.write_text(normalized, encoding="utf-8")
+
+
+def seed_random_state(seed: int = DETERMINISTIC_SEED) -> None:
+    """Seed the global random generators of this process.
+
+    Seeds `random`, numpy's legacy global generator (if numpy is imported)
+    and the generator marimo draws UI element ids from. Generators created
+    with `numpy.random.default_rng()` and no seed are not affected.
+    """
+    random.seed(seed)
+    numpy = sys.modules.get("numpy")
+    if numpy is not None:
+        numpy.random.seed(seed)
+    try:
+        from marimo._plugins.ui._core.ui_element import UIElement
+    except ImportError:
+        return
+    generator = getattr(UIElement, "_random_seed", None)
+    if isinstance(generator, random.Random):
+        generator.seed(seed)
@@ -0,0 +1,317 @@
+"""In-process notebook export through marimo's Python API.
+
+`export_notebook` starts `uv run marimo export html` once per notebook, so
+every export pays for uv's environment resolution, a fresh interpreter and
+re-importing numpy, plotly and marimo. The engine here runs the same export
+inside a long-lived interpreter instead. marimo releases that fork a kernel
+process per notebook (such as the locked 0.19) pass on the modules imported
+before the fork (see `preload`), so the notebooks' own imports become
+dictionary lookups. Later releases start kernels with the "spawn" method,
+which inherits nothing: `kernel_start_method` tells them apart,
+`kernel_hooks_run` checks that the hooks below actually reach the kernel,
+and export_all refuses to use this engine unless both agree rather than
+silently losing preloading, cell timings, budgets, seeding and profiles.
+
+`export_all(engine="inprocess")` runs these exports on a pool of warm worker
+processes, one notebook at a time per worker.
+
+Because the kernel is forked from the worker, hooks added to marimo's cell
+runner before an export run in the kernel too. `install_cell_timer` uses
+this to time every cell and track the kernel's peak RSS; the kernel appends
+them to a file named by an environment variable, which the worker reads
+once the export is done. With profiling enabled (see export_profile) the
+same hooks also measure CPU time, allocations and figure sizes per cell.
+Cells that only contain markdown are rendered without going through the
+runner, so they have no timings.
+"""
+
+import contextlib
+import functools
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from physics_explorations.export_budget import (
+    ExportBudget,
+    KernelWatchdog,
+    check_output_size,
+)
+from physics_explorations.export_deterministic import seed_random_state
+from physics_explorations.export_minify import parse_mount_config
+from physics_explorations.export_profile import (
+    build_profile,
+    finish_cell,
+    profiling_enabled,
+    start_cell,
+    write_profile,
+)
+from physics_explorations.export_report import pop_usage, record_usage
+
+# Heavy modules imported by the notebooks, loaded once per worker
+PRELOAD_MODULES = (
+    "numpy",
+    "plotly.graph_objects",
+    "plotly.subplots",
+    "marimo",
+    # The package imports its submodules lazily; load the ones notebooks use
+    "physics_explorations.visualization.animations",
+    "physics_explorations.visualization.compression",
+    "physics_explorations.visualization.geometry",
+    "physics_explorations.visualization.parametric",
+    "physics_explorations.visualization.slider_bundle",
+)
+
+
+# File the kernel appends cell timings to, set per export
+CELL_TIMES_ENV = "PHYSICS_EXPORT_CELL_TIMES"
+
+
+class NotebookExecutionError(RuntimeError):
+    """Raised when cells fail while a notebook is exported in-process."""
+
+
+def kernel_start_method() -> str:
+    """Return how this marimo starts notebook kernels, such as "fork" or "spawn".
+
+    marimo has no API for this: recent releases ask multiprocessing for a
+    "spawn" context explicitly, older ones use the default start method.
+    The answer comes from reading marimo's private session module, so it
+    is "unknown" when that module has moved or its source is unavailable.
+    """
+    try:
+        try:
+            from marimo._session.managers import kernel
+        except ImportError:
+            # Older marimo releases
+            from marimo._server import sessions as kernel
+        source = inspect.getsource(kernel)
+    except (ImportError, OSError, TypeError):
+        return "unknown"
+    match = re.search(r"get_context\(\s*[\"'](\w+)[\"']\s*\)", source)
+    return match.group(1) if match else multiprocessing.get_start_method()
+
+
+# Smallest notebook with a cell that goes through the runner
+_PROBE_NOTEBOOK = """import marimo
+
+app = marimo.App()
+
+
+@app.cell
+def _():
+    probe = 1
+    return (probe,)
+
+
+if __name__ == "__main__":
+    app.run()
+"""
+
+
+@functools.cache
+def kernel_hooks_run() -> bool:
+    """Check that hooks installed here run in marimo's notebook kernels.
+
+    Exports a one-cell notebook in this process and looks for its cell
+    timing, which only the kernel can have written. The answer is cached,
+    since it depends only on the installed marimo. Must be called from the
+    main thread, like export_notebook_in_process.
+    """
+    if not install_cell_timer():
+        return False
+    with tempfile.TemporaryDirectory() as tmp:
+        notebook = Path(tmp) / "probe.py"
+        notebook.write_text(_PROBE_NOTEBOOK, encoding="utf-8")
+        try:
+            export_notebook_in_process(notebook, Path(tmp))
+        except Exception:
+            return False
+        finally:
+            timings = pop_usage().get("cell_times")
+    return bool(timings)
+
+
+def preload(modules: tuple[str, ...] = PRELOAD_MODULES) -> None:
+    """Import the modules notebooks need so forked kernels inherit them.
+
+    Modules that are not installed are skipped; the notebook importing them
+    reports the failure when it runs. Also installs the cell timer.
+    """
+    for module in modules:
+        with contextlib.suppress(ImportError):
+            importlib.import_module(module)
+    install_cell_timer()
+
+
+# Start times of the cells running in this (kernel) process
+_cell_starts: dict[str, float] = {}
+
+
+def _cell_started(cell: Any, *args: Any) -> None:
+    _cell_starts[cell.cell_id] = time.perf_counter()
+    if profiling_enabled():
+        start_cell(cell.cell_id)
+
+
+def _cell_finished(cell: Any, runner: Any = None, run_result: Any = None) -> None:
+    start = _cell_starts.pop(cell.cell_id, None)
+    path = os.environ.get(CELL_TIMES_ENV)
+    if start is None or not path:
+        return
+    seconds = time.perf_counter() - start
+    line = {"cell": cell.cell_id, "seconds": seconds, "rss_mb": _peak_rss_mb()}
+    if profiling_enabled():
+        # The runner (a hook context in newer marimo) holds the globals
+        glbls = getattr(runner, "glbls", {})
+        defs = {name: glbls[name] for name in cell.defs if name in glbls}
+        line["profile"] = finish_cell(cell.cell_id, getattr(run_result, "output", None), defs)
+    with open(path, "a", encoding="utf-8") as fp:
+        fp.write(json.dumps(line))
+        fp.write("\n")
+
+
+def install_cell_timer() -> bool:
+    """Add cell timing hooks to marimo's runner in this process.
+
+    Kernels started (forked) afterwards record the time of every cell they
+    run and their peak RSS. Does nothing when the hooks are unavailable in
+    this marimo version.
+
+    Returns:
+        Whether the hooks are installed
+    """
+    try:
+        from marimo._runtime.runner.hooks_post_execution import POST_EXECUTION_HOOKS
+        from marimo._runtime.runner.hooks_pre_execution import PRE_EXECUTION_HOOKS
+    except ImportError:
+        return False
+    if _cell_started not in PRE_EXECUTION_HOOKS:
+        PRE_EXECUTION_HOOKS.append(_cell_started)
+        POST_EXECUTION_HOOKS.append(_cell_finished)
+    return True
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _run_and_export(notebook_path: Path, include_code: bool) -> Any:
+    """Run a notebook to completion and render it, as `marimo export html` does.
+
+    marimo has no public export API, so this calls the functions behind its
+    CLI. Their location changed across marimo releases; both layouts are
+    supported.
+    """
+    from marimo._server.utils import asyncio_run
+    from marimo._utils.marimo_path import MarimoPath
+
+    path = MarimoPath(str(notebook_path))
+    try:
+        from marimo._export.file import export_html
+        from marimo._export.requests import HTMLFileExportRequest, NotebookExecutionOptions
+        from marimo._schemas.export_options import HTMLExportOptions
+    except ImportError:
+        # Older marimo releases
+        from marimo._server.export import run_app_then_export_as_html
+
+        return asyncio_run(run_app_then_export_as_html(
+            path, include_code=include_code, cli_args={}, argv=[]
+        ))
+
+    return asyncio_run(export_html(HTMLFileExportRequest(
+        path=path,
+        options=HTMLExportOptions(files=(), include_code=include_code),
+        execution=NotebookExecutionOptions(cli_args={}, argv=[]),
+    )))
+
+
+def export_notebook_in_process(
+    notebook_path: Path,
+    output_dir: Path,
+    include_code: bool = False,
+    budget: ExportBudget | None = None,
+    deterministic: bool = False,
+) -> Path:
+    """Export a single notebook to HTML without starting a new interpreter.
+
+    Equivalent to `marimo export html`: the HTML is written even when some
+    cells fail, and the failure is raised afterwards. With install_cell_timer,
+    per-cell times and the kernel's peak RSS are recorded with
+    export_report.record_usage, and with profiling enabled (see
+    export_profile) a cell profile is written to `output_dir/.profiles/`.
+
+    The budget's time and memory limits are enforced by a KernelWatchdog,
+    which only works when called from the main thread (as export_all's
+    worker processes do).
+
+    Args:
+        notebook_path: Path to the notebook file
+        output_dir: Directory to write the HTML file
+        include_code: Whether to include source code in output
+        budget: Limits for this export (defaults to ExportBudget())
+        deterministic: Whether to seed the global random generators first,
+            so the kernel starts from the same state on every run
+
+    Returns:
+        Path to the generated HTML file
+
+    Raises:
+        NotebookExecutionError: If any cell failed to execute
+        BudgetExceededError: If the export went over its budget
+    """
+    budget = budget or ExportBudget()
+    if deterministic:
+        seed_random_state()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / f"{notebook_path.stem}.html"
+
+    fd, times_path = tempfile.mkstemp(prefix="cell-times-", suffix=".jsonl")
+    os.close(fd)
+    os.environ[CELL_TIMES_ENV] = times_path
+    watchdog = KernelWatchdog(budget)
+    try:
+        with watchdog:
+            # marimo prints cell errors to stderr as they happen
+            result = _run_and_export(notebook_path, include_code)
+    except KeyboardInterrupt:
+        if watchdog.exceeded is None:
+            raise
+        raise watchdog.exceeded from None
+    finally:
+        del os.environ[CELL_TIMES_ENV]
+        with open(times_path, encoding="utf-8") as fp:
+            lines = [json.loads(line) for line in fp]
+        os.unlink(times_path)
+
+    # The kernel reports its own peak RSS after every cell
+    record_usage(
+        peak_rss_mb=max((line["rss_mb"] for line in lines), default=None),
+        cell_times={line["cell"]: line["seconds"] for line in lines} or None,
+    )
+    contents = result.contents
+    if isinstance(contents, bytes):
+        contents = contents.decode("utf-8")
+    output_path.write_text(contents, encoding="utf-8")
+
+    measurements = {line["cell"]: line["profile"] for line in lines if line.get("profile")}
+    if measurements:
+        cells = (parse_mount_config(contents) or {}).get("session", {}).get("cells", [])
+        positions = {cell.get("id"): i for i, cell in enumerate(cells, start=1)}
+        write_profile(notebook_path.stem, build_profile(measurements, positions), output_dir)
+
+    if result.did_error:
+        raise NotebookExecutionError("some cells failed to execute")
+    check_output_size(output_path, budget)
+    return output_path
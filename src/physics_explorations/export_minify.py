@@ -0,0 +1,198 @@
+"""Post-export minification and precompression of notebook pages.
+
+Almost all of an exported page is the `__MARIMO_MOUNT_CONFIG__` object that
+holds every cell's output. marimo writes it with spaces after separators,
+escapes every `<` and `&` as `\\u003C`/`\\u0026`, and HTML-escapes the quotes
+of each Plotly figure's JSON in its `data-figure='...'` attribute, so one
+`"` in a figure costs 11 bytes (`\\u0026quot;`). Minification rewrites the
+object compactly: quotes inside single-quoted attributes are left bare
+(only `'` and `&` need escaping there), and `<` is only escaped where it
+could end the script (`</`, `<!`).
+
+Precompression writes `.gz` and `.br` siblings next to each page for hosts
+that serve precompressed files. Brotli needs the optional `brotli` package
+(`uv sync --extra export`); without it only `.gz` files are written.
+"""
+
+import gzip
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+
+_MOUNT_CONFIG = re.compile(
+    r"(window\.__MARIMO_MOUNT_CONFIG__ = )(\{.*?\})(;\s*)(?=</script>)", re.S
+)
+_TRAILING_COMMA = re.compile(r",(\s*\})\s*$")
+
+# Elements whose content must be kept byte for byte
+_RAW_TEXT = re.compile(r"(<(script|style|pre|textarea)\b.*?</\2>)", re.S | re.I)
+_BETWEEN_TAGS = re.compile(r">\s+<")
+
+# Single-quoted attribute values inside a start tag
+_START_TAG = re.compile(r"<[a-zA-Z][\w-]*\s[^<>]*>")
+_SINGLE_QUOTED = re.compile(r"(=')([^']*)(')")
+
+# `<` sequences that could close or comment out the enclosing script
+_UNSAFE_LT = re.compile(r"<(?=[/!])")
+
+
+@dataclass
+class PageSizes:
+    """Sizes in bytes of one page before and after post-processing."""
+
+    stem: str
+    original: int
+    minified: int
+    gzip: int | None = None
+    brotli: int | None = None
+
+
+def _unquote_attributes(fragment: str) -> str:
+    """Replace `&quot;` with `"` inside single-quoted attribute values."""
+    def attribute(match: re.Match) -> str:
+        return match[1] + match[2].replace("&quot;", '"') + match[3]
+
+    def start_tag(match: re.Match) -> str:
+        return _SINGLE_QUOTED.sub(attribute, match[0])
+
+    return _START_TAG.sub(start_tag, fragment)
+
+
+def _minify_value(value, mimetype: str | None = None):
+    """Recursively minify the HTML outputs held in a JSON value."""
+    if isinstance(value, str):
+        if mimetype == "text/html" and "&quot;" in value:
+            return _unquote_attributes(value)
+        return value
+    if isinstance(value, list):
+        return [_minify_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _minify_value(item, key) for key, item in value.items()}
+    return value
+
+
+def _dump_script_json(value) -> str:
+    """Serialize JSON compactly and safely for inclusion in a <script>."""
+    text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    text = text.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+    return _UNSAFE_LT.sub(r"\\u003C", text)
+
+
+def _load_mount_config(source: str) -> dict | None:
+    """Parse the object literal marimo assigns to the mount config."""
+    try:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", source))
+    except json.JSONDecodeError:
+        return None
+
+
+def parse_mount_config(html: str) -> dict | None:
+    """Return the `__MARIMO_MOUNT_CONFIG__` object of an exported page.
+
+    Args:
+        html: Exported page (minified or not)
+
+    Returns:
+        The mount config, or None if the page has none we can parse
+    """
+    match = _MOUNT_CONFIG.search(html)
+    return _load_mount_config(match[2]) if match else None
+
+
+def _minify_mount_config(match: re.Match) -> str:
+    config = _load_mount_config(match[2])
+    if config is None:
+        # Not the layout we know how to rewrite; keep it untouched
+        return match[0]
+    return match[1] + _dump_script_json(_minify_value(config)) + ";"
+
+
+def minify_html(html: str) -> str:
+    """Minify an exported marimo page.
+
+    The mount config is re-serialized compactly and whitespace between tags
+    is collapsed. Scripts, styles and preformatted text are otherwise kept
+    as they are.
+
+    Args:
+        html: Exported page
+
+    Returns:
+        Equivalent, smaller page
+    """
+    html = _MOUNT_CONFIG.sub(_minify_mount_config, html)
+    parts = _RAW_TEXT.split(html)
+    # split() yields text, raw element, tag name, text, ...
+    for i in range(0, len(parts), 3):
+        parts[i] = _BETWEEN_TAGS.sub("> <", parts[i])
+    return "".join(part for i, part in enumerate(parts) if i % 3 != 2)
+
+
+def write_precompressed(page_path: Path) -> dict[str, int]:
+    """Write `.gz` (and, with brotli installed, `.br`) siblings of a file.
+
+    Args:
+        page_path: File to compress
+
+    Returns:
+        Mapping of suffix to compressed size in bytes
+    """
+    data = page_path.read_bytes()
+    compressed = {".gz": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        compressed[".br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+
+    sizes = {}
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        sibling = page_path.with_name(page_path.name + suffix)
+        if suffix in compressed:
+            sibling.write_bytes(compressed[suffix])
+            sizes[suffix] = len(compressed[suffix])
+        else:
+            # Never leave a sibling from an older export behind
+            sibling.unlink(missing_ok=True)
+    return sizes
+
+
+def remove_precompressed(page_path: Path) -> None:
+    """Delete the precompressed siblings of a file, if any."""
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        page_path.with_name(page_path.name + suffix).unlink(missing_ok=True)
+
+
+def postprocess_page(page_path: Path, minify: bool = True, precompress: bool = True) -> PageSizes:
+    """Minify and/or precompress an exported page in place.
+
+    Args:
+        page_path: Exported HTML file
+        minify: Whether to rewrite the page with minify_html
+        precompress: Whether to write `.gz`/`.br` siblings (stale ones are
+            removed otherwise)
+
+    Returns:
+        Sizes of the page before and after
+    """
+    html = page_path.read_text(encoding="utf-8")
+    original = len(html.encode("utf-8"))
+    if minify:
+        html = minify_html(html)
+        page_path.write_text(html, encoding="utf-8")
+    sizes = PageSizes(page_path.stem, original, len(html.encode("utf-8")))
+
+    if precompress:
+        compressed = write_precompressed(page_path)
+        sizes.gzip = compressed.get(".gz")
+        sizes.brotli = compressed.get(".br")
+    else:
+        remove_precompressed(page_path)
+    return sizes
@@ -0,0 +1,183 @@
+"""Cell-level profiling of notebook exports.
+
+With profiling enabled (the PHYSICS_EXPORT_PROFILE environment variable,
+or `--profile` on the export command), the in-process engine measures
+every cell of every notebook it exports:
+
+- wall time and CPU time of the cell
+- bytes allocated by the cell at its peak, traced with tracemalloc
+- the Plotly figures the cell outputs or defines, and their serialized size
+
+Each notebook's profile is written to `.profiles/` in the output directory
+as JSON and as folded stacks (`<notebook>;<cell> <microseconds>`), which
+flamegraph.pl, speedscope and inferno read directly.
+
+Tracing every allocation slows the notebooks down severalfold, so export
+times measured while profiling are not representative (and the export
+budgets are relaxed by PROFILE_BUDGET_FACTOR); compare cells against each
+other rather than against normal exports.
+"""
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+PROFILE_ENV = "PHYSICS_EXPORT_PROFILE"
+PROFILE_DIR_NAME = ".profiles"
+
+# Export time and memory budgets are multiplied by this while profiling
+PROFILE_BUDGET_FACTOR = 5
+
+# Names a cell defines that are shown in its label
+_LABEL_NAMES = 3
+
+
+def profiling_enabled() -> bool:
+    """Whether PHYSICS_EXPORT_PROFILE asks for cell profiles."""
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+@contextlib.contextmanager
+def profiling():
+    """Enable profiling for exports (and the kernels they fork) in this block."""
+    previous = os.environ.get(PROFILE_ENV)
+    os.environ[PROFILE_ENV] = "1"
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ[PROFILE_ENV]
+        else:
+            os.environ[PROFILE_ENV] = previous
+
+
+@dataclass
+class CellProfile:
+    """Cost of running one cell during an export."""
+
+    cell: int  # 1-based position of the cell in the notebook
+    label: str  # Position and the names the cell defines
+    wall_seconds: float
+    cpu_seconds: float
+    allocated_bytes: int  # Peak of the memory allocated while the cell ran
+    n_figures: int
+    figure_bytes: int  # Serialized size of those figures
+
+
+# Counters at the start of the cells running in this (kernel) process
+_starts: dict[str, tuple[float, float, int]] = {}
+
+
+def start_cell(cell_id: str) -> None:
+    """Start measuring a cell. Called in the kernel before the cell runs."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    _starts[cell_id] = (
+        time.perf_counter(), time.process_time(), tracemalloc.get_traced_memory()[0]
+    )
+
+
+def _figures(values: list[Any]) -> list[Any]:
+    try:
+        from plotly.basedatatypes import BaseFigure
+    except ImportError:
+        return []
+    figures = {id(v): v for v in values if isinstance(v, BaseFigure)}
+    return list(figures.values())
+
+
+def finish_cell(cell_id: str, output: Any, defs: dict[str, Any]) -> dict | None:
+    """Stop measuring a cell. Called in the kernel after the cell ran.
+
+    Args:
+        cell_id: marimo's id of the cell
+        output: Value the cell displays
+        defs: Names the cell defines and their values
+
+    Returns:
+        Measurements to hand to the exporting process, or None if the
+        cell was not started with start_cell
+    """
+    start = _starts.pop(cell_id, None)
+    if start is None:
+        return None
+    wall = time.perf_counter() - start[0]
+    cpu = time.process_time() - start[1]
+    allocated = max(0, tracemalloc.get_traced_memory()[1] - start[2])
+    figures = _figures([output, *defs.values()])
+    names = sorted(name for name in defs if not name.startswith("_"))
+    return {
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "allocated_bytes": allocated,
+        "n_figures": len(figures),
+        "figure_bytes": sum(len(fig.to_json()) for fig in figures),
+        "names": names,
+    }
+
+
+def _label(position: int, names: list[str]) -> str:
+    label = f"cell {position}"
+    if names:
+        shown = ", ".join(names[:_LABEL_NAMES])
+        label += f" ({shown}{', ...' if len(names) > _LABEL_NAMES else ''})"
+    return label
+
+
+def build_profile(measurements: dict[str, dict], positions: dict[str, int]) -> list[CellProfile]:
+    """Combine the kernel's measurements into profiles in notebook order.
+
+    Args:
+        measurements: finish_cell results by cell id
+        positions: 1-based position of each cell id in the notebook
+
+    Returns:
+        One profile per measured cell of the notebook
+    """
+    profiles = []
+    for cell_id, m in measurements.items():
+        if cell_id not in positions:
+            continue
+        position = positions[cell_id]
+        profiles.append(CellProfile(
+            cell=position,
+            label=_label(position, m["names"]),
+            wall_seconds=m["wall_seconds"],
+            cpu_seconds=m["cpu_seconds"],
+            allocated_bytes=m["allocated_bytes"],
+            n_figures=m["n_figures"],
+            figure_bytes=m["figure_bytes"],
+        ))
+    return sorted(profiles, key=lambda p: p.cell)
+
+
+def folded_stacks(stem: str, profiles: list[CellProfile]) -> str:
+    """Format profiles as folded stacks weighted by wall time in microseconds."""
+    lines = []
+    for p in profiles:
+        # Frames are separated by ";" and the weight by the last space
+        label = p.label.replace(";", ",")
+        lines.append(f"{stem};{label} {round(p.wall_seconds * 1e6)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_profile(stem: str, profiles: list[CellProfile], output_dir: Path) -> Path:
+    """Write a notebook's profile as JSON and folded stacks.
+
+    Returns:
+        Path to the folded stacks file
+    """
+    profile_dir = output_dir / PROFILE_DIR_NAME
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    (profile_dir / f"{stem}.json").write_text(
+        json.dumps([asdict(p) for p in profiles], indent=2) + "\n"
+    )
+    folded_path = profile_dir / f"{stem}.folded"
+    folded_path.write_text(folded_stacks(stem, profiles))
+    return folded_path
@@ -0,0 +1,278 @@
+"""Timing and size telemetry for export runs.
+
+Every `export_all` run writes a JSON report next to the exported pages and
+prints it as a table. Per notebook it records:
+
+- wall time of the export and peak RSS of the process that ran it
+- per-cell execution times (in-process engine only, see export_inprocess)
+- output size, number of Plotly figures and animation frames, and the
+  largest figures by serialized size
+
+A report can be compared with an earlier one to flag notebooks that became
+slower, hungrier or bigger.
+"""
+
+import html
+import json
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from physics_explorations.export_minify import parse_mount_config
+
+REPORT_NAME = ".export-report.json"
+REPORT_VERSION = 1
+
+# Plotly figures rendered by marimo, inside text/html cell outputs
+_PLOTLY_FIGURE = re.compile(r"<marimo-plotly\b[^>]*?\bdata-figure='([^']*)'")
+
+# Measurements made while exporting, read back by the thread that exported
+_usage = threading.local()
+
+
+def record_usage(**values) -> None:
+    """Record measurements of the export running in this thread."""
+    vars(_usage).update(values)
+
+
+def pop_usage() -> dict:
+    """Return and clear the measurements recorded in this thread."""
+    values = dict(vars(_usage))
+    vars(_usage).clear()
+    return values
+
+
+@dataclass
+class FigureStats:
+    """Size of one Plotly figure in an exported page."""
+
+    cell: int  # 1-based position of the cell in the notebook
+    n_bytes: int
+    n_frames: int
+
+
+@dataclass
+class CellTiming:
+    """Execution time of one cell during an export."""
+
+    cell: int  # 1-based position of the cell in the notebook
+    seconds: float
+
+
+@dataclass
+class NotebookReport:
+    """Telemetry for one notebook."""
+
+    stem: str
+    duration: float  # Wall time of the export in seconds
+    output_bytes: int = 0
+    n_figures: int = 0
+    n_frames: int = 0
+    largest_figures: list[FigureStats] = field(default_factory=list)
+    cell_times: list[CellTiming] | None = None
+    peak_rss_mb: float | None = None
+    cached: bool = False  # Measurements were carried over from an earlier run
+    error: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NotebookReport":
+        data = dict(data)
+        data["largest_figures"] = [FigureStats(**f) for f in data.get("largest_figures", [])]
+        if data.get("cell_times") is not None:
+            data["cell_times"] = [CellTiming(**t) for t in data["cell_times"]]
+        return cls(**data)
+
+
+@dataclass
+class ExportReport:
+    """Telemetry for one export run."""
+
+    engine: str
+    workers: int
+    elapsed: float  # Wall time of the whole run in seconds
+    notebooks: list[NotebookReport]
+    created: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds")
+    )
+
+    def notebook(self, stem: str) -> NotebookReport | None:
+        return next((nb for nb in self.notebooks if nb.stem == stem), None)
+
+    def save(self, path: Path) -> Path:
+        """Write the report as JSON."""
+        data = {"version": REPORT_VERSION, **asdict(self)}
+        path.write_text(json.dumps(data, indent=2) + "\n")
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "ExportReport | None":
+        """Read a report written by save(), or None if missing or outdated."""
+        try:
+            data = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.pop("version", None) != REPORT_VERSION:
+            return None
+        data["notebooks"] = [NotebookReport.from_dict(nb) for nb in data["notebooks"]]
+        return cls(**data)
+
+
+@dataclass
+class Regression:
+    """A metric that grew past the threshold since the baseline report."""
+
+    stem: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change, e.g. 0.25 for 25% worse."""
+        return self.current / self.baseline - 1
+
+
+def analyze_page(
+    page_path: Path,
+    stem: str,
+    duration: float,
+    cell_times: dict[str, float] | None = None,
+    peak_rss_mb: float | None = None,
+    top_n: int = 3,
+) -> NotebookReport:
+    """Measure an exported page.
+
+    Args:
+        page_path: Exported HTML file
+        stem: Notebook name
+        duration: Wall time of the export in seconds
+        cell_times: Execution time per marimo cell id, if measured
+        peak_rss_mb: Peak RSS of the export process, if measured
+        top_n: Number of largest figures to keep
+
+    Returns:
+        Report for the notebook
+    """
+    page = page_path.read_text(encoding="utf-8")
+    config = parse_mount_config(page) or {}
+    cells = config.get("session", {}).get("cells", [])
+    positions = {cell.get("id"): i for i, cell in enumerate(cells, start=1)}
+
+    figures = []
+    for position, cell in enumerate(cells, start=1):
+        for output in cell.get("outputs", []):
+            fragment = output.get("data", {}).get("text/html", "")
+            for match in _PLOTLY_FIGURE.finditer(fragment):
+                figure_json = html.unescape(match[1])
+                try:
+                    n_frames = len(json.loads(figure_json).get("frames") or [])
+                except json.JSONDecodeError:
+                    n_frames = 0
+                figures.append(FigureStats(position, len(figure_json.encode()), n_frames))
+
+    timings = None
+    if cell_times is not None:
+        timings = sorted(
+            (CellTiming(positions[cell_id], seconds)
+             for cell_id, seconds in cell_times.items() if cell_id in positions),
+            key=lambda t: t.cell,
+        )
+
+    return NotebookReport(
+        stem=stem,
+        duration=duration,
+        output_bytes=len(page.encode("utf-8")),
+        n_figures=len(figures),
+        n_frames=sum(f.n_frames for f in figures),
+        largest_figures=sorted(figures, key=lambda f: f.n_bytes, reverse=True)[:top_n],
+        cell_times=timings,
+        peak_rss_mb=peak_rss_mb,
+    )
+
+
+def compare_reports(
+    current: ExportReport,
+    baseline: ExportReport,
+    threshold: float = 0.2,
+    min_seconds: float = 1.0,
+) -> list[Regression]:
+    """Flag notebooks whose time, memory or size grew past a threshold.
+
+    Args:
+        current: Report of this run
+        baseline: Report to compare against
+        threshold: Relative growth that counts as a regression (0.2 = 20%)
+        min_seconds: Time increases smaller than this are treated as noise
+
+    Returns:
+        Regressions, in notebook order
+    """
+    regressions = []
+    for nb in current.notebooks:
+        base = baseline.notebook(nb.stem)
+        if base is None or nb.error or base.error:
+            continue
+        metrics = [
+            ("duration", base.duration, nb.duration),
+            ("peak_rss_mb", base.peak_rss_mb, nb.peak_rss_mb),
+            ("output_bytes", base.output_bytes, nb.output_bytes),
+        ]
+        for metric, old, new in metrics:
+            if not old or new is None:
+                continue
+            if metric == "duration" and new - old < min_seconds:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append(Regression(nb.stem, metric, old, new))
+    return regressions
+
+
+def _mb(n_bytes: float | None) -> str:
+    return "-" if n_bytes is None else f"{n_bytes / 1e6:.1f}"
+
+
+def print_report(report: ExportReport, regressions: list[Regression] = ()) -> None:
+    """Print a report as a table, followed by the hot spots and regressions."""
+    print("Export report:")
+    print(
+        f"  {'notebook':<20} {'time (s)':>8} {'RSS (MB)':>9} {'size (MB)':>9} "
+        f"{'figures':>7} {'frames':>7}  status"
+    )
+    for nb in sorted(report.notebooks, key=lambda n: n.duration, reverse=True):
+        if nb.error:
+            status = f"FAILED ({nb.error})"
+        else:
+            status = "cached" if nb.cached else "ok"
+        rss = "-" if nb.peak_rss_mb is None else f"{nb.peak_rss_mb:.0f}"
+        print(
+            f"  {nb.stem:<20} {nb.duration:8.1f} {rss:>9} {_mb(nb.output_bytes):>9} "
+            f"{nb.n_figures:>7} {nb.n_frames:>7}  {status}"
+        )
+    total = sum(nb.duration for nb in report.notebooks if not nb.cached)
+    n_cached = sum(nb.cached for nb in report.notebooks)
+    print(
+        f"  {len(report.notebooks)} notebooks ({n_cached} cached), "
+        f"{total:.1f}s of exports in {report.elapsed:.1f}s wall time"
+    )
+
+    figures = [(nb.stem, f) for nb in report.notebooks for f in nb.largest_figures]
+    if figures:
+        print("Largest figures:")
+        for stem, fig in sorted(figures, key=lambda x: x[1].n_bytes, reverse=True)[:5]:
+            print(f"  {stem:<20} cell {fig.cell:<4} {_mb(fig.n_bytes):>6} MB  {fig.n_frames} frames")
+
+    cells = [(nb.stem, t) for nb in report.notebooks for t in nb.cell_times or []]
+    if cells:
+        print("Slowest cells:")
+        for stem, timing in sorted(cells, key=lambda x: x[1].seconds, reverse=True)[:5]:
+            print(f"  {stem:<20} cell {timing.cell:<4} {timing.seconds:6.2f}s")
+
+    if regressions:
+        print("Regressions against the baseline report:")
+        for r in regressions:
+            print(
+                f"  {r.stem:<20} {r.metric:<13} {r.baseline:>12.1f} -> "
+                f"{r.current:<12.1f} (+{r.change:.0%})"
+            )
@@ -0,0 +1,124 @@
+"""Watch mode: re-export notebooks when they or the library change.
+
+The notebooks directory and the library sources are polled for changed
+`.py` files (polling by mtime and size needs no platform-specific file
+system APIs, and a few hundred stat calls per second are cheap). Once a
+burst of saves has settled, the notebooks affected by the change are
+worked out from their imports (see export_cache.notebook_dependencies)
+and the site is rebuilt. The rebuild itself goes through the export cache,
+whose keys hash the same dependencies, so exactly those notebooks are
+re-exported and index.html is regenerated.
+"""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from physics_explorations.export_cache import SRC_DIR, notebook_dependencies
+
+# Seconds between polls, and of quiet after a change before rebuilding
+POLL_INTERVAL = 0.5
+DEBOUNCE = 0.5
+
+
+def _snapshot(directories: list[Path]) -> dict[Path, tuple[int, int]]:
+    """Return the (mtime, size) of every Python file under the directories."""
+    files = {}
+    for directory in directories:
+        for path in directory.rglob("*.py"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Deleted between listing and stat
+                continue
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+class NotebookWatcher:
+    """Detects changed files and the notebooks they affect.
+
+    Args:
+        notebooks_dir: Directory holding the notebooks
+        source_dirs: Library source directories the notebooks import from
+    """
+
+    def __init__(self, notebooks_dir: Path, source_dirs: list[Path] | None = None):
+        self.notebooks_dir = notebooks_dir
+        self.directories = [notebooks_dir, *(source_dirs if source_dirs is not None else [SRC_DIR])]
+        self._files = _snapshot(self.directories)
+
+    def changes(self) -> set[Path]:
+        """Return the files added, modified or deleted since the last call."""
+        files = _snapshot(self.directories)
+        changed = {
+            path for path in files.keys() | self._files.keys()
+            if files.get(path) != self._files.get(path)
+        }
+        self._files = files
+        return changed
+
+    def affected_notebooks(self, changed: set[Path]) -> list[str]:
+        """Return the stems of the notebooks a set of changed files affects.
+
+        A notebook is affected when it was added, modified or deleted, or
+        when it imports (transitively) a changed library module. A notebook
+        whose imports cannot be worked out (say it was saved mid-edit with
+        a syntax error) is always affected; its export reports the error.
+        """
+        notebooks = {path for path in changed if path.parent == self.notebooks_dir}
+        stems = {path.stem for path in notebooks}
+        library_changes = changed - notebooks
+        if library_changes:
+            for notebook in self.notebooks_dir.glob("*.py"):
+                try:
+                    dependencies = notebook_dependencies(notebook)
+                except (SyntaxError, OSError, ValueError):
+                    stems.add(notebook.stem)
+                    continue
+                if library_changes.intersection(dependencies):
+                    stems.add(notebook.stem)
+        return sorted(stems)
+
+
+def watch(
+    rebuild: Callable[[], object],
+    notebooks_dir: Path,
+    source_dirs: list[Path] | None = None,
+    interval: float = POLL_INTERVAL,
+    debounce: float = DEBOUNCE,
+) -> None:
+    """Call rebuild whenever a change affects any notebook, until Ctrl+C.
+
+    Args:
+        rebuild: Re-exports the site (expected to skip unchanged notebooks)
+        notebooks_dir: Directory holding the notebooks
+        source_dirs: Library source directories (defaults to src/)
+        interval: Seconds between polls
+        debounce: Seconds without further changes before rebuilding
+    """
+    watcher = NotebookWatcher(notebooks_dir, source_dirs)
+    print(f"Watching {', '.join(str(d) for d in watcher.directories)} (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = watcher.changes()
+            if not changed:
+                continue
+            # Editors often write several files, or one file several times
+            while True:
+                time.sleep(debounce)
+                more = watcher.changes()
+                if not more:
+                    break
+                changed |= more
+
+            stems = watcher.affected_notebooks(changed)
+            names = ", ".join(sorted(path.name for path in changed))
+            if not stems:
+                print(f"Changed {names}: no notebook depends on it")
+                continue
+            print(f"Changed {names}: re-exporting {', '.join(stems)}")
+            rebuild()
+    except KeyboardInterrupt:
+        print("Stopped watching.")
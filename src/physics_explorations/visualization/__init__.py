@@ -1,31 +1,181 @@
-"""Visualization utilities for physics notebooks."""
+"""Visualization utilities for physics notebooks.
 
+Only the styles and the slider cache are imported with the package. The
+other submodules need plotly or numpy and are imported the first time one
+of their names is looked up (PEP 562), so code that just wants the color
+palette starts quickly.
+"""
+
+from typing import TYPE_CHECKING
+
+from physics_explorations._lazy import lazy_exports
 from physics_explorations.visualization.styles import (
     COLORS,
     DARK_THEME,
     ANIMATION_SETTINGS,
+    RENDER_SETTINGS,
     SLIDER_STYLE,
     apply_dark_theme,
     get_color_palette,
     get_trace_style,
+    set_render_mode,
 )
-from physics_explorations.visualization.animations import (
-    create_animation_figure,
-    create_play_pause_buttons,
-    create_slider_steps,
+
+# Imported eagerly: the decorator shares the submodule's name, and a
+# submodule imported after a lazy lookup would replace it on the package
+from physics_explorations.visualization.slider_cache import (
+    SliderCache,
+    SliderCacheInfo,
+    slider_bundles_enabled,
+    slider_cache,
 )
 
+if TYPE_CHECKING:
+    from physics_explorations.visualization.animations import (
+        apply_render_mode,
+        build_frames,
+        create_animation_figure,
+        create_animation_layout,
+        create_animation_slider,
+        create_play_pause_buttons,
+        create_slider_steps,
+        frame_to_webgl,
+        iter_frames,
+        to_webgl,
+    )
+    from physics_explorations.visualization.compression import (
+        Quantization,
+        create_heatmap_animation_html,
+        delta_decode,
+        delta_encode,
+        encode_array,
+        quantized_heatmap,
+        quantized_surface,
+    )
+    from physics_explorations.visualization.geometry import (
+        angles,
+        circle,
+        clear_geometry_cache,
+        grid,
+        ring,
+        sphere,
+        unit_circle,
+        unit_sphere,
+    )
+    from physics_explorations.visualization.parametric import (
+        build_parametric_payload,
+        create_parametric_html,
+    )
+    from physics_explorations.visualization.slider_bundle import (
+        build_slider_bundle_payload,
+        create_slider_bundle_html,
+    )
+    from physics_explorations.visualization.streaming import (
+        write_animation_html,
+        write_animation_json,
+    )
+
+# Names defined by each submodule, imported on first use
+_SUBMODULE_NAMES = {
+    "animations": (
+        "apply_render_mode",
+        "build_frames",
+        "create_animation_figure",
+        "create_animation_layout",
+        "create_animation_slider",
+        "create_play_pause_buttons",
+        "create_slider_steps",
+        "frame_to_webgl",
+        "iter_frames",
+        "to_webgl",
+    ),
+    "compression": (
+        "Quantization",
+        "create_heatmap_animation_html",
+        "delta_decode",
+        "delta_encode",
+        "encode_array",
+        "quantized_heatmap",
+        "quantized_surface",
+    ),
+    "geometry": (
+        "angles",
+        "circle",
+        "clear_geometry_cache",
+        "grid",
+        "ring",
+        "sphere",
+        "unit_circle",
+        "unit_sphere",
+    ),
+    "parametric": (
+        "build_parametric_payload",
+        "create_parametric_html",
+    ),
+    "slider_bundle": (
+        "build_slider_bundle_payload",
+        "create_slider_bundle_html",
+    ),
+    "streaming": (
+        "write_animation_html",
+        "write_animation_json",
+    ),
+}
+_LAZY_NAMES = {name: sub for sub, names in _SUBMODULE_NAMES.items() for name in names}
+
 __all__ = [
     # Styles
     "COLORS",
     "DARK_THEME",
     "ANIMATION_SETTINGS",
+    "RENDER_SETTINGS",
     "SLIDER_STYLE",
     "apply_dark_theme",
     "get_color_palette",
     "get_trace_style",
+    "set_render_mode",
     # Animations
+    "apply_render_mode",
+    "build_frames",
     "create_animation_figure",
+    "create_animation_layout",
+    "create_animation_slider",
     "create_play_pause_buttons",
     "create_slider_steps",
+    "frame_to_webgl",
+    "iter_frames",
+    "to_webgl",
+    # Compression
+    "Quantization",
+    "create_heatmap_animation_html",
+    "delta_decode",
+    "delta_encode",
+    "encode_array",
+    "quantized_heatmap",
+    "quantized_surface",
+    # Geometry
+    "angles",
+    "circle",
+    "clear_geometry_cache",
+    "grid",
+    "ring",
+    "sphere",
+    "unit_circle",
+    "unit_sphere",
+    # Parametric
+    "build_parametric_payload",
+    "create_parametric_html",
+    # Slider bundles
+    "build_slider_bundle_payload",
+    "create_slider_bundle_html",
+    # Slider cache
+    "SliderCache",
+    "SliderCacheInfo",
+    "slider_bundles_enabled",
+    "slider_cache",
+    # Streaming
+    "write_animation_html",
+    "write_animation_json",
 ]
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_NAMES)
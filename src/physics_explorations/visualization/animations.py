@@ -1,12 +1,13 @@
 """Animation utilities for physics visualizations."""
 
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 import plotly.graph_objects as go
 
 from physics_explorations.visualization.styles import (
     COLORS,
     DARK_THEME,
     ANIMATION_SETTINGS,
+    RENDER_SETTINGS,
     SLIDER_STYLE,
 )
 
@@ -93,40 +94,141 @@ def create_slider_steps(
     return steps
 
 
-def create_animation_figure(
+def use_webgl(n_points: int) -> bool:
+    """Decide whether a trace with `n_points` points should render with WebGL.
+
+    Args:
+        n_points: Largest number of points the trace carries in any frame
+
+    Returns:
+        True if the current render mode selects go.Scattergl
+    """
+    mode = RENDER_SETTINGS["mode"]
+    if mode == "webgl":
+        return True
+    if mode == "auto":
+        return n_points > RENDER_SETTINGS["webgl_threshold"]
+    return False
+
+
+def to_webgl(trace: Any) -> Any:
+    """Convert a go.Scatter trace to go.Scattergl.
+
+    Properties that Scattergl does not support (spline smoothing, cliponaxis,
+    stack groups, ...) are dropped rather than raising, so the trace degrades
+    to the closest WebGL equivalent. Non-Scatter traces are returned unchanged.
+
+    Args:
+        trace: A Plotly trace object
+
+    Returns:
+        The WebGL trace, or the original trace if it is not a go.Scatter
+    """
+    if not isinstance(trace, go.Scatter):
+        return trace
+    spec = trace.to_plotly_json()
+    spec.pop("type", None)
+    return go.Scattergl(spec, skip_invalid=True)
+
+
+def _count_points(trace: Any) -> int:
+    """Return the number of points in a Scatter trace (0 for other traces)."""
+    if not isinstance(trace, go.Scatter):
+        return 0
+    for coords in (trace.x, trace.y):
+        if coords is not None:
+            return len(coords)
+    return 0
+
+
+def apply_render_mode(
     initial_data: list,
     frames: list[go.Frame],
+) -> tuple[list, list[go.Frame]]:
+    """Switch dense Scatter traces to Scattergl according to RENDER_SETTINGS.
+
+    The decision is made per trace index across the initial data and every
+    frame, so a trace never changes type mid-animation.
+
+    Args:
+        initial_data: List of traces for the initial frame
+        frames: List of go.Frame objects for animation
+
+    Returns:
+        (initial_data, frames) with dense traces converted to WebGL
+    """
+    if RENDER_SETTINGS["mode"] == "svg":
+        return initial_data, frames
+
+    max_points: dict[int, int] = {}
+    for idx, trace in enumerate(initial_data):
+        max_points[idx] = _count_points(trace)
+    for frame in frames:
+        for idx, trace in zip(_trace_indices(frame), frame.data or ()):
+            max_points[idx] = max(max_points.get(idx, 0), _count_points(trace))
+
+    webgl = {idx for idx, n_points in max_points.items() if n_points and use_webgl(n_points)}
+    if not webgl:
+        return initial_data, frames
+
+    new_data = [
+        to_webgl(trace) if idx in webgl else trace
+        for idx, trace in enumerate(initial_data)
+    ]
+    new_frames = [frame_to_webgl(frame, webgl) for frame in frames]
+    return new_data, new_frames
+
+
+def _trace_indices(frame: go.Frame) -> list[int]:
+    """Return the figure trace index updated by each trace of a frame."""
+    if frame.traces:
+        return list(frame.traces)
+    return list(range(len(frame.data or ())))
+
+
+def frame_to_webgl(frame: go.Frame, webgl: set[int]) -> go.Frame:
+    """Return a copy of a frame with some of its traces converted to WebGL.
+
+    Args:
+        frame: Animation frame
+        webgl: Indices (in the figure's data) of the traces to convert
+
+    Returns:
+        New go.Frame; the input frame is left unchanged
+    """
+    new_frame = go.Frame(frame)
+    new_frame.data = [
+        to_webgl(trace) if idx in webgl else trace
+        for idx, trace in zip(_trace_indices(frame), frame.data or ())
+    ]
+    return new_frame
+
+
+def create_animation_layout(
     title: str = "",
     xaxis_title: str = "",
     yaxis_title: str = "",
     xaxis_range: list | None = None,
     yaxis_range: list | None = None,
-    show_slider: bool = True,
-    slider_prefix: str = "",
     height: int = 600,
     showlegend: bool = True,
     aspect_equal: bool = False,
-) -> go.Figure:
-    """Create a complete animated Plotly figure with standard controls.
+) -> go.Layout:
+    """Create the standard dark animation layout with Play/Pause buttons.
 
     Args:
-        initial_data: List of traces for the initial frame
-        frames: List of go.Frame objects for animation
         title: Figure title
         xaxis_title: X-axis label
         yaxis_title: Y-axis label
         xaxis_range: Optional [min, max] for x-axis
         yaxis_range: Optional [min, max] for y-axis
-        show_slider: Whether to show the animation slider
-        slider_prefix: Prefix for slider labels
         height: Figure height in pixels
         showlegend: Whether to show the legend
         aspect_equal: Whether to use equal aspect ratio
 
     Returns:
-        Configured go.Figure with animation controls
+        go.Layout without a slider (see create_animation_slider)
     """
-    # Build layout
     layout = go.Layout(
         title=dict(text=title, font=dict(size=18, color=COLORS["text"])),
         xaxis=dict(
@@ -167,43 +269,127 @@ def create_animation_figure(
         ],
     )
 
-    # Add slider if requested
-    if show_slider and frames:
-        layout["sliders"] = [
-            dict(
-                active=0,
-                yanchor="top",
-                xanchor="left",
-                currentvalue=dict(
-                    prefix=slider_prefix,
-                    visible=True,
-                    xanchor="center",
-                    font=dict(color=COLORS["text"]),
-                ),
-                transition=dict(duration=ANIMATION_SETTINGS["transition_duration"]),
-                pad=dict(b=10, t=50),
-                len=0.9,
-                x=0.05,
-                y=0,
-                steps=create_slider_steps(len(frames)),
-                bgcolor=COLORS["paper"],
-                bordercolor=COLORS["grid"],
-                tickcolor=COLORS["text_secondary"],
-                font=dict(color=COLORS["text_secondary"]),
-            )
-        ]
-
     # Handle equal aspect ratio
     if aspect_equal:
         layout["yaxis"]["scaleanchor"] = "x"
         layout["yaxis"]["scaleratio"] = 1
 
+    return layout
+
+
+def create_animation_slider(n_frames: int, prefix: str = "") -> dict[str, Any]:
+    """Create the standard animation slider for `n_frames` frames.
+
+    Args:
+        n_frames: Number of animation frames (named "0" .. "n_frames-1")
+        prefix: Prefix shown before the current value
+
+    Returns:
+        Slider definition for layout.sliders
+    """
+    return dict(
+        active=0,
+        yanchor="top",
+        xanchor="left",
+        currentvalue=dict(
+            prefix=prefix,
+            visible=True,
+            xanchor="center",
+            font=dict(color=COLORS["text"]),
+        ),
+        transition=dict(duration=ANIMATION_SETTINGS["transition_duration"]),
+        pad=dict(b=10, t=50),
+        len=0.9,
+        x=0.05,
+        y=0,
+        steps=create_slider_steps(n_frames),
+        bgcolor=COLORS["paper"],
+        bordercolor=COLORS["grid"],
+        tickcolor=COLORS["text_secondary"],
+        font=dict(color=COLORS["text_secondary"]),
+    )
+
+
+def create_animation_figure(
+    initial_data: list,
+    frames: list[go.Frame],
+    title: str = "",
+    xaxis_title: str = "",
+    yaxis_title: str = "",
+    xaxis_range: list | None = None,
+    yaxis_range: list | None = None,
+    show_slider: bool = True,
+    slider_prefix: str = "",
+    height: int = 600,
+    showlegend: bool = True,
+    aspect_equal: bool = False,
+) -> go.Figure:
+    """Create a complete animated Plotly figure with standard controls.
+
+    Args:
+        initial_data: List of traces for the initial frame
+        frames: List of go.Frame objects for animation
+        title: Figure title
+        xaxis_title: X-axis label
+        yaxis_title: Y-axis label
+        xaxis_range: Optional [min, max] for x-axis
+        yaxis_range: Optional [min, max] for y-axis
+        show_slider: Whether to show the animation slider
+        slider_prefix: Prefix for slider labels
+        height: Figure height in pixels
+        showlegend: Whether to show the legend
+        aspect_equal: Whether to use equal aspect ratio
+
+    Returns:
+        Configured go.Figure with animation controls
+    """
+    frames = list(frames)
+
+    # Build layout
+    layout = create_animation_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        xaxis_range=xaxis_range,
+        yaxis_range=yaxis_range,
+        height=height,
+        showlegend=showlegend,
+        aspect_equal=aspect_equal,
+    )
+
+    # Add slider if requested
+    if show_slider and frames:
+        layout["sliders"] = [create_animation_slider(len(frames), slider_prefix)]
+
+    # Use WebGL for dense scatter traces
+    initial_data, frames = apply_render_mode(list(initial_data), frames)
+
     # Create figure
     fig = go.Figure(data=initial_data, layout=layout, frames=frames)
 
     return fig
 
 
+def iter_frames(
+    n_frames: int,
+    frame_builder: Callable[[int], list],
+) -> Iterator[go.Frame]:
+    """Lazily yield animation frames from a builder function.
+
+    Only one frame exists at a time, so this pairs with the streaming
+    writers in physics_explorations.visualization.streaming.
+
+    Args:
+        n_frames: Number of frames to generate
+        frame_builder: Function that takes frame index and returns list of traces
+
+    Yields:
+        go.Frame objects named "0" .. "n_frames-1"
+    """
+    for i in range(n_frames):
+        yield go.Frame(data=frame_builder(i), name=str(i))
+
+
 def build_frames(
     n_frames: int,
     frame_builder: Callable[[int], list],
@@ -217,8 +403,4 @@ def build_frames(
     Returns:
         List of go.Frame objects
     """
-    frames = []
-    for i in range(n_frames):
-        frame_data = frame_builder(i)
-        frames.append(go.Frame(data=frame_data, name=str(i)))
-    return frames
+    return list(iter_frames(n_frames, frame_builder))
@@ -0,0 +1,290 @@
+"""Compact encodings for heatmap and surface z-data.
+
+Heatmap and surface animations ship a full float grid per frame. Because the
+color range (`zmin`/`zmax`) is known up front, the grid can be quantized to
+uint8 or uint16 with an affine map `z = q * scale + offset` and shipped as a
+Plotly binary typed array, which is 8x (uint8) or 4x (uint16) smaller than
+float64 before base64.
+
+Two paths are provided:
+
+- `quantized_heatmap` / `quantized_surface` build regular traces whose z-data
+  is already quantized. They work anywhere a Plotly figure does (marimo
+  cells, go.Frame animations); tick labels are mapped back to physical units
+  and z is left out of the hover, which could only show quantized levels.
+- `create_heatmap_animation_html` ships every frame as one binary block,
+  optionally delta-packed frame to frame, and dequantizes in the browser so
+  hover values stay physical.
+"""
+
+import base64
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import plotly.graph_objects as go
+from numpy.typing import ArrayLike, DTypeLike, NDArray
+
+from physics_explorations.visualization.parametric import _player_html
+from physics_explorations.visualization.styles import ANIMATION_SETTINGS
+
+# Plotly typed array codes for the dtypes we ship
+_TYPED_ARRAY_CODES = {
+    np.dtype(np.int8): "i1",
+    np.dtype(np.uint8): "u1",
+    np.dtype(np.int16): "i2",
+    np.dtype(np.uint16): "u2",
+    np.dtype(np.int32): "i4",
+    np.dtype(np.uint32): "u4",
+    np.dtype(np.float32): "f4",
+    np.dtype(np.float64): "f8",
+}
+
+
+@dataclass(frozen=True)
+class Quantization:
+    """Affine map between unsigned integers and physical z values."""
+
+    zmin: float
+    zmax: float
+    dtype: DTypeLike = np.uint8
+
+    def __post_init__(self) -> None:
+        if np.dtype(self.dtype) not in (np.dtype(np.uint8), np.dtype(np.uint16)):
+            raise ValueError(f"Quantization dtype must be uint8 or uint16, got {self.dtype}")
+        if not self.zmax > self.zmin:
+            raise ValueError(f"zmax ({self.zmax}) must be greater than zmin ({self.zmin})")
+
+    @property
+    def levels(self) -> int:
+        """Largest quantized value."""
+        return int(np.iinfo(self.dtype).max)
+
+    @property
+    def scale(self) -> float:
+        """Physical size of one quantization step."""
+        return (self.zmax - self.zmin) / self.levels
+
+    @property
+    def offset(self) -> float:
+        """Physical value of quantized zero."""
+        return self.zmin
+
+    def quantize(self, z: ArrayLike) -> NDArray[np.unsignedinteger]:
+        """Map physical values to integers, clipping to [zmin, zmax] (NaN -> zmin)."""
+        q = np.rint((np.asarray(z, dtype=float) - self.offset) / self.scale)
+        return np.clip(np.nan_to_num(q, nan=0.0), 0, self.levels).astype(self.dtype)
+
+    def dequantize(self, q: ArrayLike) -> NDArray[np.floating]:
+        """Map integers back to physical values."""
+        return np.asarray(q, dtype=float) * self.scale + self.offset
+
+    def ticks(self, n_ticks: int = 5) -> dict[str, Any]:
+        """Tick positions in quantized units labelled with physical values.
+
+        Use for a heatmap colorbar or a surface's scene axis.
+        """
+        physical = np.linspace(self.zmin, self.zmax, n_ticks)
+        return {
+            "tickvals": self.quantize(physical).tolist(),
+            "ticktext": [f"{value:.3g}" for value in physical],
+        }
+
+
+def encode_array(values: ArrayLike, dtype: DTypeLike | None = None) -> dict[str, str]:
+    """Encode an array as a Plotly typed array spec (`dtype`/`bdata`/`shape`).
+
+    Args:
+        values: Array to encode
+        dtype: Optional dtype to cast to before encoding
+
+    Returns:
+        Dictionary accepted by Plotly.js in place of a nested list
+    """
+    array = np.ascontiguousarray(values, dtype=dtype)
+    if array.dtype not in _TYPED_ARRAY_CODES:
+        raise ValueError(f"Unsupported dtype for binary encoding: {array.dtype}")
+    return {
+        "dtype": _TYPED_ARRAY_CODES[array.dtype],
+        "bdata": base64.b64encode(array.tobytes()).decode("ascii"),
+        "shape": ", ".join(str(n) for n in array.shape),
+    }
+
+
+def delta_encode(frames: NDArray[np.unsignedinteger]) -> NDArray[np.unsignedinteger]:
+    """Replace every frame after the first with its wrapped difference.
+
+    Differences wrap modulo the dtype range, so the result keeps the input
+    dtype and decodes exactly. Slowly changing fields become mostly small
+    values, which compress well with gzip/brotli.
+
+    Args:
+        frames: Array of shape (n_frames, ...) with an unsigned dtype
+
+    Returns:
+        Delta-packed array of the same shape and dtype
+    """
+    packed = frames.copy()
+    packed[1:] = frames[1:] - frames[:-1]
+    return packed
+
+
+def delta_decode(packed: NDArray[np.unsignedinteger]) -> NDArray[np.unsignedinteger]:
+    """Invert delta_encode."""
+    return np.cumsum(packed, axis=0, dtype=packed.dtype)
+
+
+def _hide_z_hover(kwargs: dict[str, Any]) -> None:
+    """Keep quantized z out of the hover unless the caller set one up."""
+    # Dequantized values in customdata would ship the float grid we saved
+    if "hoverinfo" not in kwargs and "hovertemplate" not in kwargs:
+        kwargs["hoverinfo"] = "x+y+name"
+
+
+def quantized_heatmap(
+    z: ArrayLike,
+    zmin: float,
+    zmax: float,
+    dtype: DTypeLike = np.uint8,
+    **kwargs: Any,
+) -> go.Heatmap:
+    """Create a heatmap whose z-data is quantized against [zmin, zmax].
+
+    The colorbar is labelled in physical units. Hover shows only x and y
+    unless hoverinfo or hovertemplate is passed, because z is in quantized
+    units; create_heatmap_animation_html dequantizes in the browser instead,
+    so its hover values are physical.
+
+    Args:
+        z: 2D array of physical values
+        zmin: Physical value at the bottom of the colorscale
+        zmax: Physical value at the top of the colorscale
+        dtype: np.uint8 (256 levels) or np.uint16 (65536 levels)
+        **kwargs: Extra go.Heatmap properties
+
+    Returns:
+        go.Heatmap with quantized z
+    """
+    quant = Quantization(zmin, zmax, dtype)
+    if kwargs.get("showscale", True):
+        kwargs["colorbar"] = {**quant.ticks(), **dict(kwargs.get("colorbar") or {})}
+    _hide_z_hover(kwargs)
+    return go.Heatmap(z=quant.quantize(z), zmin=0, zmax=quant.levels, **kwargs)
+
+
+def quantized_surface(
+    z: ArrayLike,
+    zmin: float,
+    zmax: float,
+    dtype: DTypeLike = np.uint16,
+    **kwargs: Any,
+) -> go.Surface:
+    """Create a surface whose z-data is quantized against [zmin, zmax].
+
+    Relabel the scene's z axis with `Quantization(zmin, zmax, dtype).ticks()`
+    so it reads in physical units, and use `aspectmode="cube"` (or a manual
+    aspect ratio) so the rendered shape does not depend on the z units.
+    Hover shows only x and y unless hoverinfo or hovertemplate is passed.
+
+    Args:
+        z: 2D array of physical heights
+        zmin: Lowest physical height
+        zmax: Highest physical height
+        dtype: np.uint16 (default) or np.uint8
+        **kwargs: Extra go.Surface properties
+
+    Returns:
+        go.Surface with quantized z
+    """
+    quant = Quantization(zmin, zmax, dtype)
+    if kwargs.get("showscale", True):
+        kwargs["colorbar"] = {**quant.ticks(), **dict(kwargs.get("colorbar") or {})}
+    _hide_z_hover(kwargs)
+    return go.Surface(z=quant.quantize(z), cmin=0, cmax=quant.levels, **kwargs)
+
+
+# Decodes the binary frame block and restyles the heatmap's z
+_HEATMAP_SETUP_JS = """
+  var raw = atob(payload.z.bdata);
+  var bytes = new Uint8Array(raw.length);
+  for (var k = 0; k < raw.length; k++) { bytes[k] = raw.charCodeAt(k); }
+  var data = payload.z.dtype === 'u2' ? new Uint16Array(bytes.buffer) : bytes;
+  var shape = payload.z.shape.split(',').map(function(n) { return parseInt(n, 10); });
+  var rows = shape[1], cols = shape[2], size = rows * cols;
+
+  if (payload.delta) {
+    var wrap = payload.z.dtype === 'u2' ? 65536 : 256;
+    for (var p = size; p < data.length; p++) {
+      data[p] = (data[p] + data[p - size]) % wrap;
+    }
+  }
+
+  function render(frame) {
+    var z = new Array(rows);
+    var start = frame * size;
+    for (var r = 0; r < rows; r++) {
+      var row = new Array(cols);
+      for (var c = 0; c < cols; c++) {
+        row[c] = data[start + r * cols + c] * payload.scale + payload.offset;
+      }
+      z[r] = row;
+    }
+    Plotly.restyle(gd, {z: [z]}, [payload.traceIndex]);
+  }
+"""
+
+
+def create_heatmap_animation_html(
+    fig: go.Figure,
+    z_frames: ArrayLike,
+    zmin: float,
+    zmax: float,
+    trace_index: int = 0,
+    dtype: DTypeLike = np.uint8,
+    delta: bool = True,
+    frame_duration: int | None = None,
+    slider_prefix: str = "",
+    include_plotlyjs: bool | str = "cdn",
+) -> str:
+    """Create a standalone page animating one heatmap from packed frames.
+
+    Args:
+        fig: Static figure; the heatmap at `trace_index` is animated
+        z_frames: Array of shape (n_frames, rows, cols) in physical units
+        zmin: Physical value at the bottom of the colorscale
+        zmax: Physical value at the top of the colorscale
+        trace_index: Index of the heatmap trace in `fig`
+        dtype: np.uint8 or np.uint16 quantization
+        delta: Whether to delta-pack consecutive frames
+        frame_duration: Milliseconds per frame (defaults to ANIMATION_SETTINGS)
+        slider_prefix: Prefix for the frame label
+        include_plotlyjs: "cdn" to load Plotly.js from the CDN, True to inline it
+
+    Returns:
+        HTML document as a string
+    """
+    z_frames = np.asarray(z_frames, dtype=float)
+    if z_frames.ndim != 3:
+        raise ValueError(f"z_frames must have shape (n_frames, rows, cols), got {z_frames.shape}")
+
+    quant = Quantization(zmin, zmax, dtype)
+    packed = quant.quantize(z_frames)
+    if delta:
+        packed = delta_encode(packed)
+
+    static = go.Figure(fig)
+    static.frames = []
+    static.data[trace_index].update(z=quant.dequantize(packed[0]), zmin=zmin, zmax=zmax)
+
+    payload = {
+        "figure": static,
+        "z": encode_array(packed),
+        "scale": quant.scale,
+        "offset": quant.offset,
+        "delta": delta,
+        "traceIndex": trace_index,
+        "nFrames": len(z_frames),
+        "duration": frame_duration or ANIMATION_SETTINGS["frame_duration"],
+        "sliderPrefix": slider_prefix,
+    }
+    return _player_html(payload, _HEATMAP_SETUP_JS, include_plotlyjs)
@@ -0,0 +1,170 @@
+"""Memoized geometric primitives for frame builders.
+
+Frame builders redraw the same circles, rings, spheres and grids on every
+frame. The unit shapes here are computed once per resolution and returned
+as read-only arrays; scaling and offsetting them allocates the output but
+skips recomputing the trig tables.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Distinct resolutions kept per primitive
+_CACHE_SIZE = 32
+
+
+def _readonly(*arrays: NDArray) -> tuple[NDArray, ...]:
+    """Mark arrays read-only so cached primitives cannot be mutated."""
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def angles(n_points: int = 100, endpoint: bool = True) -> NDArray[np.floating]:
+    """Evenly spaced angles over [0, 2π].
+
+    Args:
+        n_points: Number of angles
+        endpoint: Whether 2π is included (closed curves want True)
+
+    Returns:
+        Read-only array of angles (radians)
+    """
+    (theta,) = _readonly(np.linspace(0, 2 * np.pi, n_points, endpoint=endpoint))
+    return theta
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def unit_circle(
+    n_points: int = 100, endpoint: bool = True
+) -> tuple[NDArray[np.floating], NDArray[np.floating]]:
+    """Cosine and sine tables for a unit circle.
+
+    Args:
+        n_points: Number of points
+        endpoint: Whether the last point repeats the first
+
+    Returns:
+        (cos, sin): Read-only coordinate arrays
+    """
+    theta = angles(n_points, endpoint)
+    return _readonly(np.cos(theta), np.sin(theta))
+
+
+def circle(
+    radius: float = 1.0,
+    center: tuple[float, float] = (0.0, 0.0),
+    n_points: int = 100,
+) -> tuple[NDArray[np.floating], NDArray[np.floating]]:
+    """Closed circle scaled and offset from the cached unit circle.
+
+    Args:
+        radius: Circle radius
+        center: (x, y) center
+        n_points: Number of points
+
+    Returns:
+        (x, y): Coordinate arrays
+    """
+    cos, sin = unit_circle(n_points)
+    return center[0] + radius * cos, center[1] + radius * sin
+
+
+def ring(
+    r_inner: float,
+    r_outer: float,
+    center: tuple[float, float] = (0.0, 0.0),
+    n_points: int = 100,
+) -> tuple[NDArray[np.floating], NDArray[np.floating]]:
+    """Closed annulus outline suitable for `fill="toself"`.
+
+    Traces the outer circle, then the inner circle in reverse.
+
+    Args:
+        r_inner: Inner radius
+        r_outer: Outer radius
+        center: (x, y) center
+        n_points: Points per circle
+
+    Returns:
+        (x, y): Coordinate arrays of length 2 * n_points
+    """
+    cos, sin = unit_circle(n_points)
+    x = np.concatenate([r_outer * cos, r_inner * cos[::-1]])
+    y = np.concatenate([r_outer * sin, r_inner * sin[::-1]])
+    return center[0] + x, center[1] + y
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def unit_sphere(
+    n_u: int = 50, n_v: int = 30
+) -> tuple[NDArray[np.floating], NDArray[np.floating], NDArray[np.floating]]:
+    """Surface mesh of a unit sphere.
+
+    Args:
+        n_u: Points in azimuth
+        n_v: Points in polar angle
+
+    Returns:
+        (X, Y, Z): Read-only (n_v, n_u) mesh arrays
+    """
+    u = angles(n_u)
+    v = np.linspace(0, np.pi, n_v)
+    return _readonly(
+        np.outer(np.sin(v), np.cos(u)),
+        np.outer(np.sin(v), np.sin(u)),
+        np.outer(np.cos(v), np.ones_like(u)),
+    )
+
+
+def sphere(
+    radius: float = 1.0,
+    center: tuple[float, float, float] = (0.0, 0.0, 0.0),
+    n_u: int = 50,
+    n_v: int = 30,
+) -> tuple[NDArray[np.floating], NDArray[np.floating], NDArray[np.floating]]:
+    """Sphere mesh scaled and offset from the cached unit sphere.
+
+    Args:
+        radius: Sphere radius
+        center: (x, y, z) center
+        n_u: Points in azimuth
+        n_v: Points in polar angle
+
+    Returns:
+        (X, Y, Z): Mesh arrays
+    """
+    X, Y, Z = unit_sphere(n_u, n_v)
+    return center[0] + radius * X, center[1] + radius * Y, center[2] + radius * Z
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def grid(
+    x_range: tuple[float, float],
+    y_range: tuple[float, float],
+    nx: int = 50,
+    ny: int = 50,
+) -> tuple[NDArray[np.floating], NDArray[np.floating]]:
+    """Rectangular meshgrid over x_range × y_range.
+
+    Args:
+        x_range: (min, max) along x
+        y_range: (min, max) along y
+        nx: Points along x
+        ny: Points along y
+
+    Returns:
+        (X, Y): Read-only (ny, nx) mesh arrays
+    """
+    x = np.linspace(x_range[0], x_range[1], nx)
+    y = np.linspace(y_range[0], y_range[1], ny)
+    return _readonly(*np.meshgrid(x, y))
+
+
+def clear_geometry_cache() -> None:
+    """Drop every cached primitive."""
+    for cached in (angles, unit_circle, unit_sphere, grid):
+        cached.cache_clear()
@@ -0,0 +1,274 @@
+"""Client-side parametric animations.
+
+Many animations are analytic functions of time: every frame is the same base
+arrays pushed through a formula with a different phase. Instead of shipping
+one fully materialized go.Frame per step, a parametric animation ships the
+base arrays once plus a small vector of parameters per frame, and an embedded
+JS updater evaluates the formulas in the browser with `Plotly.restyle`.
+The payload grows as O(points + frames) rather than O(points × frames).
+
+Formulas are JavaScript expressions evaluated once per point. They can use
+the trace's base coordinates (`x`, `y`, `z`), the point index `i`, every
+per-frame parameter and every constant by name, e.g.::
+
+    create_parametric_html(
+        fig,
+        params={"phase": np.linspace(0, 2 * np.pi, 60, endpoint=False)},
+        expressions={0: {"z": "Math.sin(x - phase)"}},
+    )
+"""
+
+import json
+from typing import Any, Sequence
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+from plotly.utils import PlotlyJSONEncoder
+
+from physics_explorations.visualization.styles import ANIMATION_SETTINGS, COLORS
+
+# Trace coordinates shipped as base arrays for the formulas
+BASE_ARRAYS = ("x", "y", "z")
+
+# Shared Play/Pause/slider player. `setup` must define `render(frame)`. The
+# payload may also set `initial` (first frame) and `labels` (one per frame).
+_PLAYER_JS = """
+(function() {
+  var payload = %(payload)s;
+  var gd = document.getElementById('parametric-plot');
+  var slider = document.getElementById('parametric-slider');
+  var label = document.getElementById('parametric-label');
+%(setup)s
+  function show(frame) {
+    render(frame);
+    slider.value = frame;
+    label.textContent = payload.labels ? payload.labels[frame] : payload.sliderPrefix + frame;
+  }
+
+  var current = payload.initial || 0;
+  var timer = null;
+  function pause() {
+    if (timer !== null) { clearInterval(timer); timer = null; }
+  }
+  document.getElementById('parametric-play').onclick = function() {
+    if (timer !== null) { return; }
+    timer = setInterval(function() {
+      current = (current + 1) %% payload.nFrames;
+      show(current);
+    }, payload.duration);
+  };
+  document.getElementById('parametric-pause').onclick = pause;
+  slider.oninput = function() {
+    pause();
+    current = parseInt(slider.value, 10);
+    show(current);
+  };
+
+  Plotly.newPlot(gd, payload.figure.data, payload.figure.layout).then(function() {
+    show(current);
+  });
+})();
+"""
+
+# Evaluates each trace's expressions point by point
+_PARAMETRIC_SETUP_JS = """
+  var paramNames = Object.keys(payload.params);
+  var constNames = Object.keys(payload.constants);
+  var constValues = constNames.map(function(name) { return payload.constants[name]; });
+
+  var specs = payload.traces.map(function(trace) {
+    var baseNames = Object.keys(trace.base);
+    var argNames = baseNames.concat(['i'], paramNames, constNames);
+    var fns = {};
+    Object.keys(trace.expressions).forEach(function(attr) {
+      fns[attr] = new Function(argNames.join(','), 'return (' + trace.expressions[attr] + ');');
+    });
+    return {
+      index: trace.index,
+      n: trace.n,
+      base: baseNames.map(function(name) { return trace.base[name]; }),
+      fns: fns,
+    };
+  });
+
+  function render(frame) {
+    var paramValues = paramNames.map(function(name) { return payload.params[name][frame]; });
+    specs.forEach(function(spec) {
+      var args = new Array(spec.base.length + 1).concat(paramValues, constValues);
+      var update = {};
+      Object.keys(spec.fns).forEach(function(attr) {
+        var fn = spec.fns[attr];
+        var out = new Array(spec.n);
+        for (var i = 0; i < spec.n; i++) {
+          for (var b = 0; b < spec.base.length; b++) { args[b] = spec.base[b][i]; }
+          args[spec.base.length] = i;
+          out[i] = fn.apply(null, args);
+        }
+        update[attr] = [out];
+      });
+      Plotly.restyle(gd, update, [spec.index]);
+    });
+  }
+"""
+
+
+def build_parametric_payload(
+    fig: go.Figure,
+    params: dict[str, Sequence[float]],
+    expressions: dict[int, dict[str, str]],
+    constants: dict[str, float] | None = None,
+    frame_duration: int | None = None,
+    slider_prefix: str = "",
+) -> dict[str, Any]:
+    """Build the data shipped to the browser for a parametric animation.
+
+    Args:
+        fig: Static figure holding the base traces and layout (frames are dropped)
+        params: Per-frame parameter vectors, all of the same length
+        expressions: Trace index -> {attribute: JS expression}
+        constants: Scalars available to every expression
+        frame_duration: Milliseconds per frame (defaults to ANIMATION_SETTINGS)
+        slider_prefix: Prefix for the frame label
+
+    Returns:
+        JSON-serializable payload dictionary
+
+    Raises:
+        ValueError: If the parameters are inconsistent or names collide
+    """
+    constants = dict(constants or {})
+    lengths = {len(values) for values in params.values()}
+    if len(lengths) != 1:
+        raise ValueError("Parametric animations need at least one parameter, all of equal length")
+    (n_frames,) = lengths
+
+    names = list(params) + list(constants)
+    invalid = [name for name in names if not name.isidentifier()]
+    if invalid:
+        raise ValueError(f"Parameter names must be valid identifiers: {invalid}")
+    reserved = set(BASE_ARRAYS) | {"i"}
+    clashes = (reserved & set(names)) | (set(params) & set(constants))
+    if clashes:
+        raise ValueError(f"Parameter names clash with reserved or constant names: {sorted(clashes)}")
+
+    static = go.Figure(fig)
+    static.frames = []
+
+    traces = []
+    for index, trace_expressions in sorted(expressions.items()):
+        trace = static.data[index]
+        base = {}
+        for name in BASE_ARRAYS:
+            values = getattr(trace, name, None)
+            if values is not None:
+                base[name] = np.asarray(values, dtype=float).tolist()
+        n_points = max((len(values) for values in base.values()), default=1)
+        traces.append({
+            "index": index,
+            "n": n_points,
+            "base": base,
+            "expressions": dict(trace_expressions),
+        })
+
+    return {
+        "figure": static,
+        "traces": traces,
+        "params": {name: np.asarray(values, dtype=float).tolist() for name, values in params.items()},
+        "constants": constants,
+        "nFrames": n_frames,
+        "duration": frame_duration or ANIMATION_SETTINGS["frame_duration"],
+        "sliderPrefix": slider_prefix,
+    }
+
+
+def create_parametric_html(
+    fig: go.Figure,
+    params: dict[str, Sequence[float]],
+    expressions: dict[int, dict[str, str]],
+    constants: dict[str, float] | None = None,
+    frame_duration: int | None = None,
+    slider_prefix: str = "",
+    include_plotlyjs: bool | str = "cdn",
+) -> str:
+    """Create a standalone HTML page for a client-side parametric animation.
+
+    In a marimo notebook, display the result with `mo.iframe(html)`.
+
+    Args:
+        fig: Static figure holding the base traces and layout
+        params: Per-frame parameter vectors, all of the same length
+        expressions: Trace index -> {attribute: JS expression}
+        constants: Scalars available to every expression
+        frame_duration: Milliseconds per frame (defaults to ANIMATION_SETTINGS)
+        slider_prefix: Prefix for the frame label
+        include_plotlyjs: "cdn" to load Plotly.js from the CDN, True to inline it
+
+    Returns:
+        HTML document as a string
+    """
+    payload = build_parametric_payload(
+        fig,
+        params,
+        expressions,
+        constants=constants,
+        frame_duration=frame_duration,
+        slider_prefix=slider_prefix,
+    )
+
+    return _player_html(payload, _PARAMETRIC_SETUP_JS, include_plotlyjs)
+
+
+def _player_html(
+    payload: dict[str, Any],
+    setup_js: str,
+    include_plotlyjs: bool | str = "cdn",
+) -> str:
+    """Wrap a player payload and its `render(frame)` setup in an HTML page.
+
+    Args:
+        payload: Dictionary with figure, nFrames, duration and sliderPrefix
+            (and optionally initial and labels)
+        setup_js: JS source defining `render(frame)`
+        include_plotlyjs: "cdn" to load Plotly.js from the CDN, True to inline it
+
+    Returns:
+        HTML document as a string
+    """
+    if include_plotlyjs == "cdn":
+        plotly_script = (
+            f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+        )
+    elif include_plotlyjs:
+        plotly_script = f"<script>{get_plotlyjs()}</script>"
+    else:
+        plotly_script = ""
+
+    background = payload["figure"].layout.paper_bgcolor or "transparent"
+    button_style = (
+        f"background:{COLORS['paper']};color:{COLORS['text']};"
+        f"border:1px solid {COLORS['grid']};border-radius:4px;padding:4px 12px;cursor:pointer"
+    )
+    # Escaping "<" is enough to keep the JSON inside its <script>. Plotly's
+    # to_json also escapes "/", which sextuples the "/" of base64 arrays.
+    payload_json = json.dumps(payload, cls=PlotlyJSONEncoder, separators=(",", ":"))
+    script = _PLAYER_JS % {"payload": payload_json.replace("<", "\\u003c"), "setup": setup_js}
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+{plotly_script}
+</head>
+<body style="margin:0;background:{background};font-family:monospace">
+<div id="parametric-plot"></div>
+<div style="display:flex;align-items:center;gap:8px;padding:8px">
+<button id="parametric-play" style="{button_style}">▶ Play</button>
+<button id="parametric-pause" style="{button_style}">⏸ Pause</button>
+<input id="parametric-slider" type="range" min="0" max="{payload['nFrames'] - 1}" value="{payload.get('initial', 0)}" style="flex:1">
+<span id="parametric-label"></span>
+</div>
+<script>{script}</script>
+</body>
+</html>
+"""
@@ -0,0 +1,139 @@
+"""Precomputed slider states for static pages.
+
+A figure redrawn from a marimo slider needs a kernel; in a static export
+the slider does nothing. A slider bundle evaluates the figure at every
+value of the slider's grid and ships all of the states in one page,
+whose own slider switches between them in the browser with
+`Plotly.react`.
+
+States of one explorer share most of their content: traces that do not
+depend on the value (the Sun, a reference curve) and the layout's
+template. Every distinct trace, layout and template is stored once and
+each state lists the ones it uses, so the payload grows with what
+actually changes between values.
+"""
+
+from typing import Any, Sequence
+
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+from physics_explorations.visualization.parametric import _player_html
+from physics_explorations.visualization.styles import ANIMATION_SETTINGS
+
+# Rebuilds the figure of a state from the shared traces and layouts
+_SLIDER_BUNDLE_SETUP_JS = """
+  function render(frame) {
+    var state = payload.states[frame];
+    var layout = Object.assign(
+      {template: payload.templates[state.template]}, payload.layouts[state.layout]
+    );
+    Plotly.react(gd, state.traces.map(function(i) { return payload.traces[i]; }), layout);
+  }
+"""
+
+
+class _Pool:
+    """Distinct JSON values, each stored once and referred to by index."""
+
+    def __init__(self):
+        self.values: list[Any] = []
+        self._index: dict[str, int] = {}
+
+    def add(self, value: Any) -> int:
+        key = to_json_plotly(value)
+        if key not in self._index:
+            self._index[key] = len(self.values)
+            self.values.append(value)
+        return self._index[key]
+
+
+def build_slider_bundle_payload(
+    figures: Sequence[go.Figure],
+    values: Sequence[float],
+    initial: float | None = None,
+    slider_prefix: str = "",
+    frame_duration: int | None = None,
+) -> dict[str, Any]:
+    """Build the data shipped to the browser for a slider bundle.
+
+    Args:
+        figures: Figure of every slider value
+        values: Slider values, in slider order
+        initial: Value shown first (defaults to the first one)
+        slider_prefix: Prefix for the value label, e.g. "e = "
+        frame_duration: Milliseconds per state when playing (defaults to
+            ANIMATION_SETTINGS)
+
+    Returns:
+        JSON-serializable payload dictionary
+
+    Raises:
+        ValueError: If there are no figures, or not one per value
+    """
+    if not figures or len(figures) != len(values):
+        raise ValueError("Slider bundles need one figure per slider value")
+
+    traces, layouts, templates = _Pool(), _Pool(), _Pool()
+    states = []
+    for fig in figures:
+        layout = fig.layout.to_plotly_json()
+        template = layout.pop("template", {})
+        states.append({
+            "traces": [traces.add(trace.to_plotly_json()) for trace in fig.data],
+            "layout": layouts.add(layout),
+            "template": templates.add(template),
+        })
+
+    initial_index = 0
+    if initial is not None:
+        initial_index = min(range(len(values)), key=lambda i: abs(values[i] - initial))
+
+    # Only the background is needed up front; render() draws the states
+    placeholder = go.Figure(layout={"paper_bgcolor": figures[0].layout.paper_bgcolor})
+    placeholder.layout.template = None
+    return {
+        "figure": placeholder,
+        "traces": traces.values,
+        "layouts": layouts.values,
+        "templates": templates.values,
+        "states": states,
+        "labels": [f"{slider_prefix}{value:g}" for value in values],
+        "initial": initial_index,
+        "nFrames": len(figures),
+        "duration": frame_duration or ANIMATION_SETTINGS["frame_duration"],
+        "sliderPrefix": slider_prefix,
+    }
+
+
+def create_slider_bundle_html(
+    figures: Sequence[go.Figure],
+    values: Sequence[float],
+    initial: float | None = None,
+    slider_prefix: str = "",
+    frame_duration: int | None = None,
+    include_plotlyjs: bool | str = "cdn",
+) -> str:
+    """Create a standalone page switching between precomputed slider states.
+
+    In a marimo notebook, display the result with `mo.iframe(html)`.
+
+    Args:
+        figures: Figure of every slider value
+        values: Slider values, in slider order
+        initial: Value shown first (defaults to the first one)
+        slider_prefix: Prefix for the value label, e.g. "e = "
+        frame_duration: Milliseconds per state when playing
+        include_plotlyjs: "cdn" to load Plotly.js from the CDN, True to inline it
+
+    Returns:
+        HTML document as a string
+    """
+    payload = build_slider_bundle_payload(
+        figures,
+        values,
+        initial=initial,
+        slider_prefix=slider_prefix,
+        frame_duration=frame_duration,
+    )
+    return _player_html(payload, _SLIDER_BUNDLE_SETUP_JS, include_plotlyjs)
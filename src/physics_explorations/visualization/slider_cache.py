@@ -0,0 +1,240 @@
+"""Memoized figures for slider-driven cells.
+
+A cell that redraws a figure from a slider's value rebuilds it on every
+slider event, even for values it has already shown. Decorating the figure
+function with `slider_cache` and the slider's range keeps the figures of
+the values already visited:
+
+    @slider_cache(start=0, stop=0.95, step=0.05)
+    def plot_orbit(e):
+        ...
+
+    plot_orbit(eccentricity_slider.value)
+
+Values are quantized to the slider's grid (so float noise such as
+0.35000000000000003 hits the 0.35 entry) and the function is always
+called with the grid value. At most one figure per grid point is kept,
+or `maxsize` figures if that is smaller, evicting the least recently
+shown. The cached figures are shared: treat them as read-only.
+
+In marimo, define the decorated function in a cell that does not read
+the slider's value. A cell that does is rerun on every slider event,
+which would redefine the function and start over with an empty cache.
+
+With `prewarm=True`, the first time the slider moves a background thread
+computes the rest of the grid, nearest values first. Runs that only
+evaluate the initial value (exports, tests) never start it.
+
+Static exports have no kernel to redraw the figure. When they are made
+with slider bundles (the PHYSICS_SLIDER_BUNDLES environment variable, or
+`--slider-bundles` on the export command), `bundle_html()` evaluates the
+whole grid into one page that switches between the figures in the
+browser (see slider_bundle):
+
+    if slider_bundles_enabled():
+        mo.iframe(plot_orbit.bundle_html(eccentricity_slider.value))
+"""
+
+import contextlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+BUNDLE_ENV = "PHYSICS_SLIDER_BUNDLES"
+
+# Decimal places kept when quantizing to the grid
+_DIGITS = 10
+
+
+def slider_bundles_enabled() -> bool:
+    """Whether PHYSICS_SLIDER_BUNDLES asks for precomputed slider states."""
+    return os.environ.get(BUNDLE_ENV, "") not in ("", "0")
+
+
+@contextlib.contextmanager
+def slider_bundling():
+    """Enable slider bundles for exports (and the kernels they fork) in this block."""
+    previous = os.environ.get(BUNDLE_ENV)
+    os.environ[BUNDLE_ENV] = "1"
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ[BUNDLE_ENV]
+        else:
+            os.environ[BUNDLE_ENV] = previous
+
+
+@dataclass
+class SliderCacheInfo:
+    """Hit and miss counts of a slider cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SliderCache:
+    """Least-recently-used figures of a function of one slider value."""
+
+    def __init__(
+        self,
+        func: Callable[[float], Any],
+        start: float,
+        stop: float,
+        step: float,
+        maxsize: int | None = None,
+        prewarm: bool = False,
+    ):
+        if step <= 0 or stop < start:
+            raise ValueError("Slider ranges need step > 0 and stop >= start")
+        self.func = func
+        self.start = start
+        self.step = step
+        n_values = int(round((stop - start) / step)) + 1
+        self.values = [round(start + i * step, _DIGITS) for i in range(n_values)]
+        self.maxsize = min(maxsize or n_values, n_values)
+        self.prewarm_on_change = prewarm
+        self.__doc__ = func.__doc__
+        self.__name__ = getattr(func, "__name__", "slider_cache")
+
+        self._figures: OrderedDict[float, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._last_value: float | None = None
+        self._prewarm_thread: threading.Thread | None = None
+
+    def quantize(self, value: float) -> float:
+        """Snap a value to the nearest point of the grid."""
+        index = round((value - self.start) / self.step)
+        return self.values[min(max(index, 0), len(self.values) - 1)]
+
+    def _get(self, value: float, count: bool) -> Any:
+        with self._lock:
+            if value in self._figures:
+                self._figures.move_to_end(value)
+                self._hits += count
+                return self._figures[value]
+            self._misses += count
+        # Build outside the lock so a prewarm pass does not block the cell
+        figure = self.func(value)
+        with self._lock:
+            self._figures[value] = figure
+            self._figures.move_to_end(value)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return figure
+
+    def __call__(self, value: float) -> Any:
+        value = self.quantize(value)
+        previous, self._last_value = self._last_value, value
+        figure = self._get(value, count=True)
+        if self.prewarm_on_change and previous is not None and previous != value:
+            self.prewarm()
+        return figure
+
+    def _next_missing(self) -> float | None:
+        """Return the uncached grid value nearest to the last one shown."""
+        with self._lock:
+            missing = [v for v in self.values if v not in self._figures]
+        if not missing:
+            return None
+        anchor = self._last_value if self._last_value is not None else self.start
+        return min(missing, key=lambda v: abs(v - anchor))
+
+    def _prewarm(self) -> None:
+        # Stop after one pass over the grid, even if figures get evicted
+        for _ in range(min(self.maxsize, len(self.values))):
+            value = self._next_missing()
+            if value is None:
+                return
+            self._get(value, count=False)
+
+    def prewarm(self) -> threading.Thread:
+        """Compute the uncached grid values in a background thread.
+
+        Returns:
+            The (daemon) thread; a pass already running is returned as is
+        """
+        with self._lock:
+            thread = self._prewarm_thread
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(
+                    target=self._prewarm, name=f"prewarm-{self.__name__}", daemon=True
+                )
+                self._prewarm_thread = thread
+                thread.start()
+        return thread
+
+    def bundle_html(
+        self,
+        value: float | None = None,
+        slider_prefix: str = "",
+        include_plotlyjs: bool | str = "cdn",
+    ) -> str:
+        """Evaluate every grid value into a page that switches between them.
+
+        The figures go through the cache, so values already shown are
+        not rebuilt.
+
+        Args:
+            value: Value shown first (defaults to the start of the range)
+            slider_prefix: Prefix for the value label, e.g. "e = "
+            include_plotlyjs: "cdn" to load Plotly.js from the CDN, True to inline it
+
+        Returns:
+            HTML document as a string (display it with `mo.iframe`)
+        """
+        # Imported here: it needs plotly, which the export process does not load
+        from physics_explorations.visualization.slider_bundle import create_slider_bundle_html
+
+        figures = [self._get(v, count=False) for v in self.values]
+        return create_slider_bundle_html(
+            figures,
+            self.values,
+            initial=None if value is None else self.quantize(value),
+            slider_prefix=slider_prefix,
+            include_plotlyjs=include_plotlyjs,
+        )
+
+    def cache_info(self) -> SliderCacheInfo:
+        with self._lock:
+            return SliderCacheInfo(self._hits, self._misses, self.maxsize, len(self._figures))
+
+    def cache_clear(self) -> None:
+        """Drop every cached figure and reset the counts."""
+        with self._lock:
+            self._figures.clear()
+            self._hits = self._misses = 0
+
+
+def slider_cache(
+    start: float,
+    stop: float,
+    step: float,
+    maxsize: int | None = None,
+    prewarm: bool = False,
+) -> Callable[[Callable[[float], Any]], SliderCache]:
+    """Memoize a figure function over a slider's range.
+
+    Args:
+        start: Slider minimum
+        stop: Slider maximum
+        step: Slider step; values are quantized to this grid
+        maxsize: Figures kept (default: one per grid point)
+        prewarm: Compute the whole grid in the background once the slider moves
+
+    Returns:
+        Decorator wrapping the function in a SliderCache
+
+    Raises:
+        ValueError: If the range is empty or the step is not positive
+    """
+    def decorate(func: Callable[[float], Any]) -> SliderCache:
+        return SliderCache(func, start, stop, step, maxsize=maxsize, prewarm=prewarm)
+    return decorate
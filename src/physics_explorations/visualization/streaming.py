@@ -0,0 +1,145 @@
+"""Streaming serialization for long animations.
+
+A go.Figure keeps every frame as a Python object until it is rendered. The
+writers here instead take frames from any iterable (typically `iter_frames`
+or a generator), serialize each frame to JSON as soon as it is produced, and
+hold at most `buffer_frames` serialized frames before flushing them to the
+output. A 500-frame animation therefore never exists in memory all at once.
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, TextIO
+
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from physics_explorations.visualization.animations import (
+    apply_render_mode,
+    create_animation_layout,
+    create_animation_slider,
+    frame_to_webgl,
+)
+from physics_explorations.visualization.styles import COLORS
+
+
+def write_animation_json(
+    fp: TextIO,
+    initial_data: list,
+    frames: Iterable[go.Frame],
+    layout: go.Layout | dict[str, Any] | None = None,
+    show_slider: bool = True,
+    slider_prefix: str = "",
+    buffer_frames: int = 16,
+) -> int:
+    """Write an animated figure as Plotly JSON, one frame at a time.
+
+    Frames are written before the layout so the slider can be sized from the
+    number of frames actually produced.
+
+    Args:
+        fp: Text stream to write to
+        initial_data: List of traces for the initial frame
+        frames: Iterable of go.Frame objects, consumed lazily
+        layout: Layout to use (defaults to create_animation_layout())
+        show_slider: Whether to add the standard animation slider
+        slider_prefix: Prefix for slider labels
+        buffer_frames: Serialized frames held in memory before each flush
+
+    Returns:
+        Number of frames written
+    """
+    layout = go.Layout(layout if layout is not None else create_animation_layout())
+
+    # The WebGL decision can only look at the initial data when streaming
+    initial_data, _ = apply_render_mode(list(initial_data), [])
+    webgl = {
+        idx for idx, trace in enumerate(initial_data)
+        if isinstance(trace, go.Scattergl)
+    }
+
+    fp.write('{"data":')
+    fp.write(to_json_plotly(initial_data))
+    fp.write(',"frames":[')
+
+    buffer: list[str] = []
+    n_frames = 0
+    for frame in frames:
+        if webgl:
+            frame = frame_to_webgl(frame, webgl)
+        buffer.append(("," if n_frames else "") + to_json_plotly(frame))
+        n_frames += 1
+        if len(buffer) >= buffer_frames:
+            fp.write("".join(buffer))
+            buffer.clear()
+    fp.write("".join(buffer))
+
+    if show_slider and n_frames:
+        layout["sliders"] = [create_animation_slider(n_frames, slider_prefix)]
+
+    fp.write('],"layout":')
+    fp.write(to_json_plotly(layout))
+    fp.write("}")
+    return n_frames
+
+
+def write_animation_html(
+    output_path: Path,
+    initial_data: list,
+    frames: Iterable[go.Frame],
+    layout: go.Layout | dict[str, Any] | None = None,
+    show_slider: bool = True,
+    slider_prefix: str = "",
+    include_plotlyjs: bool | str = "cdn",
+    buffer_frames: int = 16,
+) -> Path:
+    """Write a standalone HTML page for an animation, streaming its frames.
+
+    Args:
+        output_path: Path of the HTML file to write
+        initial_data: List of traces for the initial frame
+        frames: Iterable of go.Frame objects, consumed lazily
+        layout: Layout to use (defaults to create_animation_layout())
+        show_slider: Whether to add the standard animation slider
+        slider_prefix: Prefix for slider labels
+        include_plotlyjs: "cdn" to load Plotly.js from the CDN, True to inline it
+        buffer_frames: Serialized frames held in memory before each flush
+
+    Returns:
+        Path to the generated HTML file
+    """
+    if include_plotlyjs == "cdn":
+        plotly_script = (
+            f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+        )
+    elif include_plotlyjs:
+        plotly_script = f"<script>{get_plotlyjs()}</script>"
+    else:
+        plotly_script = ""
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as fp:
+        fp.write(
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n'
+            '<meta charset="UTF-8">\n'
+            f"{plotly_script}\n"
+            "</head>\n"
+            f'<body style="margin:0;background:{COLORS["paper"]}">\n'
+            '<div id="animation"></div>\n'
+            "<script>\nvar figure = "
+        )
+        write_animation_json(
+            fp,
+            initial_data,
+            frames,
+            layout=layout,
+            show_slider=show_slider,
+            slider_prefix=slider_prefix,
+            buffer_frames=buffer_frames,
+        )
+        fp.write(
+            ";\nPlotly.newPlot('animation', figure.data, figure.layout)"
+            ".then(function(gd) { return Plotly.addFrames(gd, figure.frames); });\n"
+            "</script>\n</body>\n</html>\n"
+        )
+    return output_path
@@ -87,6 +87,15 @@ ANIMATION_SETTINGS: dict[str, Any] = {
     "mode": "immediate",
 }
 
+# Rendering settings. "svg" always emits go.Scatter, "webgl" always emits
+# go.Scattergl, and "auto" switches to WebGL once a trace carries more than
+# `webgl_threshold` points in any frame.
+RENDER_MODES = ("svg", "webgl", "auto")
+RENDER_SETTINGS: dict[str, Any] = {
+    "mode": "auto",
+    "webgl_threshold": 1000,
+}
+
 # Slider styling
 SLIDER_STYLE: dict[str, Any] = {
     "bgcolor": COLORS["paper"],
@@ -111,6 +120,23 @@ def apply_dark_theme(fig: Any) -> Any:
     return fig
 
 
+def set_render_mode(mode: str, webgl_threshold: int | None = None) -> None:
+    """Set the global rendering mode used by the animation helpers.
+
+    Args:
+        mode: One of 'svg', 'webgl' or 'auto'
+        webgl_threshold: Optional point count above which 'auto' uses WebGL
+
+    Raises:
+        ValueError: If the mode is not recognised
+    """
+    if mode not in RENDER_MODES:
+        raise ValueError(f"Unknown render mode {mode!r}, expected one of {RENDER_MODES}")
+    RENDER_SETTINGS["mode"] = mode
+    if webgl_threshold is not None:
+        RENDER_SETTINGS["webgl_threshold"] = webgl_threshold
+
+
 def get_color_palette() -> list[str]:
     """Return a list of colors for multi-series plots."""
     return [
@@ -0,0 +1,10 @@
+"""Shared pytest configuration."""
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--export-cache",
+        action="store_true",
+        help="Keep notebook exports in the pytest cache and reuse them while "
+        "their inputs are unchanged",
+    )
@@ -0,0 +1,124 @@
+"""Fixtures for the end-to-end tests.
+
+Exporting a notebook takes up to half a minute, so every notebook is
+exported once per session, concurrently, and all checks read those
+exports. With --export-cache the exports are kept in pytest's cache
+directory, keyed by a hash of everything that feeds them (see
+export_cache.export_cache_key), so later runs only re-export the notebooks
+whose source, library modules or marimo/plotly versions changed.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from physics_explorations.export import get_all_notebooks, export_notebook
+from physics_explorations.export_budget import BudgetExceededError
+from physics_explorations.export_cache import export_cache_key, load_manifest, save_manifest
+from physics_explorations.export_report import pop_usage
+
+# Exports run with RuntimeWarnings (invalid sqrt, overflow...) raised as errors
+EXPORT_ENV = {"PYTHONWARNINGS": "error::RuntimeWarning"}
+
+
+@dataclass
+class NotebookExport:
+    """Outcome of exporting one notebook."""
+
+    notebook: Path
+    output_path: Path | None  # None if the export failed
+    error: str | None = None
+    stderr: str = ""  # What `marimo export` printed to stderr
+
+    @property
+    def ok(self) -> bool:
+        return self.output_path is not None
+
+
+def _stderr_path(output_dir: Path, notebook: Path) -> Path:
+    return output_dir / f"{notebook.stem}.stderr"
+
+
+def _export(notebook: Path, output_dir: Path) -> NotebookExport:
+    pop_usage()
+    try:
+        export = NotebookExport(notebook, export_notebook(notebook, output_dir))
+    except subprocess.CalledProcessError as e:
+        export = NotebookExport(notebook, None, f"stdout: {e.stdout}\nstderr: {e.stderr}")
+    except BudgetExceededError as e:
+        export = NotebookExport(notebook, None, str(e))
+    # Successful exports print warnings too; keep them for cached runs
+    export.stderr = pop_usage().get("stderr", "")
+    _stderr_path(output_dir, notebook).write_text(export.stderr)
+    return export
+
+
+@pytest.fixture(scope="session")
+def notebook_exports(request, tmp_path_factory) -> dict[str, NotebookExport]:
+    """Export every notebook once, in parallel, keyed by notebook stem."""
+    if request.config.getoption("--export-cache"):
+        output_dir = request.config.cache.mkdir("notebook-exports")
+    else:
+        output_dir = tmp_path_factory.mktemp("notebook-exports")
+
+    notebooks = get_all_notebooks()
+    keys = {nb.stem: export_cache_key(nb) for nb in notebooks}
+    manifest = load_manifest(output_dir)
+    exports = {}
+    for nb in notebooks:
+        output_path = output_dir / f"{nb.stem}.html"
+        stderr_path = _stderr_path(output_dir, nb)
+        if (
+            keys[nb.stem] is not None
+            and manifest.get(nb.stem) == keys[nb.stem]
+            and output_path.exists()
+            and stderr_path.exists()
+        ):
+            exports[nb.stem] = NotebookExport(nb, output_path, stderr=stderr_path.read_text())
+    stale = [nb for nb in notebooks if nb.stem not in exports]
+
+    saved_env = {name: os.environ.get(name) for name in EXPORT_ENV}
+    os.environ.update(EXPORT_ENV)
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            for export in pool.map(lambda nb: _export(nb, output_dir), stale):
+                exports[export.notebook.stem] = export
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    for stem, export in exports.items():
+        if export.ok and keys[stem] is not None:
+            manifest[stem] = keys[stem]
+        else:
+            manifest.pop(stem, None)
+    save_manifest(output_dir, manifest)
+    return exports
+
+
+@pytest.fixture
+def seeded_output_dir(tmp_path, notebook_exports) -> Path:
+    """An output directory holding the session's exports and their manifest.
+
+    export_all() treats these notebooks as unchanged and only builds the
+    rest of the site.
+    """
+    keys = {}
+    for stem, export in notebook_exports.items():
+        if export.ok:
+            shutil.copy2(export.output_path, tmp_path / export.output_path.name)
+            keys[stem] = export_cache_key(export.notebook)
+    save_manifest(tmp_path, keys)
+    return tmp_path
@@ -6,12 +6,14 @@ These tests verify that:
 3. Math content renders properly (LaTeX/KaTeX)
 4. Plotly visualizations are generated
 5. No Python errors appear in output
+
+Each notebook is exported once per session (see conftest.notebook_exports)
+and every check reads that export.
 """
 
 import re
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -22,7 +24,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 from physics_explorations.export import (
     get_all_notebooks,
     extract_metadata,
-    export_notebook,
     export_all,
 )
 
@@ -48,23 +49,16 @@ class TestNotebookExecution:
         assert result.returncode == 0, f"Syntax error in {notebook.name}: {result.stderr}"
 
     @pytest.mark.parametrize("notebook", get_all_notebooks(), ids=lambda p: p.stem)
-    def test_notebook_exports_without_errors(self, notebook: Path):
+    def test_notebook_exports_without_errors(self, notebook: Path, notebook_exports):
         """Verify notebook exports to HTML without cell execution errors."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_dir = Path(tmpdir)
-
-            try:
-                output_path = export_notebook(notebook, output_dir)
-            except subprocess.CalledProcessError as e:
-                pytest.fail(
-                    f"Export failed for {notebook.name}:\n"
-                    f"stdout: {e.stdout}\n"
-                    f"stderr: {e.stderr}"
-                )
+        export = notebook_exports[notebook.stem]
+        if not export.ok:
+            pytest.fail(f"Export failed for {notebook.name}:\n{export.error}")
 
-            # Verify output file was created
-            assert output_path.exists(), f"Output HTML not created for {notebook.name}"
-            assert output_path.stat().st_size > 0, f"Output HTML is empty for {notebook.name}"
+        # Verify output file was created
+        output_path = export.output_path
+        assert output_path.exists(), f"Output HTML not created for {notebook.name}"
+        assert output_path.stat().st_size > 0, f"Output HTML is empty for {notebook.name}"
 
 
 class TestNotebookContent:
@@ -75,20 +69,15 @@ class TestNotebookContent:
     MAX_HTML_SIZE = 50 * 1024 * 1024  # 50 MB maximum (physics notebooks have large animations)
 
     @pytest.fixture(scope="class")
-    def exported_html(self) -> dict[str, tuple[str, int]]:
-        """Export all notebooks and return their HTML content and size."""
+    def exported_html(self, notebook_exports) -> dict[str, tuple[str, int]]:
+        """Return the HTML content and size of every exported notebook."""
         html_content = {}
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_dir = Path(tmpdir)
-            for notebook in get_all_notebooks():
-                try:
-                    output_path = export_notebook(notebook, output_dir)
-                    if output_path.exists():
-                        content = output_path.read_text()
-                        size = output_path.stat().st_size
-                        html_content[notebook.stem] = (content, size)
-                except subprocess.CalledProcessError:
-                    pass  # Skip failed exports for this fixture
+        for stem, export in notebook_exports.items():
+            # Failed exports are reported by test_notebook_exports_without_errors
+            if export.ok and export.output_path.exists():
+                content = export.output_path.read_text()
+                size = export.output_path.stat().st_size
+                html_content[stem] = (content, size)
         return html_content
 
     def test_output_size_reasonable(self, exported_html: dict[str, tuple[str, int]]):
@@ -272,34 +261,20 @@ class TestNoRuntimeWarnings:
     """Test that notebooks don't produce runtime warnings."""
 
     @pytest.mark.parametrize("notebook", get_all_notebooks(), ids=lambda p: p.stem)
-    def test_no_runtime_warnings_during_export(self, notebook: Path):
+    def test_no_runtime_warnings_during_export(self, notebook: Path, notebook_exports):
         """Verify notebook export doesn't produce RuntimeWarnings (e.g., invalid sqrt)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = Path(tmpdir) / f"{notebook.stem}.html"
-
-            result = subprocess.run(
-                [
-                    sys.executable, "-m", "marimo", "export", "html",
-                    str(notebook), "-o", str(output_path), "--no-include-code"
-                ],
-                capture_output=True,
-                text=True,
-                env={**subprocess.os.environ, "PYTHONWARNINGS": "error::RuntimeWarning"},
-            )
+        # Exports run with RuntimeWarnings raised as errors (see conftest.EXPORT_ENV)
+        stderr = notebook_exports[notebook.stem].stderr
+        warning_patterns = [
+            "RuntimeWarning",
+            "invalid value encountered",
+            "divide by zero",
+            "overflow encountered",
+        ]
 
-            # Check stderr for RuntimeWarnings (may appear even with non-zero exit)
-            warning_patterns = [
-                "RuntimeWarning",
-                "invalid value encountered",
-                "divide by zero",
-                "overflow encountered",
-            ]
-
-            for pattern in warning_patterns:
-                if pattern in result.stderr:
-                    pytest.fail(
-                        f"{notebook.name}: RuntimeWarning during export:\n{result.stderr}"
-                    )
+        for pattern in warning_patterns:
+            if pattern in stderr:
+                pytest.fail(f"{notebook.name}: RuntimeWarning during export:\n{stderr}")
 
 
 class TestMetadataExtraction:
@@ -322,38 +297,41 @@ class TestMetadataExtraction:
 
 
 class TestExportAll:
-    """Test the full export workflow."""
+    """Test the full export workflow.
+
+    The output directory starts out with the session's exports, so these
+    tests exercise export_all's cache and index generation without
+    exporting every notebook again.
+    """
 
-    def test_export_all_creates_files(self):
+    def test_export_all_creates_files(self, seeded_output_dir: Path):
         """Verify export_all creates all expected files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_dir = Path(tmpdir)
-            generated = export_all(output_dir)
+        output_dir = seeded_output_dir
+        generated = export_all(output_dir)
 
-            # Should have one HTML per notebook plus index.html
-            notebooks = get_all_notebooks()
-            expected_count = len(notebooks) + 1
+        # Should have one HTML per notebook plus index.html
+        notebooks = get_all_notebooks()
+        expected_count = len(notebooks) + 1
 
-            assert len(generated) == expected_count, (
-                f"Expected {expected_count} files, got {len(generated)}"
-            )
+        assert len(generated) == expected_count, (
+            f"Expected {expected_count} files, got {len(generated)}"
+        )
 
-            # Verify index.html exists and has content
-            index_path = output_dir / "index.html"
-            assert index_path.exists(), "index.html not created"
-            index_content = index_path.read_text()
-            assert "Feynman Physics" in index_content
-            assert "card" in index_content  # Should have notebook cards
+        # Verify index.html exists and has content
+        index_path = output_dir / "index.html"
+        assert index_path.exists(), "index.html not created"
+        index_content = index_path.read_text()
+        assert "Feynman Physics" in index_content
+        assert "card" in index_content  # Should have notebook cards
 
-    def test_index_links_all_notebooks(self):
+    def test_index_links_all_notebooks(self, seeded_output_dir: Path):
         """Verify index.html links to all notebooks."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_dir = Path(tmpdir)
-            export_all(output_dir)
-
-            index_content = (output_dir / "index.html").read_text()
-            for notebook in get_all_notebooks():
-                html_name = f"{notebook.stem}.html"
-                assert html_name in index_content, (
-                    f"index.html missing link to {html_name}"
-                )
+        output_dir = seeded_output_dir
+        export_all(output_dir)
+
+        index_content = (output_dir / "index.html").read_text()
+        for notebook in get_all_notebooks():
+            html_name = f"{notebook.stem}.html"
+            assert html_name in index_content, (
+                f"index.html missing link to {html_name}"
+            )
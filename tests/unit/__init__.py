@@ -0,0 +1 @@
+"""Unit tests for the physics and physics_explorations libraries."""
@@ -0,0 +1,166 @@
+"""Unit tests for the benchmark harness."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the project root to path for the benchmarks package
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from benchmarks import harness
+from benchmarks.compare import compare_runs, regressions
+from benchmarks.harness import (
+    BenchmarkResult,
+    BenchmarkRun,
+    discover,
+    load_notebook_function,
+    measure,
+    parametrize,
+)
+
+
+class TestHarness:
+    def test_parametrize_stacks(self):
+        @parametrize("a", [1, 2])
+        @parametrize("b", ["x"])
+        def bench(a, b):
+            pass
+
+        assert bench.params == {"a": [1, 2], "b": ["x"]}
+
+    def test_discover_names_and_filter(self):
+        names = [name for name, _, _ in discover("orbital.kepler_orbit")]
+        assert names == [
+            "orbital.kepler_orbit[n_frames=100]",
+            "orbital.kepler_orbit[n_frames=1000]",
+        ]
+
+    def test_measure_records_metrics(self, monkeypatch):
+        monkeypatch.setattr(harness, "MIN_SAMPLE_SECONDS", 0.0)
+        times, number, metrics = measure(lambda: {"bytes": 3}, repeat=2)
+        assert len(times) == 2
+        assert number == 1
+        assert metrics == {"bytes": 3}
+
+    def test_run_round_trip(self, tmp_path):
+        run = BenchmarkRun(
+            results={"a.b": BenchmarkResult("a.b", [0.2, 0.1, 0.3], 10, {"bytes": 5})},
+            machine={"python": "3.11"},
+            packages={"numpy": "2.0"},
+            commit="abc123",
+        )
+        loaded = BenchmarkRun.load(run.save(tmp_path / "run.json"))
+        assert loaded == run
+        assert loaded.results["a.b"].min == 0.1
+        assert loaded.results["a.b"].median == 0.2
+
+    def test_load_rejects_other_versions(self, tmp_path):
+        path = tmp_path / "run.json"
+        path.write_text('{"version": 0, "results": {}}')
+        with pytest.raises(ValueError):
+            BenchmarkRun.load(path)
+
+    def test_load_notebook_function(self):
+        notebook = harness.PROJECT_ROOT / "notebooks" / "three_body.py"
+        simulate = load_notebook_function(notebook, "simulate_three_body", np=np)
+        trajectories = simulate(
+            [(-1, 0), (1, 0), (0, 0)], [(0, 0.5), (0, -0.5), (0, 0)], [1, 1, 1], n_steps=10
+        )
+        assert len(trajectories) == 3
+
+        with pytest.raises(LookupError):
+            load_notebook_function(notebook, "no_such_function")
+
+
+def _run(results, pages=None, pages_exported="2026-01-01T00:00:00+00:00"):
+    return BenchmarkRun(
+        results={
+            name: BenchmarkResult(name, [seconds], 1, metrics)
+            for name, (seconds, metrics) in results.items()
+        },
+        machine={},
+        packages={},
+        pages=pages or {},
+        pages_exported=pages_exported,
+    )
+
+
+class TestCompare:
+    def test_flags_time_metric_and_page_growth(self):
+        baseline = _run(
+            {"a.fast": (1.0, {}), "a.fig": (1.0, {"json_bytes": 100})},
+            pages={"three_body.html": 1000},
+        )
+        current = _run(
+            {"a.fast": (1.1, {}), "a.fig": (1.5, {"json_bytes": 300}), "a.new": (9.0, {})},
+            pages={"three_body.html": 2000, "new.html": 10},
+        )
+        changes = compare_runs(current, baseline)
+
+        # Benchmarks and pages missing from the baseline are not compared
+        assert [(c.name, c.metric) for c in changes] == [
+            ("a.fast", "time"),
+            ("a.fig", "time"),
+            ("a.fig", "json_bytes"),
+            ("three_body.html", "page_bytes"),
+        ]
+        assert [(c.name, c.metric) for c in regressions(changes, threshold=0.2)] == [
+            ("a.fig", "time"),
+            ("a.fig", "json_bytes"),
+            ("three_body.html", "page_bytes"),
+        ]
+        assert regressions(changes, threshold=2.0) == []
+
+    def test_missing_measurements_fail(self):
+        baseline = _run(
+            {"a.kept": (1.0, {}), "a.gone": (1.0, {}), "b.fig": (1.0, {"json_bytes": 100})},
+            pages={"three_body.html": 1000, "gone.html": 10},
+        )
+        current = _run(
+            {"a.kept": (1.0, {}), "b.fig": (1.0, {})}, pages={"three_body.html": 1000}
+        )
+
+        missing = [(c.name, c.metric) for c in regressions(compare_runs(current, baseline))]
+        assert missing == [
+            ("a.gone", "time"),
+            ("b.fig", "json_bytes"),
+            ("gone.html", "page_bytes"),
+        ]
+        # A filtered run only owes the benchmarks it selected
+        assert [c.name for c in regressions(compare_runs(current, baseline, "a."))] == [
+            "a.gone", "gone.html",
+        ]
+        # Without an export report there are no pages to hold the run to
+        current.pages_exported = None
+        assert "gone.html" not in [c.name for c in compare_runs(current, baseline)]
+
+    def test_page_sizes_come_from_the_export_report(self, tmp_path):
+        from physics_explorations.export_report import (
+            REPORT_NAME,
+            ExportReport,
+            NotebookReport,
+        )
+
+        assert harness.page_sizes(tmp_path) == ({}, None)
+        for stem in ("exported", "failed", "stale"):
+            (tmp_path / f"{stem}.html").write_text(stem)
+        report = ExportReport(
+            "subprocess", 1, 1.0,
+            [NotebookReport("exported", 1.0), NotebookReport("failed", 1.0, error="boom")],
+        )
+        report.save(tmp_path / REPORT_NAME)
+
+        assert harness.page_sizes(tmp_path) == ({"exported.html": 8}, report.created)
+
+    def test_main_exit_code(self, tmp_path, capsys):
+        from benchmarks.__main__ import main
+
+        baseline = _run({"a.b": (1.0, {})}).save(tmp_path / "baseline.json")
+        same = _run({"a.b": (1.05, {})}).save(tmp_path / "same.json")
+        slower = _run({"a.b": (2.0, {})}).save(tmp_path / "slower.json")
+
+        assert main(["compare", str(baseline), "--current", str(same)]) == 0
+        assert main(["compare", str(baseline), "--current", str(slower)]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,695 @@
+"""Unit tests for the export pipeline (notebook exports are faked)."""
+
+import gzip
+import inspect
+import json
+import os
+import re
+import subprocess
+import sys
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from physics_explorations import export
+from physics_explorations.export import (
+    ExportError,
+    export_all,
+    extract_metadata,
+    generate_index_html,
+    get_all_notebooks,
+    index_notebooks,
+)
+from physics_explorations.export_assets import AssetBundle, localize_assets
+from physics_explorations.export_budget import (
+    BudgetExceededError,
+    ExportBudget,
+    check_output_size,
+    over_budget,
+)
+from physics_explorations.export_cache import SRC_DIR, export_cache_key, notebook_dependencies
+from physics_explorations.export_deterministic import normalize_random_ids
+from physics_explorations.export_inprocess import (
+    NotebookExecutionError,
+    export_notebook_in_process,
+    kernel_hooks_run,
+    kernel_start_method,
+)
+from physics_explorations.export_minify import minify_html
+from physics_explorations.export_profile import (
+    PROFILE_ENV,
+    build_profile,
+    finish_cell,
+    folded_stacks,
+    start_cell,
+)
+from physics_explorations.export_report import (
+    REPORT_NAME,
+    ExportReport,
+    NotebookReport,
+    analyze_page,
+    compare_reports,
+)
+from physics_explorations.export_watch import NotebookWatcher
+
+
+def _fake_export(
+    notebook_path: Path, output_dir: Path, include_code: bool = False, budget=None
+) -> Path:
+    """Stand-in for export_notebook that writes a tiny page."""
+    output_path = output_dir / f"{notebook_path.stem}.html"
+    output_path.write_text(f"<html>{notebook_path.stem}</html>")
+    return output_path
+
+
+class TestMetadataIndex:
+    """Test single-pass notebook metadata extraction."""
+
+    def test_index_matches_extract_metadata(self):
+        """Verify the index numbers and parses notebooks like extract_metadata."""
+        assert index_notebooks() == [extract_metadata(path) for path in get_all_notebooks()]
+
+    def test_title_after_long_preamble(self, tmp_path, monkeypatch):
+        """Verify the title is found past the first chunk read."""
+        monkeypatch.setattr(export, "NOTEBOOKS_DIR", tmp_path)
+        notebook = tmp_path / "demo.py"
+        notebook.write_text(
+            "# padding\n" * 2000
+            + 'mo.md(r"""\n# Demo Title\n\nA short description.\n""")\n'
+        )
+
+        (meta,) = index_notebooks()
+        assert (meta.number, meta.title, meta.description) == (
+            "1", "Demo Title", "A short description."
+        )
+
+    def test_changed_notebook_is_reparsed(self, tmp_path, monkeypatch):
+        """Verify cached metadata is refreshed when a notebook changes."""
+        monkeypatch.setattr(export, "NOTEBOOKS_DIR", tmp_path)
+        notebook = tmp_path / "demo.py"
+        notebook.write_text('mo.md(r"""\n# First\n\nText.\n""")\n')
+        assert index_notebooks()[0].title == "First"
+
+        notebook.write_text('mo.md(r"""\n# Second title\n\nText.\n""")\n')
+        assert index_notebooks()[0].title == "Second title"
+
+
+class TestParallelExport:
+    """Test concurrent scheduling and error collection in export_all."""
+
+    def test_results_keep_notebook_order(self, tmp_path, monkeypatch):
+        """Verify generated files follow notebook order, not completion order."""
+        monkeypatch.setattr(export, "export_notebook", _fake_export)
+        generated = export_all(tmp_path, workers=4)
+
+        stems = [path.stem for path in generated[:-1]]
+        assert stems == [nb.stem for nb in get_all_notebooks()]
+        assert generated[-1].name == "index.html"
+
+    def test_failures_do_not_stop_other_exports(self, tmp_path, monkeypatch):
+        """Verify one failing notebook is reported after the others finish."""
+        def flaky_export(notebook_path, output_dir, include_code=False, budget=None):
+            if notebook_path.stem == "gravitation":
+                raise subprocess.CalledProcessError(1, ["marimo"], "", "boom")
+            return _fake_export(notebook_path, output_dir, include_code)
+
+        monkeypatch.setattr(export, "export_notebook", flaky_export)
+        with pytest.raises(ExportError) as excinfo:
+            export_all(tmp_path, workers=3)
+
+        assert [r.stem for r in excinfo.value.failures] == ["gravitation"]
+        assert excinfo.value.failures[0].error == "boom"
+        exported = {path.stem for path in tmp_path.glob("*.html")}
+        assert len(exported) == len(get_all_notebooks()) - 1
+
+    def test_unexpected_errors_fail_one_notebook(self, tmp_path, monkeypatch):
+        """Verify any exception, not just export failures, is recorded per notebook."""
+        def broken_export(notebook_path, output_dir, include_code=False, budget=None):
+            if notebook_path.stem == "spacetime":
+                raise OSError("disk full")
+            return _fake_export(notebook_path, output_dir, include_code)
+
+        monkeypatch.setattr(export, "export_notebook", broken_export)
+        with pytest.raises(ExportError) as excinfo:
+            export_all(tmp_path, workers=3)
+
+        assert [r.stem for r in excinfo.value.failures] == ["spacetime"]
+        assert excinfo.value.failures[0].error == "OSError: disk full"
+        exported = {path.stem for path in tmp_path.glob("*.html")}
+        assert len(exported) == len(get_all_notebooks()) - 1
+
+
+class TestBudgets:
+    """Test per-notebook export budgets."""
+
+    def test_every_notebook_has_a_budget(self):
+        """Verify the budget table covers every notebook."""
+        assert {nb.stem for nb in get_all_notebooks()} <= set(export.NOTEBOOK_BUDGETS)
+
+    def test_over_budget_names_the_resource(self):
+        """Verify time and memory overruns are reported as such."""
+        budget = ExportBudget(seconds=10, memory_mb=0.001)
+        assert over_budget(budget, 1.0, []) is None
+        assert over_budget(budget, 11.0, []).resource == "time"
+        # This process certainly uses more than 1 kB
+        assert over_budget(budget, 1.0, [os.getpid()]).resource == "memory"
+
+    def test_output_size_budget(self, tmp_path):
+        """Verify a page larger than its budget is rejected."""
+        page = tmp_path / "demo.html"
+        page.write_bytes(b"x" * 2_000_000)
+        check_output_size(page, ExportBudget(output_mb=3))
+        with pytest.raises(BudgetExceededError, match="output budget"):
+            check_output_size(page, ExportBudget(output_mb=1))
+
+    def test_overrun_fails_only_that_notebook(self, tmp_path, monkeypatch):
+        """Verify export_all reports which notebook went over which budget."""
+        def runaway_export(notebook_path, output_dir, include_code=False, budget=None):
+            if notebook_path.stem == "three_body":
+                raise BudgetExceededError("time", budget.seconds, budget.seconds + 0.1)
+            return _fake_export(notebook_path, output_dir, include_code)
+
+        monkeypatch.setattr(export, "export_notebook", runaway_export)
+        with pytest.raises(ExportError) as excinfo:
+            export_all(tmp_path, workers=2)
+
+        (failure,) = excinfo.value.failures
+        assert failure.stem == "three_body"
+        assert "over time budget" in failure.error
+
+
+class TestExportCache:
+    """Test the content-hash export cache."""
+
+    def test_unchanged_notebooks_are_skipped(self, tmp_path, monkeypatch):
+        """Verify a second run reuses every page from the first."""
+        calls = []
+
+        def counting_export(notebook_path, output_dir, include_code=False, budget=None):
+            calls.append(notebook_path.stem)
+            return _fake_export(notebook_path, output_dir, include_code)
+
+        monkeypatch.setattr(export, "export_notebook", counting_export)
+        export_all(tmp_path, workers=1)
+        first_run = len(calls)
+        generated = export_all(tmp_path, workers=1)
+
+        assert first_run == len(get_all_notebooks())
+        assert len(calls) == first_run
+        assert len(generated) == first_run + 1
+
+    def test_changed_key_triggers_export(self, tmp_path, monkeypatch):
+        """Verify only notebooks whose cache key changed are re-exported."""
+        calls = []
+
+        def counting_export(notebook_path, output_dir, include_code=False, budget=None):
+            calls.append(notebook_path.stem)
+            return _fake_export(notebook_path, output_dir, include_code)
+
+        monkeypatch.setattr(export, "export_notebook", counting_export)
+        export_all(tmp_path, workers=1)
+        calls.clear()
+
+        original_key = export.export_cache_key
+        monkeypatch.setattr(
+            export, "export_cache_key",
+            lambda path, *options: (
+                "changed" if path.stem == "spacetime" else original_key(path, *options)
+            ),
+        )
+        export_all(tmp_path, workers=1)
+        assert calls == ["spacetime"]
+
+    def test_dependencies_follow_library_imports(self, tmp_path):
+        """Verify notebook dependencies include transitively imported modules."""
+        notebook = tmp_path / "demo.py"
+        notebook.write_text(
+            "from physics_explorations.visualization.styles import COLORS\n"
+            "import numpy as np\n"
+        )
+        names = {path.name for path in notebook_dependencies(notebook)}
+        assert "styles.py" in names
+        assert "__init__.py" in names
+        assert all("numpy" not in str(path) for path in notebook_dependencies(notebook))
+
+    def test_lazy_exports_are_not_dependencies(self):
+        """Verify TYPE_CHECKING imports only count for the names a notebook looks up."""
+        for notebook in get_all_notebooks():
+            names = {path.name for path in notebook_dependencies(notebook)}
+            assert "export_minify.py" not in names, notebook.stem
+            assert "export.py" not in names, notebook.stem
+
+    def test_lazy_names_resolve_to_their_module(self, tmp_path):
+        """Verify a lazily exported name pulls in only the submodule defining it."""
+        notebook = tmp_path / "nb.py"
+        notebook.write_text("from physics import kepler_orbit\n")
+        names = {path.name for path in notebook_dependencies(notebook)}
+        assert "orbital_mechanics.py" in names
+        assert "cache.py" not in names
+
+    def test_unparsable_notebook_has_no_key(self, tmp_path):
+        """Verify a notebook with a syntax error is uncached instead of raising."""
+        notebook = tmp_path / "broken.py"
+        notebook.write_text("def oops(:\n")
+        assert export_cache_key(notebook) is None
+
+    def test_unparsable_notebook_fails_alone(self, tmp_path, monkeypatch):
+        """Verify a broken notebook is reported while the others still export."""
+        notebooks_dir = tmp_path / "notebooks"
+        notebooks_dir.mkdir()
+        (notebooks_dir / "spacetime.py").write_text(
+            (export.NOTEBOOKS_DIR / "spacetime.py").read_text()
+        )
+        (notebooks_dir / "zz_broken.py").write_text("def oops(:\n")
+
+        def strict_export(notebook_path, output_dir, include_code=False, budget=None):
+            compile(notebook_path.read_text(), str(notebook_path), "exec")
+            return _fake_export(notebook_path, output_dir, include_code)
+
+        monkeypatch.setattr(export, "NOTEBOOKS_DIR", notebooks_dir)
+        monkeypatch.setattr(export, "export_notebook", strict_export)
+        with pytest.raises(ExportError) as excinfo:
+            export_all(tmp_path / "out", workers=2)
+
+        assert [r.stem for r in excinfo.value.failures] == ["zz_broken"]
+        assert excinfo.value.failures[0].error.startswith("SyntaxError")
+        assert (tmp_path / "out" / "spacetime.html").exists()
+
+    def test_key_depends_on_export_code(self, monkeypatch):
+        """Verify editing the export pipeline invalidates every page."""
+        notebook = get_all_notebooks()[0]
+        key = export_cache_key(notebook)
+        original = Path.read_bytes
+
+        def edited(path):
+            data = original(path)
+            return data + b"# edited\n" if path.name == "export_minify.py" else data
+
+        monkeypatch.setattr(Path, "read_bytes", edited)
+        assert export_cache_key(notebook) != key
+
+    def test_key_depends_on_options(self):
+        """Verify export options are part of the cache key."""
+        notebook = get_all_notebooks()[0]
+        assert export_cache_key(notebook, False) != export_cache_key(notebook, True)
+        assert export_cache_key(notebook, False) != export_cache_key(
+            notebook, False, slider_bundles=True
+        )
+
+
+_TINY_NOTEBOOK = '''import marimo
+
+app = marimo.App()
+
+
+@app.cell
+def _():
+    answer = {value}
+    return (answer,)
+
+
+if __name__ == "__main__":
+    app.run()
+'''
+
+
+class TestInProcessExport:
+    """Test exporting through marimo's Python API."""
+
+    def test_exports_notebook(self, tmp_path):
+        """Verify a notebook is rendered without a marimo subprocess."""
+        pytest.importorskip("marimo")
+        notebook = tmp_path / "tiny.py"
+        notebook.write_text(_TINY_NOTEBOOK.format(value="6 * 7"))
+
+        output_path = export_notebook_in_process(notebook, tmp_path / "out")
+        assert output_path == tmp_path / "out" / "tiny.html"
+        assert "<html" in output_path.read_text()
+
+    def test_cell_errors_raise_after_writing(self, tmp_path):
+        """Verify failing cells raise NotebookExecutionError but keep the page."""
+        pytest.importorskip("marimo")
+        notebook = tmp_path / "broken.py"
+        notebook.write_text(_TINY_NOTEBOOK.format(value="1 / 0"))
+
+        with pytest.raises(NotebookExecutionError):
+            export_notebook_in_process(notebook, tmp_path)
+        assert (tmp_path / "broken.html").exists()
+
+    def test_unknown_engine_is_rejected(self, tmp_path):
+        """Verify export_all validates the engine before exporting."""
+        with pytest.raises(ValueError, match="engine"):
+            export_all(tmp_path, engine="threads")
+
+    def test_spawned_kernels_are_rejected(self, tmp_path, monkeypatch):
+        """Verify the engine refuses a marimo whose kernels inherit nothing."""
+        monkeypatch.setattr(export, "kernel_start_method", lambda: "spawn")
+        with pytest.raises(ValueError, match="spawn"):
+            export_all(tmp_path, engine="inprocess")
+        assert not (tmp_path / "index.html").exists()
+
+    def test_unknown_start_method_is_rejected(self, tmp_path, monkeypatch):
+        """Verify the engine is refused when the start method cannot be read."""
+        monkeypatch.setattr(export, "kernel_start_method", lambda: "unknown")
+        with pytest.raises(ValueError, match="could not be determined"):
+            export_all(tmp_path, engine="inprocess")
+
+    def test_kernels_without_hooks_are_rejected(self, tmp_path, monkeypatch):
+        """Verify the engine is refused when the test export has no cell timings."""
+        monkeypatch.setattr(export, "kernel_start_method", lambda: "fork")
+        monkeypatch.setattr(export, "kernel_hooks_run", lambda: False)
+        with pytest.raises(ValueError, match="cell timings"):
+            export_all(tmp_path, engine="inprocess")
+
+    def test_kernel_start_method(self, monkeypatch):
+        """Verify marimo's start method is one multiprocessing knows, or unknown."""
+        pytest.importorskip("marimo")
+        assert kernel_start_method() in ("fork", "spawn", "forkserver")
+
+        def no_source(module):
+            raise OSError("could not get source code")
+
+        monkeypatch.setattr(inspect, "getsource", no_source)
+        assert kernel_start_method() == "unknown"
+
+    def test_kernel_hooks_run(self):
+        """Verify the probe agrees with the start method of this marimo."""
+        pytest.importorskip("marimo")
+        kernel_hooks_run.cache_clear()
+        assert kernel_hooks_run() == (kernel_start_method() == "fork")
+
+
+class TestSharedAssets:
+    """Test pointing exported pages at the shared asset bundle."""
+
+    @staticmethod
+    def _bundle(tmp_path):
+        return AssetBundle(
+            tmp_path / "assets" / "abc123",
+            marimo_version="0.19.6",
+            plotly_version="3.3.1",
+            entry_points=["assets/index-X.js", "assets/index-Y.css"],
+        )
+
+    def test_bundled_versions_are_localized(self, tmp_path):
+        """Verify CDN URLs of the bundled versions become relative URLs."""
+        html = (
+            '<script src="https://cdn.jsdelivr.net/npm/@marimo-team/frontend@0.19.6/dist/assets/index-X.js">'
+            '<link href="https://cdn.jsdelivr.net/npm/@marimo-team/frontend@0.18.0/dist/favicon.ico">'
+            '<script src="https://cdn.plot.ly/plotly-3.3.1.min.js">'
+        )
+        localized = localize_assets(html, self._bundle(tmp_path))
+
+        assert 'src="assets/abc123/assets/index-X.js"' in localized
+        assert 'src="assets/abc123/plotly-3.3.1.min.js"' in localized
+        # Other versions are not in the bundle and keep their CDN URL
+        assert "frontend@0.18.0/dist/favicon.ico" in localized
+
+    def test_index_prefetches_bundle(self, tmp_path):
+        """Verify index.html prefetches the bundle's entry points."""
+        notebooks = [extract_metadata(path) for path in get_all_notebooks()]
+        index_path = generate_index_html(notebooks, tmp_path, self._bundle(tmp_path))
+
+        html = index_path.read_text()
+        assert '<link rel="prefetch" href="assets/abc123/assets/index-X.js"' in html
+        assert '<link rel="prefetch" href="assets/abc123/assets/index-Y.css"' in html
+
+
+_MARIMO_PAGE = """<html>
+  <head>
+    <script data-marimo="true">
+      window.__MARIMO_MOUNT_CONFIG__ = {
+            "filename": "demo.py",
+            "notebook": {"cells": [{"code": "x = '&quot;'"}]},
+            "session": {"cells": [{"outputs": [{"data": {"text/html": %s}, "type": "data"}]}]},
+            "runtimeConfig": null,
+        };
+    </script>
+  </head>
+  <body>
+    <div id="root"></div>
+  </body>
+</html>
+"""
+
+
+class TestMinify:
+    """Test post-export minification and precompression."""
+
+    @staticmethod
+    def _mount_config(html):
+        start = html.index("= ", html.index("__MARIMO_MOUNT_CONFIG__")) + 2
+        return json.JSONDecoder().raw_decode(html[start:])[0]
+
+    def test_minified_page_is_equivalent(self):
+        """Verify outputs keep their meaning while escaping shrinks."""
+        output = "<marimo-plotly data-figure='{&quot;data&quot;: []}'></marimo-plotly></p>"
+        page = _MARIMO_PAGE % json.dumps(output).replace("<", "\\u003C").replace("&", "\\u0026")
+
+        minified = minify_html(page)
+        config = self._mount_config(minified)
+
+        html_output = config["session"]["cells"][0]["outputs"][0]["data"]["text/html"]
+        assert html_output == "<marimo-plotly data-figure='{\"data\": []}'></marimo-plotly></p>"
+        # Code is not an HTML output and is left alone
+        assert config["notebook"]["cells"][0]["code"] == "x = '&quot;'"
+        # Closing tags inside the script stay escaped
+        assert "</marimo-plotly>" not in minified
+        assert len(minified) < len(page)
+
+    def test_precompressed_siblings(self, tmp_path, monkeypatch):
+        """Verify export_all writes .gz copies of every page and the index."""
+        monkeypatch.setattr(export, "export_notebook", _fake_export)
+        generated = export_all(tmp_path, workers=2, minify=True, precompress=True)
+
+        for path in generated:
+            sibling = path.with_name(path.name + ".gz")
+            assert gzip.decompress(sibling.read_bytes()) == path.read_bytes()
+
+
+class TestExportReport:
+    """Test the export telemetry report."""
+
+    @staticmethod
+    def _page(tmp_path):
+        figure = json.dumps({"data": [], "frames": [{}, {}, {}]})
+        output = f"<marimo-plotly data-figure='{figure.replace(chr(34), '&quot;')}'></marimo-plotly>"
+        page = (_MARIMO_PAGE % json.dumps(output)).replace(
+            '"session": {"cells": [{', '"session": {"cells": [{"id": "Hbol", "outputs": []}, {"id": "MJUe", '
+        )
+        path = tmp_path / "demo.html"
+        path.write_text(page)
+        return path
+
+    def test_analyze_page_counts_figures(self, tmp_path):
+        """Verify figures, frames and cell positions are read from the page."""
+        report = analyze_page(
+            self._page(tmp_path), "demo", 2.0, cell_times={"MJUe": 1.5, "Hbol": 0.1}
+        )
+
+        assert report.n_figures == 1
+        assert report.n_frames == 3
+        assert report.largest_figures[0].cell == 2
+        assert [(t.cell, t.seconds) for t in report.cell_times] == [(1, 0.1), (2, 1.5)]
+
+    def test_report_round_trip(self, tmp_path):
+        """Verify a saved report loads back unchanged."""
+        report = ExportReport("inprocess", 2, 10.0, [analyze_page(self._page(tmp_path), "demo", 2.0)])
+        path = report.save(tmp_path / REPORT_NAME)
+
+        assert ExportReport.load(path) == report
+        assert ExportReport.load(tmp_path / "missing.json") is None
+
+    def test_compare_flags_growth(self):
+        """Verify growth past the threshold is a regression, noise is not."""
+        baseline = ExportReport("subprocess", 1, 20.0, [
+            NotebookReport("a", 10.0, output_bytes=1000),
+            NotebookReport("b", 1.0, output_bytes=1000),
+        ])
+        current = ExportReport("subprocess", 1, 20.0, [
+            NotebookReport("a", 15.0, output_bytes=1100),
+            NotebookReport("b", 1.5, output_bytes=2000),
+        ])
+
+        regressions = compare_reports(current, baseline, threshold=0.2)
+        assert [(r.stem, r.metric) for r in regressions] == [("a", "duration"), ("b", "output_bytes")]
+
+    def test_export_all_writes_report(self, tmp_path, monkeypatch):
+        """Verify every run saves a report and cached notebooks keep theirs."""
+        monkeypatch.setattr(export, "export_notebook", _fake_export)
+        export_all(tmp_path, workers=2)
+        first = ExportReport.load(tmp_path / REPORT_NAME)
+        assert [nb.stem for nb in first.notebooks] == [nb.stem for nb in get_all_notebooks()]
+        assert not any(nb.cached for nb in first.notebooks)
+
+        export_all(tmp_path, workers=2, baseline=tmp_path / REPORT_NAME)
+        second = ExportReport.load(tmp_path / REPORT_NAME)
+        assert all(nb.cached for nb in second.notebooks)
+        assert [nb.duration for nb in second.notebooks] == [nb.duration for nb in first.notebooks]
+
+
+class TestWatch:
+    """Test change detection for watch mode."""
+
+    def test_detects_added_modified_and_deleted_files(self, tmp_path):
+        """Verify every kind of change is reported once."""
+        (tmp_path / "kept.py").write_text("x = 1\n")
+        (tmp_path / "removed.py").write_text("x = 1\n")
+        watcher = NotebookWatcher(tmp_path, source_dirs=[])
+
+        (tmp_path / "kept.py").write_text("x = 22\n")
+        (tmp_path / "removed.py").unlink()
+        (tmp_path / "added.py").write_text("x = 1\n")
+
+        assert {path.name for path in watcher.changes()} == {"kept.py", "removed.py", "added.py"}
+        assert watcher.changes() == set()
+
+    def test_library_change_affects_importing_notebooks(self, tmp_path):
+        """Verify a library change selects only the notebooks importing it."""
+        (tmp_path / "styled.py").write_text(
+            "from physics_explorations.visualization import create_figure\n"
+        )
+        (tmp_path / "plain.py").write_text("import numpy as np\n")
+        watcher = NotebookWatcher(tmp_path, source_dirs=[])
+
+        styles = SRC_DIR / "physics_explorations" / "visualization" / "styles.py"
+        assert watcher.affected_notebooks({styles}) == ["styled"]
+        assert watcher.affected_notebooks({tmp_path / "plain.py"}) == ["plain"]
+
+    def test_unparsable_notebook_is_affected(self, tmp_path):
+        """Verify a notebook saved with a syntax error is rebuilt, not fatal."""
+        (tmp_path / "editing.py").write_text("def oops(:\n")
+        (tmp_path / "plain.py").write_text("import numpy as np\n")
+        watcher = NotebookWatcher(tmp_path, source_dirs=[])
+
+        styles = SRC_DIR / "physics_explorations" / "visualization" / "styles.py"
+        assert watcher.affected_notebooks({styles}) == ["editing"]
+
+    def test_rebuild_errors_keep_watching(self, tmp_path, monkeypatch, capsys):
+        """Verify an unexpected error during a rebuild is printed, not raised."""
+        def failing_export_all(*args, **kwargs):
+            raise SyntaxError("invalid syntax")
+
+        rebuilds = []
+        monkeypatch.setattr(export, "export_all", failing_export_all)
+        monkeypatch.setattr(export, "watch", lambda rebuild, _: rebuilds.append(rebuild()))
+        export.main(["--watch", "-o", str(tmp_path)])
+
+        assert len(rebuilds) == 1
+        assert "SyntaxError: invalid syntax" in capsys.readouterr().out
+
+
+class TestDeterministic:
+    """Test reproducible export output."""
+
+    @staticmethod
+    def _slider_page(random_id, other_id="0f1e2d3c-4b5a-6978-8796-a5b4c3d2e1f0"):
+        return (
+            f"<marimo-ui-element object-id='Hstk-0' random-id='{random_id}'></marimo-ui-element>"
+            f"<marimo-ui-element object-id='ulZA-0' random-id='{other_id}'></marimo-ui-element>"
+            f"<marimo-ui-element object-id='Hstk-0' random-id='{random_id}'></marimo-ui-element>"
+        )
+
+    def test_runs_normalize_to_same_ids(self):
+        """Verify pages differing only in marimo's random ids become identical."""
+        first = normalize_random_ids(self._slider_page("95de4b6f-e208-9a95-50f7-459bde527b74"))
+        second = normalize_random_ids(self._slider_page("2c981cc8-270a-8ff2-66f8-76514c1e5c3e"))
+
+        assert first == second
+        assert "95de4b6f" not in first
+
+    def test_ids_stay_distinct_and_consistent(self):
+        """Verify elements keep distinct ids and repeats keep theirs."""
+        page = normalize_random_ids(self._slider_page("95de4b6f-e208-9a95-50f7-459bde527b74"))
+        ids = re.findall(r"random-id='([^']+)'", page)
+
+        assert ids[0] == ids[2]
+        assert ids[0] != ids[1]
+
+
+class TestProfile:
+    """Test cell-level profiling of exports."""
+
+    def test_measures_cell(self):
+        """Verify a cell's time, allocations and figures are measured."""
+        go = pytest.importorskip("plotly.graph_objects")
+        try:
+            start_cell("Hbol")
+            data = bytearray(2_000_000)
+            fig = go.Figure(go.Scatter(y=[1, 2, 3]))
+            measured = finish_cell("Hbol", fig, {"fig": fig, "data": data, "_tmp": 1})
+        finally:
+            # Started by start_cell; only kernels are meant to keep tracing
+            tracemalloc.stop()
+
+        assert measured["allocated_bytes"] >= 2_000_000
+        assert measured["wall_seconds"] > 0
+        assert measured["n_figures"] == 1  # Displayed and defined, counted once
+        assert measured["figure_bytes"] == len(fig.to_json())
+        assert measured["names"] == ["data", "fig"]
+        assert finish_cell("Hbol", None, {}) is None
+
+    def test_folded_stacks_in_notebook_order(self):
+        """Verify profiles are ordered by cell and folded by wall time."""
+        measurement = dict(
+            cpu_seconds=0.1, allocated_bytes=0, n_figures=0, figure_bytes=0
+        )
+        profiles = build_profile(
+            {
+                "b": {**measurement, "wall_seconds": 2.5, "names": ["fig", "make", "x", "y"]},
+                "a": {**measurement, "wall_seconds": 0.001, "names": []},
+                "gone": {**measurement, "wall_seconds": 1.0, "names": []},
+            },
+            positions={"a": 1, "b": 2},
+        )
+
+        assert folded_stacks("orbits", profiles) == (
+            "orbits;cell 1 1000\n"
+            "orbits;cell 2 (fig, make, x, ...) 2500000\n"
+        )
+
+    def test_profiling_needs_inprocess_engine(self, tmp_path):
+        """Verify profiling is refused for subprocess exports."""
+        with pytest.raises(ValueError, match="inprocess"):
+            export_all(tmp_path, engine="subprocess", profile=True)
+
+    def test_profile_env_needs_inprocess_engine(self, tmp_path, monkeypatch, capsys):
+        """Verify the CLI refuses PHYSICS_EXPORT_PROFILE with subprocess exports."""
+        monkeypatch.setenv(PROFILE_ENV, "1")
+        with pytest.raises(SystemExit):
+            export.main(["--engine", "subprocess", "--output-dir", str(tmp_path)])
+        assert "needs --engine inprocess" in capsys.readouterr().err
+
+    def test_profiling_bypasses_the_cache(self, tmp_path, monkeypatch):
+        """Verify unchanged notebooks are exported again, so each gets a profile."""
+        exported = []
+
+        def fake_in_process(notebook_path, output_dir, include_code=False, budget=None,
+                            deterministic=False):
+            exported.append(notebook_path.stem)
+            return _fake_export(notebook_path, output_dir, include_code)
+
+        monkeypatch.setattr(export, "kernel_start_method", lambda: "fork")
+        monkeypatch.setattr(export, "kernel_hooks_run", lambda: True)
+        monkeypatch.setattr(export, "ProcessPoolExecutor", ThreadPoolExecutor)
+        monkeypatch.setattr(export, "preload", lambda: None)
+        monkeypatch.setattr(export, "export_notebook_in_process", fake_in_process)
+        export_all(tmp_path, engine="inprocess")
+        exported.clear()
+        export_all(tmp_path, engine="inprocess", profile=True)
+        assert sorted(exported) == sorted(nb.stem for nb in get_all_notebooks())
+
+    def test_budgets_relaxed_while_profiling(self, monkeypatch):
+        """Verify profiling does not push notebooks over their budgets."""
+        normal = export.budget_for("three_body")
+        monkeypatch.setenv(PROFILE_ENV, "1")
+        relaxed = export.budget_for("three_body")
+
+        assert relaxed.seconds > normal.seconds
+        assert relaxed.memory_mb > normal.memory_mb
+        assert relaxed.output_mb == normal.output_mb
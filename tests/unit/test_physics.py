@@ -0,0 +1,313 @@
+"""Unit tests for the physics library."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path for imports
+SRC_DIR = Path(__file__).parent.parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import physics
+from physics import cache, instrumentation
+from physics.instrumentation import STATS_ENV, instrumented
+from physics.orbital_mechanics import (
+    escape_orbit,
+    kepler_orbit,
+    projectile_trajectory,
+    solve_kepler_equation,
+    true_anomaly_from_eccentric,
+)
+
+
+class TestKeplerSolver:
+    """Test the native Kepler equation solver."""
+
+    def test_matches_brentq(self):
+        """Verify elliptic solutions match scipy's brentq, up to e close to 1."""
+        optimize = pytest.importorskip("scipy.optimize")
+        M = np.linspace(-10, 10, 401)
+        for e in (0.1, 0.5, 0.9, 0.99, 0.999999):
+            E = solve_kepler_equation(M, e)
+            for m, solved in zip(M, E):
+                expected = optimize.brentq(
+                    lambda x: x - e * np.sin(x) - m, m - np.pi, m + np.pi, xtol=1e-15
+                )
+                assert abs(solved - expected) < 1e-12
+
+    def test_scalar_matches_array(self):
+        """Verify the scalar fast path agrees with the vectorized path."""
+        M = np.array([-7.0, -1e-9, 0.0, 0.5, 3.0, 20.0])
+        for e in (0.0, 0.3, 0.999999, 1.0, 1.5, 30.0):
+            E = solve_kepler_equation(M, e)
+            assert [solve_kepler_equation(float(m), e) for m in M] == pytest.approx(
+                E, abs=1e-14
+            )
+
+    def test_all_conics(self):
+        """Verify hyperbolic, parabolic and mixed-e residuals."""
+        M = np.linspace(-50, 50, 201)
+        H = solve_kepler_equation(M, 1.2)
+        assert np.allclose(1.2 * np.sinh(H) - H, M, rtol=1e-13, atol=1e-13)
+        D = solve_kepler_equation(M, 1.0)
+        assert np.allclose(D + D**3 / 3, M, rtol=1e-13, atol=1e-13)
+
+        e = np.array([0.0, 0.5, 1.0, 2.0])
+        anomaly = solve_kepler_equation(2.0, e)
+        assert anomaly[0] == 2.0
+        assert np.isclose(anomaly[1] - 0.5 * np.sin(anomaly[1]), 2.0)
+        assert np.isclose(anomaly[2] + anomaly[2] ** 3 / 3, 2.0)
+        assert np.isclose(2 * np.sinh(anomaly[3]) - anomaly[3], 2.0)
+
+    def test_rejects_negative_eccentricity(self):
+        with pytest.raises(ValueError, match="non-negative"):
+            solve_kepler_equation(1.0, -0.1)
+        with pytest.raises(ValueError, match="non-negative"):
+            solve_kepler_equation(np.ones(3), np.array([0.5, -0.1, 0.5]))
+
+    def test_true_anomaly_of_escape_orbits(self):
+        """Verify the true anomaly approaches the asymptote far from periapsis."""
+        for e, far in ((1.0, 1e12), (1.5, 50.0)):
+            theta = true_anomaly_from_eccentric(np.array([0.0, far]), e)
+            assert theta[0] == 0.0
+            assert np.isclose(theta[1], np.arccos(-1 / e), atol=1e-11)
+
+    def test_kepler_orbit_obeys_second_law(self):
+        """Verify equal times sweep equal areas."""
+        x, y, t = kepler_orbit(0.7, a=2.0, n_frames=200)
+        assert np.allclose(np.hypot(x, y).max(), 2.0 * 1.7)
+        # Area of each triangle (focus, frame, next frame); uniform steps in
+        # true anomaly would vary 30-fold between periapsis and apoapsis
+        swept = 0.5 * np.abs(x * np.roll(y, -1) - y * np.roll(x, -1))
+        assert np.allclose(swept, swept.mean(), rtol=1e-2)
+        assert np.allclose(np.diff(t), 1 / 200)
+
+    def test_escape_orbit(self):
+        """Verify escape orbits run from r_max through periapsis and back."""
+        for e in (1.0, 1.8):
+            x, y, t = escape_orbit(e, q=0.5, n_frames=101, r_max=8.0)
+            r = np.hypot(x, y)
+            assert np.allclose(r[[0, -1]], 8.0)
+            assert np.isclose(r.min(), 0.5) and np.isclose(x[50], 0.5)
+            assert t[0] == 0.0 and t[-1] == 1.0
+        with pytest.raises(ValueError, match="e >= 1"):
+            escape_orbit(0.5)
+
+    def test_projectile_trajectory_orbits(self):
+        """Verify bound orbits close on themselves and escapes reach r_max."""
+        x, y, is_orbit = projectile_trajectory(9000.0)
+        assert is_orbit and not np.isnan(x).any()
+        assert np.isclose(np.hypot(x[0], y[0]), 1.0) and np.isclose(x[-1], x[0], atol=1e-9)
+
+        x, y, is_orbit = projectile_trajectory(12000.0, r_max=6.0)
+        assert is_orbit and np.isclose(np.hypot(x[-1], y[-1]), 6.0)
+
+    def test_import_does_not_load_scipy(self):
+        loaded = _modules_loaded_by("import physics.orbital_mechanics")
+        assert "scipy" not in loaded
+
+
+class TestPersistentCache:
+    """Test the on-disk result cache."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+        monkeypatch.delenv(cache.CACHE_ENV, raising=False)
+        return tmp_path
+
+    @staticmethod
+    def _counted(calls):
+        @cache.persistent_cache
+        def simulate(positions, n_steps=100):
+            calls.append(n_steps)
+            trajectory = np.cumsum(np.ones((n_steps, 2)) * positions, axis=0)
+            return [trajectory, trajectory * 2], (n_steps, "ok", None)
+
+        return simulate
+
+    def test_explicit_directory(self, cache_dir, tmp_path_factory):
+        """Verify a decorator given a directory stores there, not in cache_dir()."""
+        store = tmp_path_factory.mktemp("store")
+        calls = []
+
+        @cache.persistent_cache(directory=store)
+        def simulate(n_steps=10):
+            calls.append(n_steps)
+            return np.arange(n_steps)
+
+        simulate()
+        simulate()
+        assert calls == [10]
+        assert len(list(store.glob("*.npz"))) == 1
+        assert not list(cache_dir.glob("*.npz"))
+
+    def test_round_trip(self):
+        """Verify a second call loads the stored result instead of recomputing."""
+        calls = []
+        simulate = self._counted(calls)
+        first = simulate([1.0, 2.0])
+        second = simulate([1.0, 2.0], n_steps=100)  # Same call after defaults
+
+        assert calls == [100]
+        assert isinstance(second, tuple) and isinstance(second[0], list)
+        np.testing.assert_array_equal(second[0][1], first[0][1])
+        assert second[1] == (100, "ok", None)
+
+    def test_key_covers_arguments_and_code(self):
+        """Verify other arguments or another function body miss the cache."""
+        calls = []
+        simulate = self._counted(calls)
+        simulate([1.0, 2.0])
+        simulate(np.array([1.0, 3.0]))
+        simulate([1.0, 2.0], n_steps=50)
+        assert calls == [100, 100, 50]
+        simulate(np.array([1.0, 3.0]))  # Arrays are hashed by content
+        assert len(calls) == 3
+
+        @cache.persistent_cache
+        def simulate(positions, n_steps=100):  # Same name, different code
+            calls.append(-n_steps)
+            return np.zeros(n_steps)
+
+        simulate([1.0, 2.0])
+        assert calls[-1] == -100
+
+    def test_lru_eviction(self, cache_dir, monkeypatch):
+        """Verify the least recently used entries are evicted past MAX_BYTES."""
+        calls = []
+        simulate = self._counted(calls)
+        for n_steps in (1000, 1001, 1002):
+            before = set(cache_dir.glob("*.npz"))
+            simulate([1.0, 0.0], n_steps=n_steps)
+            (entry,) = set(cache_dir.glob("*.npz")) - before
+            os.utime(entry, (n_steps, n_steps))  # Distinct use times
+            if n_steps == 1000:
+                monkeypatch.setattr(cache, "MAX_BYTES", int(2.5 * entry.stat().st_size))
+
+        # 1000 was evicted when 1002 was stored
+        assert len(list(cache_dir.glob("*.npz"))) == 2
+        # Loading 1001 makes 1002 the least recently used, so storing 1000
+        # again evicts 1002
+        simulate([1.0, 0.0], n_steps=1001)
+        simulate([1.0, 0.0], n_steps=1000)
+        simulate([1.0, 0.0], n_steps=1001)
+        assert calls == [1000, 1001, 1002, 1000]
+        simulate([1.0, 0.0], n_steps=1002)
+        assert calls == [1000, 1001, 1002, 1000, 1002]
+
+    def test_clear_and_disable(self, monkeypatch):
+        calls = []
+        simulate = self._counted(calls)
+        simulate([1.0, 2.0])
+        simulate([2.0, 2.0])
+        assert cache.clear_cache() == 2
+        simulate([1.0, 2.0])
+        monkeypatch.setenv(cache.CACHE_ENV, "0")
+        simulate([1.0, 2.0])
+        assert calls == [100, 100, 100, 100]
+
+    def test_unreadable_entry_is_recomputed(self, cache_dir):
+        calls = []
+        simulate = self._counted(calls)
+        simulate([1.0, 2.0])
+        next(cache_dir.glob("*.npz")).write_bytes(b"truncated")
+        trajectories, _ = simulate([1.0, 2.0])
+        assert calls == [100, 100]
+        assert trajectories[0].shape == (100, 2)
+
+    def test_rejects_unsupported_types(self):
+        @cache.persistent_cache
+        def figure(title):
+            return object()
+
+        with pytest.raises(TypeError, match="store a object result"):
+            figure("orbit")
+        with pytest.raises(TypeError, match="hash a object argument"):
+            figure(object())
+
+
+class TestInstrumentation:
+    """Test the call statistics of the physics kernels."""
+
+    def test_disabled_leaves_functions_unchanged(self, monkeypatch):
+        """Verify kernels are not wrapped unless PHYSICS_STATS is set."""
+        monkeypatch.setattr(instrumentation, "ENABLED", False)
+
+        def kernel():
+            pass
+
+        assert instrumented(kernel) is kernel
+
+    def test_counts_calls_time_and_elements(self, monkeypatch):
+        """Verify calls, time and returned array elements are accumulated."""
+        monkeypatch.setattr(instrumentation, "ENABLED", True)
+
+        @instrumented
+        def trajectory(n):
+            return np.zeros(n), np.zeros(n), True
+
+        physics.reset_stats()
+        trajectory(10)
+        trajectory(5)
+        snapshot = physics.stats()
+        trajectory(1)
+
+        assert snapshot["trajectory"].calls == 2
+        assert snapshot["trajectory"].elements == 30
+        assert snapshot["trajectory"].seconds > 0
+        assert physics.stats()["trajectory"].calls == 3  # Snapshots are copies
+        physics.reset_stats()
+        assert physics.stats() == {}
+
+    def test_kepler_orbit_counts_solves(self):
+        """Verify nested kernel calls are counted when enabled at import.
+
+        kepler_orbit solves for all of its frames in one vectorized call.
+        """
+        script = (
+            "import physics\n"
+            "physics.kepler_orbit(0.5, n_frames=40)\n"
+            "s = physics.stats()\n"
+            "print(s['kepler_orbit'].calls, s['solve_kepler_equation'].calls,"
+            " s['kepler_orbit'].elements)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True, text=True, check=True,
+            env={**os.environ, STATS_ENV: "1", "PYTHONPATH": str(SRC_DIR)},
+        )
+        assert result.stdout.split() == ["1", "1", "120"]
+
+
+def _modules_loaded_by(statement: str) -> set[str]:
+    """Return the top-level modules a fresh interpreter has loaded after a statement."""
+    script = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+    )
+    return {name.split(".")[0] for name in result.stdout.split()}
+
+
+class TestLazyImports:
+    """Test that importing physics does not load the numerical stack."""
+
+    def test_import_loads_constants_only(self):
+        """Verify `import physics` does not import numpy or scipy."""
+        loaded = _modules_loaded_by("import physics; physics.PLANETS")
+        assert not loaded & {"numpy", "scipy"}
+
+    def test_kernels_load_on_first_use(self):
+        """Verify lazily imported names resolve to the real objects."""
+        from physics import orbital_mechanics
+
+        for name in physics.__all__:
+            assert getattr(physics, name) is not None
+        assert physics.kepler_orbit is orbital_mechanics.kepler_orbit
+        assert set(physics.__all__) <= set(dir(physics))
@@ -0,0 +1,398 @@
+"""Unit tests for the shared visualization helpers."""
+
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from physics_explorations.visualization import (
+    RENDER_SETTINGS,
+    Quantization,
+    apply_render_mode,
+    build_frames,
+    build_parametric_payload,
+    build_slider_bundle_payload,
+    circle,
+    create_animation_figure,
+    create_heatmap_animation_html,
+    create_parametric_html,
+    create_slider_bundle_html,
+    delta_decode,
+    delta_encode,
+    encode_array,
+    iter_frames,
+    quantized_heatmap,
+    quantized_surface,
+    ring,
+    set_render_mode,
+    slider_cache,
+    sphere,
+    to_webgl,
+    unit_circle,
+    write_animation_html,
+    write_animation_json,
+)
+
+
+@pytest.fixture
+def render_settings():
+    """Restore the global render settings after each test."""
+    saved = dict(RENDER_SETTINGS)
+    yield RENDER_SETTINGS
+    RENDER_SETTINGS.update(saved)
+
+
+class TestRenderMode:
+    """Test the SVG/WebGL rendering switch."""
+
+    def test_dense_traces_use_webgl(self, render_settings):
+        """Verify auto mode switches traces above the threshold to Scattergl."""
+        set_render_mode("auto", webgl_threshold=100)
+        frames = build_frames(3, lambda i: [
+            go.Scatter(x=np.arange(500), y=np.arange(500) * i),
+            go.Scatter(x=[0], y=[i]),
+        ])
+        initial = [go.Scatter(x=[0], y=[0]), go.Scatter(x=[0], y=[0])]
+        fig = create_animation_figure(initial, frames)
+
+        assert [t.type for t in fig.data] == ["scattergl", "scatter"]
+        for frame in fig.frames:
+            assert [t.type for t in frame.data] == ["scattergl", "scatter"]
+
+    def test_svg_mode_keeps_scatter(self, render_settings):
+        """Verify svg mode never converts traces."""
+        set_render_mode("svg")
+        data = [go.Scatter(x=np.arange(5000), y=np.arange(5000))]
+        new_data, _ = apply_render_mode(data, [])
+        assert new_data[0].type == "scatter"
+
+    def test_unsupported_properties_are_dropped(self):
+        """Verify Scatter-only properties degrade instead of raising."""
+        trace = go.Scatter(
+            x=[0, 1], y=[0, 1],
+            line=dict(shape="spline", smoothing=1.0, color="red"),
+            cliponaxis=False,
+        )
+        webgl = to_webgl(trace)
+        assert webgl.type == "scattergl"
+        assert webgl.line.color == "red"
+        assert webgl.line.shape is None
+
+    def test_invalid_mode_rejected(self, render_settings):
+        """Verify unknown render modes raise ValueError."""
+        with pytest.raises(ValueError):
+            set_render_mode("canvas")
+
+
+class TestStreaming:
+    """Test lazy frame production and streaming serialization."""
+
+    def test_iter_frames_is_lazy(self):
+        """Verify frames are only built when consumed."""
+        built = []
+
+        def builder(i):
+            built.append(i)
+            return [go.Scatter(x=[i], y=[i])]
+
+        frames = iter_frames(100, builder)
+        next(frames)
+        assert built == [0]
+
+    def test_write_animation_json_round_trips(self):
+        """Verify streamed JSON contains every frame and a matching slider."""
+        buffer = io.StringIO()
+        frames = iter_frames(40, lambda i: [go.Scatter(x=np.arange(10), y=np.arange(10) * i)])
+        n_frames = write_animation_json(
+            buffer, [go.Scatter(x=[0], y=[0])], frames, buffer_frames=7
+        )
+
+        figure = json.loads(buffer.getvalue())
+        assert n_frames == 40
+        assert [f["name"] for f in figure["frames"]] == [str(i) for i in range(40)]
+        assert len(figure["layout"]["sliders"][0]["steps"]) == 40
+
+    def test_write_animation_html(self, tmp_path):
+        """Verify the standalone page embeds the figure and frame loader."""
+        frames = iter_frames(3, lambda i: [go.Scatter(x=[i], y=[i])])
+        path = write_animation_html(tmp_path / "anim.html", [go.Scatter(x=[0], y=[0])], frames)
+        html = path.read_text()
+        assert "Plotly.addFrames" in html
+        assert html.rstrip().endswith("</html>")
+
+
+class TestParametric:
+    """Test client-side parametric animations."""
+
+    def test_payload_ships_base_arrays_once(self):
+        """Verify the payload holds base arrays plus one vector per parameter."""
+        x = np.linspace(0, 1, 200)
+        fig = go.Figure([go.Scatter(x=x, y=np.sin(x))])
+        payload = build_parametric_payload(
+            fig,
+            params={"phase": np.linspace(0, 1, 60)},
+            expressions={0: {"y": "Math.sin(x - phase)"}},
+        )
+        assert payload["nFrames"] == 60
+        assert payload["traces"][0]["n"] == 200
+        assert set(payload["traces"][0]["base"]) == {"x", "y"}
+        assert not payload["figure"].frames
+
+    def test_mismatched_parameters_rejected(self):
+        """Verify parameter vectors must have equal lengths."""
+        fig = go.Figure([go.Scatter(x=[0], y=[0])])
+        with pytest.raises(ValueError):
+            build_parametric_payload(fig, {"a": [0, 1], "b": [0]}, {0: {"y": "a"}})
+
+    def test_reserved_names_rejected(self):
+        """Verify parameters cannot shadow the base coordinates."""
+        fig = go.Figure([go.Scatter(x=[0], y=[0])])
+        with pytest.raises(ValueError):
+            build_parametric_payload(fig, {"x": [0, 1]}, {0: {"y": "x"}})
+
+    def test_html_embeds_updater(self):
+        """Verify the page contains the restyle-based updater."""
+        fig = go.Figure([go.Scatter(x=[0, 1], y=[0, 1])])
+        html = create_parametric_html(fig, {"t": [0, 1, 2]}, {0: {"y": "x * t"}})
+        assert "Plotly.restyle" in html
+        assert 'max="2"' in html
+
+
+class TestCompression:
+    """Test quantized and delta-packed z-data."""
+
+    def test_quantization_round_trip(self):
+        """Verify dequantized values are within half a step of the input."""
+        quant = Quantization(-1.5, 1.5, np.uint8)
+        z = np.random.default_rng(0).uniform(-1.5, 1.5, (50, 50))
+        restored = quant.dequantize(quant.quantize(z))
+        assert np.abs(restored - z).max() <= quant.scale / 2 + 1e-12
+
+    def test_quantization_clips_out_of_range(self):
+        """Verify values outside [zmin, zmax] clip to the end levels."""
+        quant = Quantization(0.0, 1.0, np.uint16)
+        q = quant.quantize([-5.0, 0.5, 5.0, np.nan])
+        assert q.dtype == np.uint16
+        assert q.tolist() == [0, 32768, 65535, 0]
+
+    def test_delta_round_trip(self):
+        """Verify delta packing decodes exactly, including wrap-around."""
+        frames = np.random.default_rng(1).integers(0, 256, (10, 8, 8), dtype=np.uint8)
+        packed = delta_encode(frames)
+        assert packed.dtype == np.uint8
+        np.testing.assert_array_equal(delta_decode(packed), frames)
+
+    def test_quantized_heatmap_labels_colorbar(self):
+        """Verify the colorbar is labelled in physical units."""
+        trace = quantized_heatmap(np.zeros((4, 4)), -1.0, 1.0)
+        assert trace.zmax == 255
+        assert trace.colorbar.ticktext[0] == "-1"
+        assert trace.colorbar.ticktext[-1] == "1"
+
+    def test_quantized_traces_keep_z_out_of_hover(self):
+        """Verify quantized levels are not shown as z unless asked for."""
+        for make in (quantized_heatmap, quantized_surface):
+            assert "z" not in make(np.zeros((4, 4)), -1.0, 1.0).hoverinfo
+            trace = make(np.zeros((4, 4)), -1.0, 1.0, hovertemplate="%{x}")
+            assert trace.hoverinfo is None
+
+    def test_heatmap_animation_page(self):
+        """Verify frames ship as one block whose base64 is not escaped."""
+        fig = go.Figure(go.Heatmap(name="</script>"))
+        z_frames = np.linspace(-1.0, 1.0, 2 * 16 * 16).reshape(2, 16, 16)[::-1]
+        html = create_heatmap_animation_html(fig, z_frames, -1.0, 1.0)
+        assert "Plotly.restyle" in html
+        assert "\\u002f" not in html
+        assert html.count("</script>") == html.count("<script")
+
+    def test_encode_array_spec(self):
+        """Verify typed array specs carry dtype and shape."""
+        spec = encode_array(np.zeros((3, 2), dtype=np.uint8))
+        assert spec["dtype"] == "u1"
+        assert spec["shape"] == "3, 2"
+
+
+class TestGeometry:
+    """Test the memoized geometry primitives."""
+
+    def test_unit_circle_is_cached_and_read_only(self):
+        """Verify repeated calls share one read-only table."""
+        cos, sin = unit_circle(64)
+        assert unit_circle(64)[0] is cos
+        with pytest.raises(ValueError):
+            cos[0] = 2.0
+
+    def test_circle_scales_and_offsets(self):
+        """Verify circle() matches the direct trig computation."""
+        x, y = circle(2.0, center=(1.0, -1.0), n_points=50)
+        theta = np.linspace(0, 2 * np.pi, 50)
+        np.testing.assert_allclose(x, 1.0 + 2.0 * np.cos(theta))
+        np.testing.assert_allclose(y, -1.0 + 2.0 * np.sin(theta))
+        assert x.flags.writeable
+
+    def test_ring_traces_both_circles(self):
+        """Verify the annulus outline has both radii."""
+        x, y = ring(1.0, 2.0, n_points=40)
+        r = np.hypot(x, y)
+        np.testing.assert_allclose(r[:40], 2.0)
+        np.testing.assert_allclose(r[40:], 1.0)
+
+    def test_sphere_radius(self):
+        """Verify sphere() points lie on the requested sphere."""
+        X, Y, Z = sphere(3.0, n_u=20, n_v=10)
+        np.testing.assert_allclose(np.sqrt(X**2 + Y**2 + Z**2), 3.0)
+
+
+class TestSliderCache:
+    """Test the memoized figures of slider-driven cells."""
+
+    @staticmethod
+    def _plot(calls, **options):
+        @slider_cache(start=0, stop=0.95, step=0.05, **options)
+        def plot(e):
+            calls.append(e)
+            return go.Figure(go.Scatter(x=[0, e], y=[0, e]))
+
+        return plot
+
+    def test_quantized_values_hit(self):
+        """Verify float noise maps to one grid entry and the figure is reused."""
+        calls = []
+        plot = self._plot(calls)
+        fig = plot(0.35000000000000003)
+        assert plot(0.35) is fig
+        assert plot(0.349) is fig
+        assert plot(2.0) is plot(0.95)  # Clamped to the range
+        assert calls == [0.35, 0.95]
+        info = plot.cache_info()
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (3, 2, 20, 2)
+
+    def test_lru_eviction(self):
+        """Verify the least recently shown figure is evicted past maxsize."""
+        calls = []
+        plot = self._plot(calls, maxsize=2)
+        plot(0.1)
+        plot(0.2)
+        plot(0.1)
+        plot(0.3)  # Evicts 0.2
+        plot(0.1)
+        plot(0.2)
+        assert calls == [0.1, 0.2, 0.3, 0.2]
+        plot.cache_clear()
+        assert plot.cache_info().currsize == 0
+
+    def test_prewarm_starts_when_the_slider_moves(self):
+        """Verify the background pass fills the grid only after a change."""
+        calls = []
+        plot = self._plot(calls, prewarm=True)
+        plot(0.5)
+        plot(0.5)
+        assert calls == [0.5]
+
+        plot(0.55)
+        plot.prewarm().join(timeout=10)
+        assert sorted(calls) == plot.values
+        # Nearest value to the last one shown comes first
+        assert calls[:3] == [0.5, 0.55, 0.6]
+        plot(0.0)
+        assert plot.cache_info().misses == 2
+
+    def test_rejects_empty_range(self):
+        with pytest.raises(ValueError):
+            slider_cache(start=1, stop=0, step=0.1)(lambda v: v)
+
+
+class TestSliderBundle:
+    """Test the precomputed slider states of static exports."""
+
+    @staticmethod
+    def _figures(values):
+        # A fixed reference trace and one that follows the value
+        return [
+            go.Figure(
+                [go.Scatter(x=[0, 1], y=[0, 0], name="ref"), go.Scatter(x=[0, v], y=[0, v])],
+                layout={"template": "plotly_dark", "title": "Orbit"},
+            )
+            for v in values
+        ]
+
+    def test_shared_content_stored_once(self):
+        """Verify identical traces, layouts and templates are deduplicated."""
+        values = [0.0, 0.5, 1.0]
+        payload = build_slider_bundle_payload(self._figures(values), values)
+        assert len(payload["traces"]) == 4  # One shared, three varying
+        assert len(payload["layouts"]) == 1
+        assert len(payload["templates"]) == 1
+        assert [state["traces"][0] for state in payload["states"]] == [0, 0, 0]
+        json.dumps(payload["traces"])  # Ships as plain JSON
+
+    def test_initial_state_and_labels(self):
+        """Verify the initial value picks the nearest state and labels carry the prefix."""
+        values = [0.0, 0.5, 1.0]
+        payload = build_slider_bundle_payload(
+            self._figures(values), values, initial=0.45, slider_prefix="e = "
+        )
+        assert payload["initial"] == 1
+        assert payload["labels"] == ["e = 0", "e = 0.5", "e = 1"]
+        assert payload["nFrames"] == 3
+
+    def test_rejects_mismatched_values(self):
+        with pytest.raises(ValueError):
+            build_slider_bundle_payload(self._figures([0.0, 1.0]), [0.0])
+        with pytest.raises(ValueError):
+            build_slider_bundle_payload([], [])
+
+    def test_html(self):
+        """Verify the page redraws states with Plotly.react, starting at the initial one."""
+        values = [0.0, 0.5, 1.0]
+        html = create_slider_bundle_html(self._figures(values), values, initial=1.0)
+        assert "Plotly.react" in html
+        assert 'value="2"' in html
+        assert "cdn.plot.ly" in html
+
+    def test_slider_cache_bundle(self):
+        """Verify a slider cache bundles its whole grid through the cache."""
+        calls = []
+        plot = TestSliderCache._plot(calls)
+        plot(0.5)
+        html = plot.bundle_html(0.5, slider_prefix="e = ")
+        assert sorted(calls) == plot.values
+        assert calls.count(0.5) == 1
+        assert "e = 0.95" in html
+        assert plot.cache_info().misses == 1  # Bundling does not count as use
+
+
+class TestLazyImports:
+    """Test that the packages load their heavy submodules on first use."""
+
+    @pytest.mark.parametrize("module", ["physics_explorations", "physics_explorations.visualization"])
+    def test_import_does_not_load_plotly(self, module):
+        """Verify importing the package alone does not import plotly or numpy."""
+        src_dir = Path(__file__).parent.parent.parent / "src"
+        result = subprocess.run(
+            [sys.executable, "-c", f"import sys, {module}; print(' '.join(sys.modules))"],
+            capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONPATH": str(src_dir)},
+        )
+        loaded = {name.split(".")[0] for name in result.stdout.split()}
+        assert not loaded & {"plotly", "numpy"}
+
+    def test_all_names_resolve(self):
+        """Verify every exported name can be looked up."""
+        import physics_explorations
+        from physics_explorations import visualization
+
+        for package in (physics_explorations, visualization):
+            for name in package.__all__:
+                assert getattr(package, name) is not None, name
+            with pytest.raises(AttributeError):
+                package.no_such_name